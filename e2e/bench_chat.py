@@ -0,0 +1,88 @@
+"""
+Streaming chat benchmark: ChatPanel / WorkoutStreamPreview against a local SSE
+stand-in for the chat service, at rising stream rates.
+
+The stand-in listens on the chat service's URL (VITE_CHAT_API_URL, default
+http://localhost:8005), so the chat service must not be running. Other APIs
+are answered from fixtures. Server must be running on port 3030 with
+VITE_DEMO_MODE=true.
+
+Run: python e2e/bench_chat.py
+     python e2e/bench_chat.py --rates 20,100,400 --tokens 500 --token-chars 24
+     python e2e/bench_chat.py --profiles low-end-3g --report test-results/e2e-streaming.json
+"""
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from harness import devices, network, streaming
+from harness.checkpoints import CheckpointStore, ScopedPage
+from test_workflow_refactor import BASE_URL
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Chat streaming render latency against stream rate")
+    parser.add_argument("--rates", default=",".join(str(r) for r in streaming.RATES),
+                        help="comma-separated content_delta events per second (default: %(default)s)")
+    parser.add_argument("--tokens", type=int, default=streaming.StreamSpec.tokens,
+                        help="content_delta events per stream")
+    parser.add_argument("--token-chars", type=int, default=streaming.StreamSpec.token_chars,
+                        help="characters per token")
+    parser.add_argument("--stage-every", type=int, default=streaming.StreamSpec.stage_every,
+                        metavar="N", help="emit a stage event after every N tokens (0: none)")
+    parser.add_argument("--exercises", type=int, default=streaming.StreamSpec.exercises,
+                        help="exercises in the generated workout card")
+    parser.add_argument("--repeat", type=int, default=1, help="streams per rate")
+    parser.add_argument("--profiles", metavar="NAMES",
+                        help=f"device profiles to run under (known: {', '.join(devices.PROFILES)})")
+    parser.add_argument("--report", metavar="FILE", default="test-results/e2e-streaming.json")
+    args = parser.parse_args(argv)
+    args.rates = [float(rate) for rate in args.rates.split(",")]
+    args.profiles = args.profiles.split(",") if args.profiles else [None]
+    unknown = [p for p in args.profiles if p and p not in devices.PROFILES]
+    if unknown:
+        parser.error(f"unknown device profile(s): {', '.join(unknown)}")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    spec = streaming.StreamSpec(tokens=args.tokens, token_chars=args.token_chars,
+                                stage_every=args.stage_every, exercises=args.exercises)
+    server = streaming.SSEStandIn(spec=spec).start()
+    print(f"SSE stand-in on {server.url}")
+    try:
+        for profile in args.profiles:
+            if profile:
+                print(f"\n━━ Device profile: {profile} ━━")
+            with sync_playwright() as p:
+                browser = p.chromium.launch(headless=True)
+                store = CheckpointStore(browser, BASE_URL, enabled=False)
+                page = ScopedPage(store)
+                stand_in = network.NetworkStandIn("fixtures")
+                benchmark = streaming.StreamBenchmark(page, server, stand_in)
+                stand_in.install(page)
+                if profile:
+                    devices.DeviceProfiler(page, devices.PROFILES[profile])
+
+                for run in range(args.repeat):
+                    for rate in args.rates:
+                        result = benchmark.run(rate, run)
+                        if result.error:
+                            print(f"  ✗ {rate:g} events/s, run {run + 1}: {result.error}")
+                        else:
+                            print(f"  ✓ {rate:g} events/s, run {run + 1}: "
+                                  f"{len(result.chunk_latency_ms)} tokens painted")
+
+                page.close()
+                browser.close()
+            streaming.print_report()
+            report = args.report.replace(".json", f"-{profile}.json") if profile else args.report
+            streaming.write_report(report)
+            streaming.RESULTS.clear()
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    run()
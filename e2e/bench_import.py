@@ -0,0 +1,81 @@
+"""
+Bulk import benchmark (BulkImport: Detect → Map → Match → Preview).
+
+Uploads generated CSV/JSON programs of 100 to 5,000 rows, serves sized
+ingestor responses through the API stand-in, and reports per-step latency,
+main-thread blocking and memory against file size. Server must be running on
+port 3030 with VITE_DEMO_MODE=true.
+
+Run: python e2e/bench_import.py
+     python e2e/bench_import.py --rows 100,1000,5000 --formats csv --repeat 3
+     python e2e/bench_import.py --profiles mid-tier-4g --report test-results/e2e-bulk-import.json
+"""
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from harness import bulk, devices, network
+from harness.checkpoints import CheckpointStore, ScopedPage
+from test_workflow_refactor import BASE_URL
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import step latency against file size")
+    parser.add_argument("--rows", default=",".join(str(r) for r in bulk.ROWS),
+                        help="comma-separated row counts (default: %(default)s)")
+    parser.add_argument("--formats", default=",".join(bulk.FORMATS),
+                        help="comma-separated file formats (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per file")
+    parser.add_argument("--profiles", metavar="NAMES",
+                        help=f"device profiles to run under (known: {', '.join(devices.PROFILES)})")
+    parser.add_argument("--report", metavar="FILE", default="test-results/e2e-bulk-import.json")
+    args = parser.parse_args(argv)
+    args.rows = [int(rows) for rows in args.rows.split(",")]
+    args.formats = args.formats.split(",")
+    unknown = [f for f in args.formats if f not in bulk.FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+    args.profiles = args.profiles.split(",") if args.profiles else [None]
+    unknown = [p for p in args.profiles if p and p not in devices.PROFILES]
+    if unknown:
+        parser.error(f"unknown device profile(s): {', '.join(unknown)}")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    for profile in args.profiles:
+        if profile:
+            print(f"\n━━ Device profile: {profile} ━━")
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            # No checkpoints: every file starts from an empty context
+            store = CheckpointStore(browser, BASE_URL, enabled=False)
+            page = ScopedPage(store)
+            stand_in = network.NetworkStandIn("fixtures")
+            benchmark = bulk.BulkImportBenchmark(page, stand_in)
+            stand_in.install(page)
+            if profile:
+                devices.DeviceProfiler(page, devices.PROFILES[profile])
+
+            for run in range(args.repeat):
+                for fmt in args.formats:
+                    for rows in args.rows:
+                        result = benchmark.run(rows, fmt, run)
+                        if result.error:
+                            print(f"  ✗ {rows:>5} rows {fmt}, run {run + 1}: {result.error}")
+                        else:
+                            total = sum(s.latency_ms for s in result.steps)
+                            print(f"  ✓ {rows:>5} rows {fmt}, run {run + 1}: "
+                                  f"{len(result.steps)} steps in {total:.0f}ms")
+
+            page.close()
+            browser.close()
+        bulk.print_report()
+        report = args.report.replace(".json", f"-{profile}.json") if profile else args.report
+        bulk.write_report(report)
+        bulk.RESULTS.clear()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+"""
+Pipeline Observatory benchmark (pipeline.html: ingest → validate → map).
+
+Runs each ingestion flow of the Observatory many times against the fixture
+stand-ins for the ingestor and mapper, and reports per-stage latency
+distributions. Server must be running on port 3030, unless --server starts
+one (the Observatory ignores VITE_DEMO_MODE).
+
+Run: python e2e/bench_pipeline.py
+     python e2e/bench_pipeline.py --flows full-pipeline --runs 200 --api-latency 50
+     python e2e/bench_pipeline.py --scenario file-upload --server prod
+"""
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from harness import network, pipeline, servers
+from harness.checkpoints import CheckpointStore, ScopedPage
+from test_workflow_refactor import BASE_URL
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline Observatory per-stage latency")
+    parser.add_argument("--flows", default=",".join(pipeline.FLOWS),
+                        help="comma-separated flows (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=50, help="measured runs per flow")
+    parser.add_argument("--warmup", type=int, default=3,
+                        help="runs per flow before measuring, left out of the distributions")
+    parser.add_argument("--text", default=pipeline.DEFAULT_TEXT,
+                        help="workout text sent to the ingestor")
+    parser.add_argument("--scenario", choices=network.scenarios(),
+                        help="fixture scenario whose mocks override the per-service fixtures")
+    parser.add_argument("--api-latency", type=float, default=0, metavar="MS",
+                        help="delay every API request by MS milliseconds")
+    parser.add_argument("--server", choices=("external",) + servers.KINDS, default="external",
+                        help="benchmark the app on BASE_URL, or start (or reuse) a dev server "
+                             "or production build")
+    parser.add_argument("--report", metavar="FILE", default="test-results/e2e-pipeline.json")
+    args = parser.parse_args(argv)
+    args.flows = args.flows.split(",")
+    unknown = [f for f in args.flows if f not in pipeline.FLOWS]
+    if unknown:
+        parser.error(f"unknown flow(s): {', '.join(unknown)}")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    base_url = BASE_URL
+    if args.server != "external":
+        base_url = servers.ServerPool(args.server).start()[0]
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        store = CheckpointStore(browser, base_url, enabled=False)
+        page = ScopedPage(store)
+        stand_in = network.NetworkStandIn("fixtures", args.scenario, latency_ms=args.api_latency)
+        stand_in.install(page)
+        benchmark = pipeline.ObservatoryBenchmark(page, stand_in, args.text)
+        benchmark.open()
+
+        for flow in args.flows:
+            for run in range(args.warmup + args.runs):
+                result = benchmark.run(flow, run, warmup=run < args.warmup)
+                if result.error:
+                    print(f"  ✗ {flow} run {run + 1}: {result.error}")
+            done = [r for r in pipeline.RESULTS if r.flow == flow and not r.warmup and not r.error]
+            print(f"  ✓ {flow}: {len(done)}/{args.runs} measured runs")
+
+        page.close()
+        browser.close()
+
+    pipeline.print_report()
+    network.print_summary()
+    pipeline.write_report(args.report)
+
+
+if __name__ == "__main__":
+    run()
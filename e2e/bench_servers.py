@@ -0,0 +1,78 @@
+"""
+Dev server vs production build: cold start and first load side by side.
+
+Starts a fresh dev server and a fresh `vite preview` of the production
+bundle (building it first if the tree changed), then loads each one in empty
+browser contexts: the first load right after the cold start, and --runs more
+against the warm server. Reports build time, cold start, time to the home
+view, navigation timing, request count and transfer size per kind.
+
+The benchmark's servers use their own ports, so warm servers of a test run
+(--server) are left alone, and are stopped afterwards unless --keep.
+
+Run: python e2e/bench_servers.py
+     python e2e/bench_servers.py --kinds prod --runs 5
+     python e2e/bench_servers.py --stop          (stop every server the harness started)
+"""
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from harness import servers
+
+# Above the ports ServerPool hands to test workers
+PORT_OFFSET = 50
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Dev vs production build cold start and first load")
+    parser.add_argument("--kinds", default=",".join(servers.KINDS),
+                        help="comma-separated server kinds (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3, help="warm loads per server after the first")
+    parser.add_argument("--keep", action="store_true", help="leave the servers running")
+    parser.add_argument("--stop", action="store_true",
+                        help="stop every server the harness has started and exit")
+    parser.add_argument("--report", metavar="FILE", default="test-results/e2e-servers.json")
+    args = parser.parse_args(argv)
+    args.kinds = args.kinds.split(",")
+    unknown = [k for k in args.kinds if k not in servers.KINDS]
+    if unknown:
+        parser.error(f"unknown server kind(s): {', '.join(unknown)}")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    if args.stop:
+        servers.stop_all()
+        return
+
+    pools = []
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            for kind in args.kinds:
+                pool = servers.ServerPool(kind, base_port=servers.BASE_PORTS[kind] + PORT_OFFSET,
+                                          reuse=False)
+                pools.append(pool)
+                pool.start()
+                server = pool.servers[0]
+                for run in range(args.runs + 1):
+                    load = servers.measure_load(browser, server, run, cold=run == 0)
+                    if load.error:
+                        print(f"  ✗ {kind} load {run + 1}: {load.error}")
+                    else:
+                        print(f"  ✓ {kind} load {run + 1}: home view at {load.ready_ms:.0f}ms, "
+                              f"{load.requests} requests, {load.transfer_kb:.0f} KB")
+            browser.close()
+    finally:
+        if not args.keep:
+            for pool in pools:
+                pool.stop()
+
+    servers.print_report()
+    servers.write_report(args.report)
+
+
+if __name__ == "__main__":
+    run()
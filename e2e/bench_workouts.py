@@ -0,0 +1,73 @@
+"""
+Scale benchmark for the Workouts list (useWorkoutList / WorkoutList.tsx).
+
+Serves synthetic workout libraries through the API stand-in and reports how
+initial render, search / tag / sort / paging latency and scroll frame rate
+grow with library size. Server must be running on port 3030 with
+VITE_DEMO_MODE=true.
+
+Run: python e2e/bench_workouts.py
+     python e2e/bench_workouts.py --sizes 1000,10000,50000 --repeat 3 --report test-results/e2e-scale.json
+     python e2e/bench_workouts.py --profiles mid-tier-4g
+"""
+import argparse
+
+from playwright.sync_api import sync_playwright
+
+from harness import devices, network, scale
+from harness.checkpoints import CheckpointStore, ScopedPage
+from test_workflow_refactor import BASE_URL
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Workouts list latency against library size")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in scale.SIZES),
+                        help="comma-separated library sizes (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per size")
+    parser.add_argument("--profiles", metavar="NAMES",
+                        help=f"device profiles to run under (known: {', '.join(devices.PROFILES)})")
+    parser.add_argument("--report", metavar="FILE", default="test-results/e2e-scale.json")
+    args = parser.parse_args(argv)
+    args.sizes = [int(size) for size in args.sizes.split(",")]
+    args.profiles = args.profiles.split(",") if args.profiles else [None]
+    unknown = [p for p in args.profiles if p and p not in devices.PROFILES]
+    if unknown:
+        parser.error(f"unknown device profile(s): {', '.join(unknown)}")
+    return args
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    for profile in args.profiles:
+        if profile:
+            print(f"\n━━ Device profile: {profile} ━━")
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            # No checkpoints: every size starts from an empty context
+            store = CheckpointStore(browser, BASE_URL, enabled=False)
+            page = ScopedPage(store)
+            stand_in = network.NetworkStandIn("fixtures")
+            benchmark = scale.ScaleBenchmark(page, stand_in)
+            stand_in.install(page)
+            if profile:
+                devices.DeviceProfiler(page, devices.PROFILES[profile])
+
+            for run in range(args.repeat):
+                for size in args.sizes:
+                    result = benchmark.run(size, run)
+                    if result.error:
+                        print(f"  ✗ {size:>7} workouts, run {run + 1}: {result.error}")
+                    else:
+                        print(f"  ✓ {size:>7} workouts, run {run + 1}: "
+                              f"initial render {result.initial_render_ms:.0f}ms")
+
+            page.close()
+            browser.close()
+        scale.print_report()
+        report = args.report.replace(".json", f"-{profile}.json") if profile else args.report
+        scale.write_report(report)
+        scale.RESULTS.clear()
+
+
+if __name__ == "__main__":
+    run()
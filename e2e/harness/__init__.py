@@ -0,0 +1,6 @@
+"""
+Support code for the Python Playwright E2E harness in e2e/.
+
+The suites live in e2e/test_workflow_refactor.py; the modules here hold the
+pieces that are shared between run modes (result bookkeeping, sharding).
+"""
@@ -0,0 +1,138 @@
+"""
+asyncio runner on playwright.async_api.
+
+The sync harness blocks the whole process on every browser round trip, so one
+process drives one page at a time. Here every suite is a task with its own
+browser context, and up to `concurrency` of them share one event loop: while
+one suite waits on `inner_text()` or a readiness signal, the others run.
+
+The suites are the scripts in e2e/test_workflow_refactor.py, and the readiness
+waits, waypoints, checkpoints and locator lookups are the sync harness's own
+(see harness/scripts.py): given an async Browser, CheckpointStore and
+ScopedPage work on the async API and the helpers return awaitables. A suite
+written for the sync runner therefore runs here unchanged, as long as it
+yields every call that touches the browser.
+
+Results go into the same runner lists (TESTS, SUITES, PASSED, FAILED,
+readiness.WAITS), so the timing, JUnit and JSON reports work unchanged. Each
+suite's output is buffered and printed when it finishes, so concurrent suites
+do not interleave. Every suite task gets its own page event collector
+(harness.events), so events.errors() sees only that suite's page; the other
+runner plugins use the sync API and are not called here.
+"""
+import asyncio
+import io
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from harness import events, runner, scripts
+from harness.checkpoints import CheckpointStore, ScopedPage
+
+_output = ContextVar("aio_output", default=None)
+
+
+class _TaskStdout:
+    """sys.stdout stand-in that writes to the current task's buffer, if any."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buf = _output.get()
+        return (buf or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+@dataclass
+class _TaskState:
+    """Test state of one suite task; runner.test() and navigation() defer to it."""
+    suite: str
+    run: int
+    navigation_seconds: float = 0.0
+    depth: int = 0
+    # Plain-callback plugins of this task (before_test / after_test)
+    plugins: list = field(default_factory=list)
+
+    @contextmanager
+    def navigation(self):
+        self.depth += 1
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            if self.depth == 0:
+                self.navigation_seconds += time.monotonic() - start
+
+    async def test(self, name: str, fn):
+        self.navigation_seconds = 0.0
+        error = None
+        start = time.monotonic()
+        for plugin in self.plugins:
+            plugin.before_test(name)
+        try:
+            await scripts.run_async(fn())
+        except Exception as e:
+            error = e
+        for plugin in self.plugins:
+            plugin.after_test(name, error)
+        runner.record_test(name, self.suite, self.run, time.monotonic() - start,
+                           self.navigation_seconds, error)
+
+
+async def _run_suite(suite, store: CheckpointStore, run: int, limit: asyncio.Semaphore):
+    async with limit:
+        task = _TaskState(suite.__name__, run)
+        runner.set_task(task)
+        buf = io.StringIO()
+        _output.set(buf)
+        page = ScopedPage(store)
+        start = time.monotonic()
+        try:
+            await page.reset()
+            collector = events.EventCollector(page)
+            events.set_task(collector)
+            task.plugins.append(collector)
+            await scripts.run_async(suite(page))
+        except Exception as e:
+            runner.FAILED.append((f"suite {suite.__name__}", str(e)))
+            print(f"  ✗ suite aborted: {e}")
+        finally:
+            runner.SUITES.append(runner.SuiteResult(suite.__name__, run, time.monotonic() - start))
+            if page._context is not None:
+                await page.close()
+            _output.set(None)
+        print(buf.getvalue(), end="")
+
+
+async def run_suites(suites: list, base_url: str, concurrency: int = 4, repeat: int = 1,
+                     checkpoints: bool = True, context_options: dict = None):
+    """Run every suite `repeat` times, at most `concurrency` at once, in one event loop."""
+    from playwright.async_api import async_playwright
+
+    stdout = sys.stdout
+    sys.stdout = _TaskStdout(stdout)
+    start = time.monotonic()
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            store = CheckpointStore(browser, base_url, enabled=checkpoints)
+            store.context_options.update(context_options or {})
+            limit = asyncio.Semaphore(concurrency)
+            await asyncio.gather(*(_run_suite(suite, store, run, limit)
+                                   for run in range(repeat) for suite in suites))
+            await browser.close()
+    finally:
+        sys.stdout = stdout
+    serial = sum(s.seconds for s in runner.SUITES)
+    print(f"\nWall time {time.monotonic() - start:.1f}s for {serial:.1f}s of suite time "
+          f"(concurrency {concurrency})")
+
+
+def run(suites: list, base_url: str, **kwargs):
+    asyncio.run(run_suites(suites, base_url, **kwargs))
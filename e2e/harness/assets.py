@@ -0,0 +1,193 @@
+"""
+Per-route transfer-size and asset-cost audit, with budgets.
+
+Every resource the page fetches is read back from Resource Timing after each
+test (transfer, encoded and decoded bytes; transfer 0 with a body means it
+came from cache) and attributed to a route: the view whose
+`amakaflow:view-ready` event is the first one after the request started.
+That charges a lazy chunk to the view that asked for it, even though the
+chunk loads before the view commits.
+
+Budgets are per view (the app's data-view, "*" for every view) in KB of
+bytes transferred on that route, by kind (js_kb, css_kb, img_kb, font_kb,
+total_kb), plus `forbid`: chunk names that must not load on that route at
+all (e.g. the charting vendor chunk on first paint of Home or Import). A blown
+budget fails the test.
+
+Sizes are only meaningful against a production build (`vite build`): the dev
+server serves every module unbundled and uncompressed. Against anything else
+the audit runs with `enforce=False`: sizes and budget overruns are reported,
+but no test fails on them.
+"""
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+from harness.checkpoints import ScopedPage
+from harness.plugins import PagePlugin
+from harness.runner import register_results
+
+ASSETS = register_results("assets", [])
+
+DEFAULT_BUDGETS = {
+    "*": {"js_kb": 900, "css_kb": 150, "img_kb": 500, "total_kb": 1800},
+    "home": {"forbid": ["vendor-recharts", "vendor-lottie"]},
+    "workflow": {"forbid": ["vendor-recharts"]},
+    "import": {"js_kb": 400, "forbid": ["vendor-recharts"]},
+    "settings": {"js_kb": 200, "forbid": ["vendor-recharts"]},
+    "analytics": {"js_kb": 700},
+}
+
+KINDS = ("js", "css", "img", "font", "api", "other")
+
+ASSETS_INIT_JS = """(() => {
+  if (window.__e2eAssets) return;
+  const a = window.__e2eAssets = { views: [] };
+  // The default buffer (250 entries) overflows on a dev server
+  performance.setResourceTimingBufferSize(10000);
+  addEventListener('amakaflow:view-ready', e => {
+    a.views.push({ view: e.detail.view, t: performance.now() });
+  });
+})();"""
+
+_COLLECT_JS = """(since) => {
+  const a = window.__e2eAssets;
+  if (!a) return null;
+  const current = document.documentElement.dataset.view || null;
+  return performance.getEntriesByType('resource')
+    .filter(e => e.startTime >= since)
+    .map(e => {
+      const ready = a.views.find(v => v.t >= e.startTime);
+      return {
+        url: e.name,
+        initiator: e.initiatorType,
+        start_ms: e.startTime,
+        transfer: e.transferSize,
+        encoded: e.encodedBodySize,
+        decoded: e.decodedBodySize,
+        view: ready ? ready.view : current,
+      };
+    });
+}"""
+
+
+# Vite build output: /assets/<name>-<8 char hash>.<ext>
+_HASHED = re.compile(r"^(?P<name>.+)-[A-Za-z0-9_-]{8}\.(?P<ext>[a-z0-9]+)$")
+
+
+def chunk_name(url: str) -> str:
+    base = os.path.basename(urlsplit(url).path) or url
+    match = _HASHED.match(base)
+    return match.group("name") if match else base
+
+
+def kind(resource: dict) -> str:
+    ext = os.path.splitext(urlsplit(resource["url"]).path)[1].lower()
+    if resource["initiator"] in ("fetch", "xmlhttprequest", "beacon", "eventsource"):
+        return "api"
+    if ext in (".js", ".mjs", ".jsx", ".ts", ".tsx") or resource["initiator"] == "script":
+        return "js"
+    if ext == ".css":
+        return "css"
+    if ext in (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".ico"):
+        return "img"
+    if ext in (".woff", ".woff2", ".ttf", ".otf"):
+        return "font"
+    return "other"
+
+
+def summarize_routes(resources: list) -> dict:
+    """view → bytes by kind, cached count and the chunks fetched on that route."""
+    routes = {}
+    for r in resources:
+        route = routes.setdefault(r["view"] or "unknown", {
+            **{f"{k}_bytes": 0 for k in KINDS},
+            "total_bytes": 0, "decoded_bytes": 0, "requests": 0, "cached": 0, "chunks": [],
+        })
+        route["requests"] += 1
+        if r["transfer"] == 0 and r["decoded"] > 0:
+            route["cached"] += 1
+        route[f"{kind(r)}_bytes"] += r["transfer"]
+        route["total_bytes"] += r["transfer"]
+        route["decoded_bytes"] += r["decoded"]
+        if kind(r) in ("js", "css"):
+            route["chunks"].append(chunk_name(r["url"]))
+    return routes
+
+
+def check_budget(view: str, route: dict, budgets: dict) -> list:
+    limits = dict(budgets.get("*", {}))
+    limits.update(budgets.get(view, {}))
+    over = []
+    for metric, limit in limits.items():
+        if metric == "forbid":
+            loaded = sorted({c for c in route["chunks"] if any(c.startswith(f) for f in limit)})
+            if loaded:
+                over.append(f"{view} loads {', '.join(loaded)}")
+            continue
+        value = route.get(metric.replace("_kb", "_bytes"), 0) / 1024
+        if value > limit:
+            over.append(f"{view} {metric} {value:.0f} > {limit}")
+    return over
+
+
+def load_budgets(path: str = None) -> dict:
+    if not path:
+        return DEFAULT_BUDGETS
+    with open(path) as f:
+        return json.load(f)
+
+
+class AssetAudit(PagePlugin):
+    """Runner plugin that records per-route transfer sizes for every test run on `page`."""
+
+    init_script = ASSETS_INIT_JS
+
+    def __init__(self, page: ScopedPage, budgets: dict = None, enforce: bool = True):
+        super().__init__(page)
+        self.budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        # Fail tests over budget; only meaningful on a production build
+        self.enforce = enforce
+
+    def after_test(self, name: str, error):
+        since = self.since(self._mark)
+        resources = self._evaluate(_COLLECT_JS, since)
+        if not resources:
+            return
+        routes = summarize_routes(resources)
+        over = [o for view, route in routes.items() for o in check_budget(view, route, self.budgets)]
+        ASSETS.append({"test": name, "first_load": since == 0, "routes": routes,
+                       "over_budget": over, "enforced": self.enforce})
+        if over and error is None and self.enforce:
+            raise AssertionError(f"Asset budget exceeded: {'; '.join(over)}")
+
+
+def print_report():
+    if not ASSETS:
+        return
+    # Largest transfer seen per route across the run
+    worst = {}
+    for record in ASSETS:
+        for view, route in record["routes"].items():
+            if view not in worst or route["total_bytes"] > worst[view]["total_bytes"]:
+                worst[view] = route
+    print("\nAssets per route (largest transfer seen, KB):")
+    print(f"  {'view':<14} {'total':>7} {'js':>7} {'css':>6} {'img':>6} {'api':>6} "
+          f"{'reqs':>5} {'cached':>6}")
+    for view, r in sorted(worst.items(), key=lambda item: -item[1]["total_bytes"]):
+        print(f"  {view:<14} {r['total_bytes'] / 1024:7.0f} {r['js_bytes'] / 1024:7.0f} "
+              f"{r['css_bytes'] / 1024:6.0f} {r['img_bytes'] / 1024:6.0f} "
+              f"{r['api_bytes'] / 1024:6.0f} {r['requests']:5d} {r['cached']:6d}")
+    over = [o for record in ASSETS for o in record["over_budget"]]
+    if over:
+        print(f"  over budget: {len(over)} ({'; '.join(sorted(set(over))[:5])})")
+    if not all(record["enforced"] for record in ASSETS):
+        print("  budgets not enforced: not a production build (use --server prod)")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"tests": ASSETS}, f, indent=2)
+    print(f"Asset audit written to {path}")
@@ -0,0 +1,210 @@
+"""
+Performance baseline store and regression detector.
+
+A baseline is a versioned JSON file holding raw samples keyed by test name and
+metric (duration, LCP, JS heap, request count). `--save-baseline` writes the
+samples from the current run; `--compare-baseline` checks the current run's
+samples against it.
+
+Single e2e timings are noisy, so a change only counts when both hold:
+  - the medians moved by more than `threshold` (relative), and
+  - a two-sided Mann-Whitney U test rejects "same distribution" at `alpha`.
+With few samples even a complete separation cannot reach `alpha`, so metrics
+with fewer than min_samples(alpha) samples on either side are skipped (4 at
+the default 0.05). Run with --repeat 5 or more on both sides.
+"""
+import json
+import math
+import os
+import subprocess
+import time
+from dataclasses import asdict, dataclass
+
+from harness import runner, vitals
+from harness.stats import percentile
+
+VERSION = 1
+DEFAULT_ALPHA = 0.05
+
+# metric → (source, field). Lower is better for all of them.
+METRICS = {
+    "seconds": ("tests", "seconds"),
+    "lcp_ms": ("vitals", "lcp_ms"),
+    "js_heap_bytes": ("vitals", "js_heap_bytes"),
+    "requests": ("vitals", "requests"),
+}
+
+
+@dataclass
+class Finding:
+    test: str
+    metric: str
+    verdict: str
+    baseline_median: float
+    current_median: float
+    change: float
+    p_value: float
+
+
+def collect_samples() -> dict:
+    """test → metric → list of samples from this run; tests keyed by runner.test_key."""
+    samples = {}
+
+    def add(test, metric, value):
+        if value is not None:
+            samples.setdefault(test, {}).setdefault(metric, []).append(value)
+
+    for result in runner.TESTS:
+        if result.passed and not result.cached:
+            add(result.key, "seconds", result.seconds)
+    for record in vitals.RECORDS:
+        for metric, (source, field) in METRICS.items():
+            if source == "vitals":
+                add(runner.test_key(record["test"], record.get("profile")), metric,
+                    record.get(field))
+    return samples
+
+
+def _git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: str, samples: dict):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "version": VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": _git_revision(),
+            "samples": samples,
+        }, f, indent=2)
+    print(f"\nBaseline with {len(samples)} tests written to {path}")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != VERSION:
+        raise ValueError(f"{path} is baseline version {data.get('version')}, expected {VERSION}")
+    return data
+
+
+def mann_whitney_p(a: list, b: list) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation, tie-corrected)."""
+    n1, n2 = len(a), len(b)
+    ranked = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks = [0.0] * len(ranked)
+    ties = 0.0
+    i = 0
+    while i < len(ranked):
+        j = i
+        while j + 1 < len(ranked) and ranked[j + 1][0] == ranked[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t ** 3 - t
+        i = j + 1
+    r1 = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the mean
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return math.erfc(max(z, 0) / math.sqrt(2))
+
+
+def min_samples(alpha: float = DEFAULT_ALPHA) -> int:
+    """Smallest n per side at which a complete separation is significant at `alpha`."""
+    if not 0 < alpha < 1:
+        raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+    n = 2
+    while mann_whitney_p(list(range(n)), list(range(n, 2 * n))) >= alpha:
+        n += 1
+    return n
+
+
+MIN_SAMPLES = min_samples(DEFAULT_ALPHA)
+
+
+def comparable(baseline: dict, current: dict, alpha: float = DEFAULT_ALPHA) -> tuple:
+    """(compared, skipped) metric counts; a metric needs min_samples(alpha) on both sides."""
+    needed = min_samples(alpha)
+    compared = skipped = 0
+    for test, metrics in current.items():
+        for metric, samples in metrics.items():
+            before = baseline.get(test, {}).get(metric, [])
+            if len(before) < needed or len(samples) < needed:
+                skipped += 1
+            else:
+                compared += 1
+    return compared, skipped
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.10,
+            alpha: float = DEFAULT_ALPHA) -> list:
+    needed = min_samples(alpha)
+    findings = []
+    for test, metrics in current.items():
+        for metric, samples in metrics.items():
+            before = baseline.get(test, {}).get(metric, [])
+            if len(before) < needed or len(samples) < needed:
+                continue
+            old, new = percentile(before, 50), percentile(samples, 50)
+            if not old:
+                continue
+            change = (new - old) / old
+            if abs(change) <= threshold:
+                continue
+            p_value = mann_whitney_p(before, samples)
+            if p_value >= alpha:
+                continue
+            verdict = "regression" if change > 0 else "improvement"
+            findings.append(Finding(test, metric, verdict, old, new, change, p_value))
+    return findings
+
+
+def report(findings: list, baseline: dict, compared: int = None, skipped: int = 0,
+           alpha: float = DEFAULT_ALPHA):
+    print(f"\nBaseline comparison (against {baseline.get('revision') or 'unknown'} "
+          f"from {baseline.get('created')}):")
+    if compared is not None:
+        print(f"  {compared} metrics compared, {skipped} skipped "
+              f"(fewer than {min_samples(alpha)} samples on one side)")
+    if not findings:
+        print("  no significant changes")
+        return
+    for f in sorted(findings, key=lambda f: (f.verdict, -abs(f.change))):
+        mark = "▲" if f.verdict == "regression" else "▼"
+        print(f"  {mark} {f.verdict:<11} {f.metric:<14} {f.change:+6.0%}  "
+              f"{f.baseline_median:.4g} → {f.current_median:.4g}  p={f.p_value:.3f}  {f.test}")
+
+
+def check(path: str, threshold: float, alpha: float) -> list:
+    """Compare this run against the baseline at `path` and record regressions as failures."""
+    try:
+        baseline = load(path)
+    except (OSError, ValueError) as e:
+        print(f"\nBaseline comparison: cannot read {path}: {e}")
+        runner.FAILED.append(("perf: baseline", f"cannot read {path}: {e}"))
+        return []
+    current = collect_samples()
+    compared, skipped = comparable(baseline["samples"], current, alpha)
+    findings = compare(baseline["samples"], current, threshold, alpha)
+    report(findings, baseline, compared, skipped, alpha)
+    if not compared:
+        needed = min_samples(alpha)
+        runner.FAILED.append(("perf: baseline",
+                              f"no metric had {needed}+ samples in both runs "
+                              f"({skipped} skipped); use --repeat {needed} or more"))
+    for f in findings:
+        if f.verdict == "regression":
+            runner.FAILED.append((f"perf: {f.test} [{f.metric}]",
+                                  f"{f.change:+.0%} vs baseline (p={f.p_value:.3f})"))
+    return [asdict(f) for f in findings]
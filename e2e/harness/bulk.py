@@ -0,0 +1,448 @@
+"""
+Bulk import benchmark: Detect → Map → Match → Preview on generated files.
+
+A synthetic program of N exercise rows (100 to 5,000; eight rows per workout)
+is written out as a CSV or JSON file and uploaded through DetectStep. The API
+stand-in answers the ingestor's /import/detect/file, /import/map,
+/import/match and /import/preview with responses sized to the same program,
+so every step renders N rows' worth of data. The bulk import client calls
+no other service.
+
+The wizard has no nav entry; the benchmark reaches it through the demo-mode
+deep link `?e2e-view=bulk-import`. Demo mode answers bulk import from inline
+scenario data, so an init script sets the `window.__amakaflowE2ENetwork`
+opt-in (src/lib/e2e-network.ts) on every page and the requests reach the
+stand-in.
+
+Every user action that moves the wizard on is one step:
+
+  detect      "Upload & Detect" → Map Columns ready
+  map         "Apply Mappings & Continue" (CSV) or "Continue to Match
+              Exercises" (JSON, no columns to map) → the next step ready,
+              match list or preview
+  accept all  "Accept All Suggestions" → "Continue to Preview" enabled
+  match       "Continue to Preview" → preview ready
+
+and for each one the benchmark reports:
+
+  latency_ms        click → the next step's controls are on screen, sampled
+                    every animation frame
+  main_thread_ms    CDP Performance.getMetrics TaskDuration over the step
+  blocking_ms       total blocking time of the long tasks in the step (the
+                    part of each task over 50 ms); longest_task_ms alongside
+  heap_mb / nodes   JS heap still reachable after a forced GC, and DOM nodes,
+                    once the step is done
+
+`scaling()` fits latency ∝ rows^k per step, as the Workouts scale benchmark
+does for library size.
+"""
+import csv
+import io
+import json
+import os
+import random
+import re
+from dataclasses import asdict, dataclass, field
+
+from harness.checkpoints import ScopedPage, start_at
+from harness.network import NetworkStandIn
+from harness.readiness import goto
+from harness.runner import register_results
+from harness.stats import percentile, size_exponent
+
+ROWS = (100, 500, 1_000, 5_000)
+
+FORMATS = ("csv", "json")
+
+ROWS_PER_WORKOUT = 8
+
+RESULTS = register_results("bulk_import", [])
+
+JOB_ID = "bench-import-job"
+
+# File header → the MappingTargetField the ingestor detects for it
+COLUMNS = (
+    ("Week", "week"), ("Day", "day"), ("Workout", "title"), ("Block", "block"),
+    ("Exercise", "exercise"), ("Sets", "sets"), ("Reps", "reps"), ("Weight", "weight"),
+    ("Rest", "rest"), ("Notes", "notes"),
+)
+
+_EXERCISES = (
+    "Back Squat", "Front Squat", "Deadlift", "Romanian Deadlift", "Bench Press", "Push Up",
+    "Pull Up", "Bent Over Row", "Overhead Press", "Lunge", "Hip Thrust", "Leg Press",
+    "Lat Pulldown", "Face Pull", "Bicep Curl", "Tricep Pushdown", "Calf Raise", "Plank",
+)
+_VARIANTS = ("", "Tempo", "Paused", "Single Arm", "Deficit", "Banded", "Incline", "Close Grip")
+_TITLES = ("Push", "Pull", "Legs", "Upper", "Lower", "Full Body")
+_BLOCKS = ("Main Lift", "Accessory", "Finisher")
+
+# Share of exercise names the ingestor is unsure about
+NEEDS_REVIEW_SHARE = 0.15
+
+BULK_INIT_JS = """(() => {
+  if (window.__e2eBulk) return;
+  window.__amakaflowE2ENetwork = true;
+  const b = window.__e2eBulk = { click: null, longTasks: [] };
+  addEventListener('click', e => { b.click = e.timeStamp; }, { capture: true });
+  try {
+    new PerformanceObserver(list => {
+      for (const entry of list.getEntries()) b.longTasks.push([entry.startTime, entry.duration]);
+    }).observe({ type: 'longtask', buffered: true });
+  } catch (e) { /* no Long Tasks API: blocking_ms stays empty */ }
+})();"""
+
+# [[marker, button text pattern, enabled only]] → {marker, t} once one is on screen
+_READY_JS = """(markers) => {
+  const h1 = document.querySelector('h1');
+  if (!h1 || h1.querySelector('.animate-spin')) return false;
+  const buttons = [...document.querySelectorAll('button')];
+  for (const [marker, pattern, enabledOnly] of markers) {
+    const re = new RegExp(pattern);
+    if (buttons.some(b => re.test(b.textContent.trim()) && !(enabledOnly && b.disabled))) {
+      return { marker, t: performance.now() };
+    }
+  }
+  return false;
+}"""
+
+_WINDOW_JS = """(end) => {
+  const b = window.__e2eBulk;
+  const tasks = b.longTasks.filter(([start, duration]) => start + duration > b.click && start < end);
+  return { start: b.click, tasks: tasks.map(([, duration]) => duration) };
+}"""
+
+# What "the next step is ready" looks like, per marker
+READY = {
+    "map": (r"^(Apply Mappings & Continue|Continue to Match Exercises)$", False),
+    "match": (r"^(Continue to Preview|Resolve All Exercises to Continue)$", False),
+    "resolved": (r"^Continue to Preview$", True),
+    "preview": (r"^(Import \d+ Workouts?|Fix Errors to Continue)$", False),
+}
+
+# Long-task threshold of the Long Tasks API and TBT
+LONG_TASK_MS = 50
+
+
+def synthetic_rows(rows: int, seed: int = 1842) -> list:
+    """`rows` exercise rows of a training program, the same for the same seed."""
+    rng = random.Random(seed)
+    # Bigger programs use more distinct exercises, but repeat most of them
+    vocabulary = [f"{variant} {name}".strip() for variant in _VARIANTS for name in _EXERCISES]
+    vocabulary = vocabulary[:max(len(_EXERCISES), rows // 10)]
+    program = []
+    for i in range(rows):
+        workout = i // ROWS_PER_WORKOUT
+        program.append({
+            "week": workout // 5 + 1,
+            "day": workout % 5 + 1,
+            "title": f"Week {workout // 5 + 1} {_TITLES[workout % len(_TITLES)]}",
+            "block": _BLOCKS[(i % ROWS_PER_WORKOUT) * len(_BLOCKS) // ROWS_PER_WORKOUT],
+            "exercise": rng.choice(vocabulary),
+            "sets": rng.randint(2, 5),
+            "reps": rng.choice((5, 6, 8, 10, 12, 15)),
+            "weight": f"{rng.randint(8, 60) * 2.5:g}kg",
+            "rest": rng.choice((45, 60, 90, 120, 180)),
+            "notes": rng.choice(("", "", "", "RPE 8", "last set AMRAP", "slow eccentric")),
+        })
+    return program
+
+
+def _workouts(program: list) -> list:
+    """Rows grouped into WorkoutStructure-shaped dicts, one per workout."""
+    workouts = []
+    for start in range(0, len(program), ROWS_PER_WORKOUT):
+        rows = program[start:start + ROWS_PER_WORKOUT]
+        blocks = {}
+        for j, row in enumerate(rows):
+            blocks.setdefault(row["block"], []).append({
+                "id": f"ex-{start + j}", "name": row["exercise"], "sets": row["sets"],
+                "reps": row["reps"], "reps_range": None, "duration_sec": None,
+                "rest_sec": row["rest"], "rest_type": "timed", "distance_m": None,
+                "distance_range": None, "notes": row["notes"] or None,
+            })
+        workouts.append({
+            "title": rows[0]["title"],
+            "blocks": [{"id": f"block-{start}-{k}", "label": label, "structure": None, "exercises": exercises}
+                       for k, (label, exercises) in enumerate(blocks.items())],
+        })
+    return workouts
+
+
+def program_file(program: list, fmt: str) -> dict:
+    """The upload as a Playwright file payload: CSV rows, or JSON workouts."""
+    if fmt == "csv":
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow([header for header, _ in COLUMNS])
+        for row in program:
+            writer.writerow([row[key] for _, key in COLUMNS])
+        return {"name": f"program-{len(program)}.csv", "mimeType": "text/csv",
+                "buffer": out.getvalue().encode()}
+    body = {"program": f"Synthetic program ({len(program)} rows)", "workouts": _workouts(program)}
+    return {"name": f"program-{len(program)}.json", "mimeType": "application/json",
+            "buffer": json.dumps(body).encode()}
+
+
+def responses(program: list, fmt: str, file_name: str) -> dict:
+    """Ingestor responses for `program`: endpoint → serialised JSON body."""
+    workouts = _workouts(program)
+    items = [
+        {
+            "id": f"item-{w}",
+            "sourceIndex": w,
+            "sourceType": "file",
+            "sourceRef": f"{file_name} — {workout['title']}",
+            "parsedTitle": workout["title"],
+            "parsedExerciseCount": sum(len(b["exercises"]) for b in workout["blocks"]),
+            "parsedBlockCount": len(workout["blocks"]),
+            "confidence": 92,
+        }
+        for w, workout in enumerate(workouts)
+    ]
+    if fmt == "csv":
+        # A flat file needs column mapping; JSON is parsed directly
+        items[0]["raw_data"] = {"column_info": [
+            {"name": header, "index": i, "detected_type": target, "confidence": 95,
+             "sample_values": [str(row[target]) for row in program[:3]]}
+            for i, (header, target) in enumerate(COLUMNS)
+        ]}
+    detect = {
+        "success": True, "job_id": JOB_ID, "items": items, "total": len(items),
+        "success_count": len(items), "error_count": 0,
+        "metadata": {"programName": "Synthetic program", "detectedFormat": fmt,
+                     "totalRows": len(program), "headerRow": 0 if fmt == "csv" else None},
+    }
+    mapped = {
+        "success": True, "job_id": JOB_ID, "mapped_count": len(workouts),
+        "workouts": [{"detected_item_id": f"item-{w}", "parsed_workout": workout}
+                     for w, workout in enumerate(workouts)],
+    }
+
+    occurrences = {}
+    for i, row in enumerate(program):
+        occurrences.setdefault(row["exercise"], set()).add(f"item-{i // ROWS_PER_WORKOUT}")
+    rng = random.Random(len(program))
+    exercises = []
+    for n, (name, sources) in enumerate(sorted(occurrences.items())):
+        review = rng.random() < NEEDS_REVIEW_SHARE
+        garmin = name.split(" ", 1)[-1] if review else name
+        exercises.append({
+            "id": f"match-{n}", "original_name": name, "matched_garmin_name": garmin,
+            "confidence": 72 if review else 97, "status": "needs_review" if review else "matched",
+            "suggestions": [{"name": garmin, "confidence": 0.72 if review else 0.97},
+                            {"name": f"{garmin} (Alt)", "confidence": 0.6}],
+            "source_workout_ids": sorted(sources), "occurrence_count": len(sources),
+        })
+    review_count = sum(1 for e in exercises if e["status"] == "needs_review")
+    match = {
+        "success": True, "job_id": JOB_ID, "exercises": exercises,
+        "total_exercises": len(exercises), "matched": len(exercises) - review_count,
+        "needs_review": review_count, "unmapped": 0,
+    }
+
+    previews = []
+    for w, workout in enumerate(workouts):
+        issues = []
+        if w % 10 == 3:
+            issues.append({"id": f"issue-{w}", "severity": "warning", "field": "reps",
+                           "message": "Rep count looks high for this exercise",
+                           "autoFixable": False})
+        previews.append({
+            "id": f"preview-{w}", "detected_item_id": f"item-{w}", "title": workout["title"],
+            "exercise_count": items[w]["parsedExerciseCount"], "block_count": len(workout["blocks"]),
+            "validation_issues": issues, "workout": workout, "selected": True, "is_duplicate": False,
+        })
+    warnings = sum(len(p["validation_issues"]) for p in previews)
+    preview = {
+        "success": True, "job_id": JOB_ID, "workouts": previews,
+        "stats": {
+            "total_detected": len(previews), "total_selected": len(previews), "total_skipped": 0,
+            "exercises_matched": len(exercises), "exercises_needing_review": 0,
+            "exercises_unmapped": 0, "new_exercises_to_create": 0,
+            "estimated_duration": len(previews) * 2, "duplicates_found": 0,
+            "validation_errors": 0, "validation_warnings": warnings,
+        },
+    }
+    return {name: json.dumps(body) for name, body in
+            (("detect", detect), ("map", mapped), ("match", match), ("preview", preview))}
+
+
+@dataclass
+class StepResult:
+    step: str
+    # READY marker that ended the step (the map step can land on match or preview)
+    reached: str
+    latency_ms: float
+    main_thread_ms: float
+    blocking_ms: float
+    longest_task_ms: float
+    heap_mb: float
+    nodes: int
+
+    @property
+    def label(self) -> str:
+        return f"{self.step} → {self.reached}"
+
+
+@dataclass
+class BulkResult:
+    rows: int
+    format: str
+    run: int
+    file_kb: float = None
+    steps: list = field(default_factory=list)
+    error: str = None
+
+
+class BulkImportBenchmark:
+    """Serves sized ingestor responses through `stand_in` and times the bulk import wizard on `page`."""
+
+    def __init__(self, page: ScopedPage, stand_in: NetworkStandIn, timeout_ms: float = 120_000):
+        self.page = page
+        self.timeout_ms = timeout_ms
+        # Serialised once per size: 5,000 rows of preview workouts are several MB
+        self._bodies = {}
+        for name, path in (("detect", r"/import/detect/file"), ("map", r"/import/map"),
+                           ("match", r"/import/match"), ("preview", r"/import/preview")):
+            stand_in.route("ingestor", "POST", path,
+                           lambda request, fixtures, name=name: (200, self._bodies[name], "application/json"))
+        page.on_new_context(lambda context: context.add_init_script(BULK_INIT_JS))
+
+    def _button(self, pattern: str):
+        return self.page.get_by_role("button", name=re.compile(pattern)).first
+
+    def _metrics(self, cdp) -> dict:
+        return {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+
+    def _step(self, cdp, name: str, button, targets: tuple) -> StepResult:
+        before = self._metrics(cdp)
+        button.click()
+        ready = self.page.wait_for_function(
+            _READY_JS, arg=[[target, *READY[target]] for target in targets],
+            polling="raf", timeout=self.timeout_ms).json_value()
+        window = self.page.evaluate(_WINDOW_JS, ready["t"])
+        after = self._metrics(cdp)
+        cdp.send("HeapProfiler.collectGarbage")
+        heap = cdp.send("Runtime.getHeapUsage")["usedSize"]
+        return StepResult(
+            step=name,
+            reached=ready["marker"],
+            latency_ms=ready["t"] - window["start"],
+            main_thread_ms=(after.get("TaskDuration", 0) - before.get("TaskDuration", 0)) * 1000,
+            blocking_ms=sum(max(0, ms - LONG_TASK_MS) for ms in window["tasks"]),
+            longest_task_ms=max(window["tasks"], default=0),
+            heap_mb=heap / 2 ** 20,
+            nodes=int(after.get("Nodes", 0)),
+        )
+
+    def _open(self):
+        start_at(self.page, "home")
+        url = f"{self.page.store.base_url.rstrip('/')}/?e2e-view=bulk-import"
+        wait = goto(self.page, url, "bulk import", view="bulk-import")
+        if wait.fell_back:
+            raise AssertionError("bulk import deep link not honoured (VITE_DEMO_MODE off?)")
+
+    def run(self, rows: int, fmt: str = "csv", run: int = 0) -> BulkResult:
+        program = synthetic_rows(rows)
+        upload = program_file(program, fmt)
+        self._bodies = responses(program, fmt, upload["name"])
+        result = BulkResult(rows, fmt, run, file_kb=len(upload["buffer"]) / 1024)
+        # Fresh context: BulkImportProvider restores an unfinished job from localStorage
+        self.page.reset()
+        try:
+            self._open()
+            cdp = self.page.context.new_cdp_session(self.page.current)
+            cdp.send("Performance.enable")
+            self.page.locator("input[type=file][accept*='.csv']").set_input_files(upload)
+            result.steps.append(self._step(cdp, "detect", self._button("Upload & Detect"), ("map",)))
+
+            step = self._step(cdp, "map", self._button(READY["map"][0]), ("match", "preview"))
+            result.steps.append(step)
+            if step.reached == "match":
+                accept = self._button("Accept All Suggestions")
+                if accept.count() > 0:
+                    result.steps.append(self._step(cdp, "accept all", accept, ("resolved",)))
+                result.steps.append(self._step(cdp, "match", self._button(READY["resolved"][0]),
+                                               ("preview",)))
+            cdp.detach()
+        except Exception as e:
+            result.error = str(e).splitlines()[0]
+        RESULTS.append(result)
+        return result
+
+
+def step_summary(results: list = None) -> dict:
+    """(format, rows) → step label → p50 / p95 of each metric over the runs."""
+    results = RESULTS if results is None else results
+    grouped = {}
+    for r in results:
+        grouped.setdefault((r.format, r.rows), []).append(r)
+    summary = {}
+    for key, runs in sorted(grouped.items()):
+        steps = {}
+        for r in runs:
+            for s in r.steps:
+                steps.setdefault(s.label, []).append(s)
+        summary[key] = {
+            "runs": len(runs),
+            "file_kb": runs[0].file_kb,
+            "errors": [r.error for r in runs if r.error],
+            "steps": {
+                label: {metric: {"p50": percentile([getattr(s, metric) for s in samples], 50),
+                                 "p95": percentile([getattr(s, metric) for s in samples], 95)}
+                        for metric in ("latency_ms", "main_thread_ms", "blocking_ms",
+                                       "longest_task_ms", "heap_mb", "nodes")}
+                for label, samples in steps.items()
+            },
+        }
+    return summary
+
+
+def scaling(summary: dict) -> dict:
+    """format → step label → exponent k of the p50 latency against row count."""
+    points = {}
+    for (fmt, rows), row in summary.items():
+        for label, metrics in row["steps"].items():
+            points.setdefault(fmt, {}).setdefault(label, []).append((rows, metrics["latency_ms"]["p50"]))
+    return {fmt: {label: size_exponent(values) for label, values in steps.items()}
+            for fmt, steps in points.items()}
+
+
+def _ms(value) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def print_report():
+    if not RESULTS:
+        return
+    summary = step_summary()
+    print("\nBulk import by file size (p50):")
+    print(f"  {'file':>11} {'step':<24} {'latency':>8} {'main':>7} {'TBT':>7} "
+          f"{'longest':>8} {'heap MB':>8} {'nodes':>7}")
+    for (fmt, rows), row in summary.items():
+        name = f"{rows} {fmt}"
+        for label, m in row["steps"].items():
+            print(f"  {name:>11} {label:<24} {_ms(m['latency_ms']['p50']):>8} "
+                  f"{_ms(m['main_thread_ms']['p50']):>7} {_ms(m['blocking_ms']['p50']):>7} "
+                  f"{_ms(m['longest_task_ms']['p50']):>8} {m['heap_mb']['p50'] or 0:>8.1f} "
+                  f"{_ms(m['nodes']['p50']):>7}")
+            name = ""
+        for error in row["errors"]:
+            print(f"      error: {error[:160]}")
+    for fmt, steps in scaling(summary).items():
+        exponents = [f"{label} k={k:.2f}" for label, k in steps.items() if k is not None]
+        if exponents:
+            print(f"  {fmt} scaling (latency ∝ rows^k): " + ", ".join(exponents))
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    summary = step_summary()
+    with open(path, "w") as f:
+        json.dump({
+            "runs": [dict(asdict(r), steps=[dict(asdict(s), label=s.label) for s in r.steps])
+                     for r in RESULTS],
+            "sizes": {f"{rows} {fmt}": row for (fmt, rows), row in summary.items()},
+            "scaling": scaling(summary),
+        }, f, indent=2)
+    print(f"Bulk import report written to {path}")
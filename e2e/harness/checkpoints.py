@@ -0,0 +1,269 @@
+"""
+Storage-state checkpoints for named waypoints in the app.
+
+Most tests begin by clicking their way from the home screen to the step they
+actually exercise. A waypoint names one of those starting points; the first
+time a process needs it, the click path is run once and the result captured
+as a checkpoint: the context's storage state plus a URL that reproduces the
+app state (the demo build honours `?e2e-view=…&e2e-step=…`, see
+src/lib/e2e-checkpoint.ts). Later tests call `start_at(page, name)` and get a
+fresh browser context restored at that checkpoint.
+
+If the app does not honour the deep link (older build, demo mode off) the
+restore falls back to replaying the click path inside the restored context.
+
+Paths, store and page are shared by both runners: on an async Browser the
+methods that touch the browser return awaitables (see harness.scripts), and
+the caller awaits `page.reset()` before first use.
+"""
+import asyncio
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from playwright.sync_api import Browser, Page
+
+from harness import scripts
+from harness.readiness import click, goto, reload, snapshot
+from harness.runner import navigation
+
+
+GET_STARTED = "button:has-text('Get Started')"
+CREATE_NEW = "button:has-text('Create New'), button:has-text('Blank')"
+# The card button; the first button with "Template" in it is the Templates tab
+USE_TEMPLATE = "button:has-text('Use Template')"
+BACK = "button:has-text('Back')"
+CONFIRM_BACK = "[role=alertdialog] button:has-text('OK')"
+
+
+# Single clicks of the click paths, shared with the leak cycles and the load
+# journey (harness.load). Each returns the readiness Wait of its last click.
+def open_home(page: Page, base_url: str):
+    return (yield goto(page, base_url, "home", view="home"))
+
+
+def get_started(page: Page):
+    return (yield click(page, page.locator(GET_STARTED).first, "get started",
+                        view="workflow", step="add-sources"))
+
+
+def create_new(page: Page):
+    return (yield click(page, page.locator(CREATE_NEW).first, "create new", step="structure"))
+
+
+def use_template(page: Page):
+    return (yield click(page, page.locator(USE_TEMPLATE).first, "use template", step="structure"))
+
+
+def go_back(page: Page):
+    """Back from structure to add-sources, confirming the dialog handleBack may open."""
+    wait = yield click(page, page.locator(BACK).first, "back", step="add-sources",
+                       selector="[role=alertdialog]")
+    confirm = page.locator(CONFIRM_BACK)
+    if (yield confirm.count()) > 0:
+        wait = yield click(page, confirm.first, "confirm back", step="add-sources")
+    return wait
+
+
+def _path_welcome(page: Page, base_url: str):
+    yield open_home(page, base_url)
+    yield page.evaluate("localStorage.clear()")
+    yield reload(page, "welcome", view="home", welcome="shown")
+
+
+def _path_home(page: Page, base_url: str):
+    yield open_home(page, base_url)
+    yield page.evaluate("localStorage.setItem('amakaflow_welcome_dismissed', 'true')")
+    yield reload(page, "home", view="home", welcome="dismissed")
+
+
+def _path_add_sources(page: Page, base_url: str):
+    yield open_home(page, base_url)
+    yield page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
+    yield reload(page, "welcome", view="home", welcome="shown")
+    if (yield page.locator(GET_STARTED).count()) > 0:
+        yield get_started(page)
+
+
+def _path_structure(page: Page, base_url: str):
+    yield _path_add_sources(page, base_url)
+    if (yield page.locator(CREATE_NEW).count()) > 0:
+        yield create_new(page)
+
+
+@dataclass
+class Waypoint:
+    # Script that clicks its way to the waypoint: path(page, base_url)
+    path: object
+    view: str = None
+    step: str = None
+    welcome: str = None
+
+    @property
+    def target(self) -> dict:
+        return {"view": self.view, "step": self.step, "welcome": self.welcome}
+
+
+WAYPOINTS = {
+    "welcome": Waypoint(_path_welcome, view="home", welcome="shown"),
+    "home": Waypoint(_path_home, view="home", welcome="dismissed"),
+    "add-sources": Waypoint(_path_add_sources, view="workflow", step="add-sources"),
+    "structure": Waypoint(_path_structure, view="workflow", step="structure"),
+}
+
+
+def checkpoint_url(base_url: str, state: dict) -> str:
+    """URL that deep-links the demo build back into view/step `state`."""
+    if not state or (state["view"] == "home" and state["step"] == "add-sources"):
+        return base_url
+    params = {"e2e-view": state["view"]}
+    if state["view"] == "workflow":
+        params["e2e-step"] = state["step"]
+    return f"{base_url.rstrip('/')}/?{urlencode(params)}"
+
+
+@dataclass
+class Checkpoint:
+    name: str
+    storage_state: dict
+    url: str
+    # Cleared after the first restore where the app ignored the deep link
+    deep_link: bool = True
+
+
+class CheckpointStore:
+    """Captures each waypoint once per process and hands out restored contexts."""
+
+    def __init__(self, browser: Browser, base_url: str, enabled: bool = True):
+        self.browser = browser
+        self.base_url = base_url
+        self.enabled = enabled
+        # Applied to every context, including the ones used to capture checkpoints
+        self.context_options = {}
+        self._context_hooks = []
+        # name → Checkpoint; on the async API a task, so suites that need the
+        # same waypoint at once share one capture
+        self._checkpoints = {}
+
+    @property
+    def is_async(self) -> bool:
+        return scripts.is_async(self.browser)
+
+    def on_new_context(self, hook):
+        """Call `hook(context)` for every context created after this point.
+
+        A hook may be a script, or return an awaitable on the async API.
+        """
+        self._context_hooks.append(hook)
+
+    def new_context(self, **kwargs):
+        return scripts.call(self, self._new_context(kwargs))
+
+    def _new_context(self, kwargs: dict):
+        context = yield self.browser.new_context(**{**self.context_options, **kwargs})
+        for hook in self._context_hooks:
+            yield hook(context)
+        return context
+
+    def get(self, name: str) -> Checkpoint:
+        if name not in self._checkpoints:
+            capture = self._capture(name)
+            self._checkpoints[name] = (asyncio.ensure_future(scripts.run_async(capture))
+                                       if self.is_async else scripts.run(capture))
+        return self._checkpoints[name]
+
+    def _capture(self, name: str):
+        waypoint = WAYPOINTS[name]
+        context = yield self.new_context()
+        try:
+            page = yield context.new_page()
+            yield waypoint.path(page, self.base_url)
+            url = checkpoint_url(self.base_url, (yield snapshot(page)))
+            return Checkpoint(name, (yield context.storage_state()), url)
+        finally:
+            yield context.close()
+
+
+class ScopedPage:
+    """
+    Page handle the suites close over.
+
+    Attribute access is forwarded to the current page; `restore()` swaps that
+    page for one in a fresh context, so each test can start from a checkpoint
+    while the suite code keeps using the same `page` variable.
+    """
+
+    def __init__(self, store: CheckpointStore):
+        self.store = store
+        self._context_hooks = []
+        self._close_hooks = []
+        self._context = None
+        self._page = None
+        if not self.is_async:
+            self.reset()
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+    @property
+    def is_async(self) -> bool:
+        return self.store.is_async
+
+    @property
+    def current(self) -> Page:
+        """The underlying page, for APIs that need a real Page (CDP sessions)."""
+        return self._page
+
+    def on_new_context(self, hook):
+        """Call `hook(context)` now and for every context this handle opens later."""
+        self._context_hooks.append(hook)
+        hook(self._context)
+
+    def on_close_context(self, hook):
+        """Call `hook(context)` before this handle closes a context it opened."""
+        self._close_hooks.append(hook)
+
+    def _close_context(self):
+        for hook in self._close_hooks:
+            hook(self._context)
+        yield self._context.close()
+
+    def _open(self, **kwargs):
+        if self._context is not None:
+            yield self._close_context()
+        self._context = yield self.store.new_context(**kwargs)
+        for hook in self._context_hooks:
+            hook(self._context)
+        self._page = yield self._context.new_page()
+
+    def reset(self):
+        """Swap in a blank context, e.g. between suites that must not share state."""
+        return scripts.call(self, self._open())
+
+    def restore(self, name: str):
+        return scripts.call(self, self._restore(name))
+
+    def _restore(self, name: str):
+        waypoint = WAYPOINTS[name]
+        with navigation():
+            if not self.store.enabled:
+                yield waypoint.path(self._page, self.store.base_url)
+                return
+
+            checkpoint = yield self.store.get(name)
+            yield self._open(storage_state=checkpoint.storage_state)
+
+            if checkpoint.deep_link:
+                wait = yield goto(self._page, checkpoint.url, f"restore {name}",
+                                  **waypoint.target)
+                if not wait.fell_back:
+                    return
+                checkpoint.deep_link = False
+            yield waypoint.path(self._page, self.store.base_url)
+
+    def close(self):
+        return scripts.call(self, self._close_context())
+
+
+def start_at(page: ScopedPage, name: str):
+    """Start the current test at waypoint `name` in a fresh, restored context."""
+    return page.restore(name)
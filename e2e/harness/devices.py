@@ -0,0 +1,167 @@
+"""
+Device profiles: CPU throttling and network emulation through CDP.
+
+Each profile slows every page the harness opens with
+Emulation.setCPUThrottlingRate and Network.emulateNetworkConditions. Running
+the suites once per profile (--profiles) gives the latency a phone on the gym
+floor sees instead of a developer workstation's. The viewport stays desktop:
+the suites drive the desktop nav bar, which is hidden below the md
+breakpoint.
+
+DeviceProfiler is a runner plugin that records, per test:
+
+  inp_ms  interaction to next paint — the longest Event Timing duration of
+          any interaction in the test (the p98 rule only differs past 50
+          interactions, which no test reaches)
+  tti_ms  time to interactive — the end of the last long task before a 5 s
+          window without long tasks, counted from FCP. Network quiet is not
+          part of it, and a test that ends inside the window reports the last
+          long task seen.
+
+Responses answered by page.route (the API stand-in) skip network emulation.
+"""
+from dataclasses import dataclass
+
+from harness import runner
+from harness.checkpoints import ScopedPage
+from harness.plugins import PagePlugin
+from harness.runner import register_results
+from harness.stats import percentile
+
+
+def _kbps(kbits: float) -> float:
+    """Kbit/s → bytes/s, as Network.emulateNetworkConditions expects."""
+    return kbits * 1024 / 8
+
+
+@dataclass
+class Profile:
+    name: str
+    cpu: float = 1
+    # None leaves the network alone
+    latency_ms: float = None
+    download_kbps: float = None
+    upload_kbps: float = None
+
+
+# CPU factors and links follow Lighthouse's mobile presets
+PROFILES = {
+    "desktop": Profile("desktop"),
+    "mid-tier-4g": Profile("mid-tier-4g", cpu=4, latency_ms=150, download_kbps=1638, upload_kbps=750),
+    "low-end-3g": Profile("low-end-3g", cpu=6, latency_ms=400, download_kbps=400, upload_kbps=400),
+    "gym-wifi": Profile("gym-wifi", cpu=4, latency_ms=300, download_kbps=1000, upload_kbps=250),
+}
+
+RECORDS = register_results("devices", [])
+
+DEVICE_INIT_JS = """(() => {
+  if (window.__e2eDevice) return;
+  const d = window.__e2eDevice = { interactions: [], longTasks: [], fcp: null };
+  const observe = (type, sink, extra) => {
+    try {
+      new PerformanceObserver(list => sink(list.getEntries()))
+        .observe({ type, buffered: true, ...extra });
+    } catch (e) { /* entry type unsupported in this browser */ }
+  };
+  observe('event', es => es.forEach(e => {
+    if (e.interactionId) d.interactions.push({ t: e.startTime, d: e.duration });
+  }), { durationThreshold: 16 });
+  observe('longtask', es => es.forEach(e => d.longTasks.push({ t: e.startTime, end: e.startTime + e.duration })));
+  observe('paint', es => es.forEach(e => {
+    if (e.name === 'first-contentful-paint') d.fcp = e.startTime;
+  }));
+})();"""
+
+_COLLECT_JS = """(since) => {
+  const d = window.__e2eDevice;
+  if (!d) return null;
+  const interactions = d.interactions.filter(e => e.t >= since);
+  let tti = null;
+  if (since === 0 && d.fcp !== null) {
+    tti = d.fcp;
+    for (const task of d.longTasks) {
+      if (task.end < tti) continue;
+      if (task.t - tti >= 5000) break;
+      tti = task.end;
+    }
+  }
+  return {
+    inp_ms: interactions.length ? Math.max(...interactions.map(e => e.d)) : null,
+    interactions: interactions.length,
+    tti_ms: tti,
+  };
+}"""
+
+class DeviceProfiler(PagePlugin):
+    """Emulates `profile` on every page of `page`'s contexts and records INP / TTI per test."""
+
+    init_script = DEVICE_INIT_JS
+
+    def __init__(self, page: ScopedPage, profile: Profile):
+        self.profile = profile
+        super().__init__(page)
+
+    def _attach(self, context):
+        super()._attach(context)
+        for existing in context.pages:
+            self._emulate(existing)
+        context.on("page", self._emulate)
+
+    def _emulate(self, page):
+        cdp = page.context.new_cdp_session(page)
+        if self.profile.cpu > 1:
+            cdp.send("Emulation.setCPUThrottlingRate", {"rate": self.profile.cpu})
+        if self.profile.latency_ms is not None:
+            cdp.send("Network.enable")
+            cdp.send("Network.emulateNetworkConditions", {
+                "offline": False,
+                "latency": self.profile.latency_ms,
+                "downloadThroughput": _kbps(self.profile.download_kbps),
+                "uploadThroughput": _kbps(self.profile.upload_kbps),
+            })
+        # The session stays attached: detaching would drop the emulation
+
+    def after_test(self, name: str, error):
+        record = self._evaluate(_COLLECT_JS, self.since(self._mark))
+        if record is None:
+            return
+        record.update(profile=self.profile.name, suite=runner.current_suite(), test=name)
+        RECORDS.append(record)
+
+
+def profile_table() -> dict:
+    """profile → suite → INP p75 / max and TTI p50 over the suite's tests."""
+    table = {}
+    for r in RECORDS:
+        table.setdefault(r["profile"], {}).setdefault(r["suite"], []).append(r)
+    summary = {}
+    for profile, suites in table.items():
+        for suite, records in suites.items():
+            inp = [r["inp_ms"] for r in records if r["inp_ms"] is not None]
+            tti = [r["tti_ms"] for r in records if r["tti_ms"] is not None]
+            summary.setdefault(profile, {})[suite] = {
+                "inp_p75_ms": percentile(inp, 75),
+                "inp_max_ms": max(inp) if inp else None,
+                "tti_p50_ms": percentile(tti, 50),
+            }
+    return summary
+
+
+def _ms(value) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def print_report():
+    if not RECORDS:
+        return
+    table = profile_table()
+    suites = sorted({suite for rows in table.values() for suite in rows})
+    print("\nDevice profiles (INP p75 / max, TTI p50, ms):")
+    print(f"  {'suite':<24}" + "".join(f"{p:>24}" for p in table))
+    for suite in suites:
+        cells = []
+        for rows in table.values():
+            s = rows.get(suite)
+            cells.append(f"{_ms(s['inp_p75_ms'])}/{_ms(s['inp_max_ms'])}  {_ms(s['tti_p50_ms'])}"
+                         if s else "-")
+        print(f"  {suite:<24}" + "".join(f"{c:>24}" for c in cells))
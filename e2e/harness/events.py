@@ -0,0 +1,145 @@
+"""
+Central collector for page events: console messages, uncaught page errors,
+failed requests and slow requests.
+
+Listeners are attached once per browser context (they go away with it), and
+events land in one bounded ring buffer, so a long run neither piles up
+listeners on the shared page nor grows without limit. Every event is tagged
+with a sequence number; the collector is a runner plugin and marks where each
+test starts, so queries only see the running test's events:
+
+    assert not events.errors(CRITICAL_JS_ERRORS)
+
+A per-test count of each event kind is kept in COUNTS for the reports.
+
+Under the asyncio runner (harness.aio) every suite task has its own
+collector, set with set_task(), and queries read that one instead.
+"""
+import itertools
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from harness.checkpoints import ScopedPage
+from harness.runner import register_results
+
+KINDS = ("console", "pageerror", "requestfailed", "slowrequest")
+
+COUNTS = register_results("events", [])
+
+_collector = None
+_task_collector = ContextVar("events_collector", default=None)
+
+
+@dataclass
+class Event:
+    seq: int
+    kind: str
+    # Console message type (error, warning, …), HTTP method for requests
+    type: str
+    text: str
+    url: str = None
+    duration_ms: float = None
+
+
+class EventCollector:
+    """Runner plugin that records page events into a ring buffer of `capacity`."""
+
+    def __init__(self, page: ScopedPage, capacity: int = 1000, slow_request_ms: float = 1000):
+        self.buffer = deque(maxlen=capacity)
+        self.slow_request_ms = slow_request_ms
+        self._seq = itertools.count()
+        self._test_start = 0
+        self._test = None
+        page.on_new_context(self._attach)
+
+    def _attach(self, context):
+        for page in context.pages:
+            self._watch(page)
+        context.on("page", self._watch)
+
+    def _watch(self, page):
+        page.on("console", self._on_console)
+        page.on("pageerror", self._on_page_error)
+        page.on("requestfailed", self._on_request_failed)
+        page.on("requestfinished", self._on_request_finished)
+
+    def _add(self, kind: str, type: str, text: str, **extra):
+        self.buffer.append(Event(next(self._seq), kind, type, text, **extra))
+
+    def _on_console(self, msg):
+        self._add("console", msg.type, msg.text)
+
+    def _on_page_error(self, error):
+        self._add("pageerror", "error", str(error))
+
+    def _on_request_failed(self, request):
+        self._add("requestfailed", request.method, request.failure or "failed", url=request.url)
+
+    def _on_request_finished(self, request):
+        end = request.timing.get("responseEnd", -1)
+        if end > self.slow_request_ms:
+            self._add("slowrequest", request.method, f"{end:.0f}ms", url=request.url,
+                      duration_ms=end)
+
+    def before_test(self, name: str):
+        self._test = name
+        self._test_start = next(self._seq)
+
+    def after_test(self, name: str, error):
+        counts = {kind: 0 for kind in KINDS}
+        counts["console_errors"] = 0
+        for event in self.events():
+            counts[event.kind] += 1
+            if event.kind == "console" and event.type == "error":
+                counts["console_errors"] += 1
+        COUNTS.append({"test": name, **counts})
+
+    def events(self, kind: str = None) -> list:
+        """Events of the running test (oldest first), optionally of one kind."""
+        return [e for e in self.buffer
+                if e.seq > self._test_start and (kind is None or e.kind == kind)]
+
+
+def install(page: ScopedPage, capacity: int = 1000, slow_request_ms: float = 1000) -> EventCollector:
+    global _collector
+    _collector = EventCollector(page, capacity, slow_request_ms)
+    return _collector
+
+
+def set_task(collector: EventCollector):
+    """Answer queries from the current asyncio task with `collector`."""
+    _task_collector.set(collector)
+
+
+def events(kind: str = None) -> list:
+    collector = _task_collector.get() or _collector
+    if collector is None:
+        raise RuntimeError("No event collector installed; call events.install(page) first")
+    return collector.events(kind)
+
+
+def errors(keywords: tuple = None) -> list:
+    """Console errors and uncaught page errors of the running test, as text.
+
+    With `keywords`, only messages containing one of them are returned.
+    """
+    texts = [e.text for e in events()
+             if e.kind == "pageerror" or (e.kind == "console" and e.type == "error")]
+    if keywords:
+        texts = [t for t in texts if any(kw in t for kw in keywords)]
+    return texts
+
+
+def print_summary():
+    if not COUNTS:
+        return
+    totals = {kind: sum(c[kind] for c in COUNTS) for kind in ("console_errors",) + KINDS[1:]}
+    if not any(totals.values()):
+        return
+    print("\nPage events: " + ", ".join(f"{n} {kind.replace('_', ' ')}"
+                                        for kind, n in totals.items() if n))
+    noisy = sorted(COUNTS, key=lambda c: -(c["console_errors"] + c["pageerror"]))[:5]
+    for c in noisy:
+        if c["console_errors"] + c["pageerror"]:
+            print(f"  {c['console_errors']:3d} console errors  {c['pageerror']:3d} page errors  {c['test']}")
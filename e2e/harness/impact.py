@@ -0,0 +1,241 @@
+"""
+Coverage-driven test impact selection, with cached results for the rest.
+
+CoverageCollector is a runner plugin that records the source files each test
+runs. It starts V8 precise coverage (CDP Profiler, function granularity) on
+every page the test's contexts open. When the test ends, or a context is
+closed mid-test by start_at, it maps every script the dev server served
+from /src/ back to its file:
+
+  executed  files where at least one function other than the module body ran
+  loaded    files whose module body ran, i.e. something the test loaded
+            imported them
+
+Only unbundled modules can be mapped, so the map needs the Vite dev server.
+A test whose coverage names no src/ file (production build) is always run.
+
+Incremental mode keeps three things from the last green run in one state
+file: the coverage map, the content hash of every file in the working tree
+(`git ls-files`, untracked included), and each test's result per device
+profile (keyed by runner.test_key). The next run
+hashes the tree again and decides what to run:
+
+  - a change outside src/ (harness, package.json, vite.config.ts,
+    index.html, …) reruns everything, unless the file matches IGNORED;
+  - a changed src/ file reruns the tests that executed one of its
+    functions. If none did, it reruns every test that loaded the file
+    (module-level constants);
+  - src/ files no test loaded (types, stories, unit tests) rerun nothing;
+  - tests missing from the map (new, or never green) always run.
+
+Every other test is booked from the cache (runner.use_cached). A green run
+writes its coverage, hashes and results back to the state file.
+"""
+import hashlib
+import json
+import os
+import subprocess
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from urllib.parse import unquote, urlsplit
+
+from harness import runner
+from harness.checkpoints import ScopedPage
+from harness.runner import register_results
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# Files whose changes cannot affect a suite; reports the harness writes included
+IGNORED = (
+    "*.md", "*.txt", "docs/*", ".github/*", ".storybook/*", "src/stories/*",
+    "*/__tests__/*", "*.test.ts", "*.test.tsx", "e2e/bench_*.py", "e2e/load_workflow.py",
+    "*test-results/*",
+)
+
+# Never hashed, whether or not .gitignore lists them
+_UNHASHED = (":(exclude,glob)**/node_modules/**", ":(exclude,glob)**/dist/**",
+             ":(exclude,glob)**/test-results/**")
+
+# One {"test", "executed", "loaded"} per test run with coverage on
+COVERAGE = register_results("coverage", [])
+
+STATE_VERSION = 2
+
+
+class CoverageCollector:
+    """Runner plugin that records which src/ files every test loads and executes."""
+
+    def __init__(self, page: ScopedPage):
+        self.page = page
+        base = urlsplit(page.store.base_url)
+        self.origin = f"{base.scheme}://{base.netloc}"
+        # One {"context", "cdp", "loaded"} per page with coverage running
+        self._sessions = []
+        self._executed = set()
+        self._loaded = set()
+        page.on_new_context(lambda context: context.on("page", self._attach))
+        page.on_close_context(self._drain)
+        self._attach(page.current)
+
+    def _attach(self, page):
+        try:
+            cdp = page.context.new_cdp_session(page)
+            cdp.send("Profiler.enable")
+            cdp.send("Profiler.startPreciseCoverage", {"callCount": True, "detailed": False})
+        except Exception:
+            return  # Not Chromium, or the page is already gone
+        self._sessions.append({"context": page.context, "cdp": cdp, "loaded": set()})
+
+    def _source(self, url: str):
+        parts = urlsplit(url)
+        if f"{parts.scheme}://{parts.netloc}" != self.origin or not parts.path.startswith("/src/"):
+            return None
+        return unquote(parts.path[1:])
+
+    def _take(self, session: dict) -> set:
+        """Executed files since the last take (V8 resets its counters on every take)."""
+        try:
+            scripts = session["cdp"].send("Profiler.takePreciseCoverage")["result"]
+        except Exception:
+            return set()
+        executed = set()
+        for script in scripts:
+            path = self._source(script.get("url", ""))
+            if not path:
+                continue
+            for function in script["functions"]:
+                ranges = function["ranges"]
+                if not ranges or not ranges[0]["count"]:
+                    continue
+                if ranges[0]["startOffset"] == 0 and not function["functionName"]:
+                    session["loaded"].add(path)
+                else:
+                    executed.add(path)
+        session["loaded"] |= executed
+        return executed
+
+    def _drain(self, context):
+        """Collect from the pages of `context` before it closes."""
+        for session in [s for s in self._sessions if s["context"] is context]:
+            self._executed |= self._take(session)
+            # Module bodies the closing pages ran count as loaded by this test
+            self._loaded |= session["loaded"]
+            self._sessions.remove(session)
+
+    def before_test(self, name: str):
+        self._executed, self._loaded = set(), set()
+        for session in self._sessions:
+            self._take(session)
+
+    def after_test(self, name: str, error):
+        for session in list(self._sessions):
+            self._executed |= self._take(session)
+            # Pages the test kept using count everything they have loaded
+            self._loaded |= session["loaded"]
+        COVERAGE.append({"test": name, "executed": sorted(self._executed),
+                         "loaded": sorted(self._loaded | self._executed)})
+
+
+# ---------------------------------------------------------------------------
+# Selection
+# ---------------------------------------------------------------------------
+def tree_hashes(root: str = REPO_ROOT) -> dict:
+    """path → sha256 of every tracked or untracked, non-ignored file under `root`."""
+    listing = subprocess.run(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard",
+                              "--", ".", *_UNHASHED],
+                             cwd=root, capture_output=True, check=True).stdout
+    hashes = {}
+    for path in sorted(set(filter(None, listing.decode().split("\0")))):
+        full = os.path.join(root, path)
+        if not os.path.isfile(full):
+            continue  # Deleted in the working tree but still in the index
+        with open(full, "rb") as f:
+            hashes[path] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def changed_files(old: dict, new: dict) -> list:
+    return sorted(path for path in set(old) | set(new) if old.get(path) != new.get(path))
+
+
+def _ignored(path: str) -> bool:
+    return any(fnmatch(path, pattern) for pattern in IGNORED)
+
+
+@dataclass
+class Selection:
+    changed: list = field(default_factory=list)
+    # Tests to book instead of run: test_key → TestResult fields
+    cached: dict = field(default_factory=dict)
+    # Tests the changes point at
+    impacted: list = field(default_factory=list)
+    # Set when everything runs
+    full_reason: str = None
+
+
+def select(state: dict, hashes: dict) -> Selection:
+    """Which tests `hashes` invalidates, against the last green `state`."""
+    if not state:
+        return Selection(full_reason="no green run recorded yet")
+    changed = changed_files(state["hashes"], hashes)
+    outside = [path for path in changed if not path.startswith("src/") and not _ignored(path)]
+    if outside:
+        more = f" and {len(outside) - 1} more" if len(outside) > 1 else ""
+        return Selection(changed, full_reason=f"{outside[0]}{more} changed outside src/")
+
+    coverage = state["coverage"]
+    impacted = set()
+    for path in changed:
+        if _ignored(path):
+            continue
+        executed = {test for test, files in coverage.items() if path in files["executed"]}
+        impacted |= executed or {test for test, files in coverage.items() if path in files["loaded"]}
+    cached = {key: result for key, result in state["results"].items()
+              if coverage.get(result["test"], {}).get("loaded") and result["test"] not in impacted}
+    return Selection(changed, cached, sorted(impacted))
+
+
+def load_state(path: str):
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+
+def save_state(path: str, state: dict, hashes: dict):
+    """Record this green run: its hashes, plus coverage and results of the tests that ran."""
+    state = state or {"coverage": {}, "results": {}}
+    seen = {r.name for r in runner.TESTS}
+    coverage = {test: files for test, files in state["coverage"].items() if test in seen}
+    fresh = {}
+    for record in COVERAGE:
+        files = fresh.setdefault(record["test"], {"executed": set(), "loaded": set()})
+        files["executed"].update(record["executed"])
+        files["loaded"].update(record["loaded"])
+    coverage.update({test: {kind: sorted(paths) for kind, paths in files.items()}
+                     for test, files in fresh.items()})
+    keys = {r.key for r in runner.TESTS}
+    results = {key: result for key, result in state["results"].items() if key in keys}
+    for r in runner.TESTS:
+        if not r.cached:
+            results[r.key] = {k: v for k, v in asdict(r).items()
+                              if k in ("passed", "seconds", "navigation_seconds", "error")}
+            results[r.key]["test"] = r.name
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"version": STATE_VERSION, "hashes": hashes, "coverage": coverage,
+                   "results": results}, f, indent=1)
+    print(f"Impact state written to {path} ({len(coverage)} tests mapped)")
+
+
+def print_selection(selection: Selection):
+    if selection.full_reason:
+        print(f"Incremental: running every test ({selection.full_reason})")
+        return
+    print(f"Incremental: {len(selection.changed)} changed file(s), "
+          f"{len(selection.impacted)} impacted test(s), {len(selection.cached)} from cache")
+    for path in selection.changed[:10]:
+        print(f"  Δ {path}")
@@ -0,0 +1,150 @@
+"""
+JS heap and DOM leak detection over repeated navigation cycles.
+
+A cycle is a round trip that should leave the app where it started (every
+nav view and back home, or add-sources → structure → back). The detector
+runs a few warm-up cycles so lazy chunks and caches settle, then after every
+cycle forces garbage collection and samples through the Chrome DevTools
+Protocol:
+
+  heap_bytes       Runtime.getHeapUsage usedSize
+  nodes            Memory.getDOMCounters nodes (includes detached ones)
+  listeners        Memory.getDOMCounters jsEventListeners
+  detached_nodes   DOM.getDetachedDomNodes (newer Chromium only)
+
+Growth per cycle is the least-squares slope over those samples, so a single
+noisy sample does not fail the run. When a cycle's slope is over threshold,
+heap snapshots from after the warm-up and after the last cycle are kept
+(<dir>/<cycle>-{start,end}.heapsnapshot) for diffing in DevTools' Memory tab.
+"""
+import os
+from dataclasses import dataclass, field
+
+from harness import scripts
+from harness.checkpoints import ScopedPage
+from harness.runner import register_results
+
+LEAKS = register_results("leaks", [])
+
+# Allowed growth per cycle
+DEFAULT_THRESHOLDS = {
+    "heap_bytes": 256 * 1024,
+    "nodes": 50,
+    "listeners": 10,
+    "detached_nodes": 10,
+}
+
+
+@dataclass
+class LeakResult:
+    cycle: str
+    cycles: int
+    samples: list = field(default_factory=list)
+    # metric → growth per cycle
+    slopes: dict = field(default_factory=dict)
+    over: list = field(default_factory=list)
+    snapshots: list = field(default_factory=list)
+
+
+def slope(values: list) -> float:
+    """Least-squares slope of `values` against their index."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x = (n - 1) / 2
+    mean_y = sum(values) / n
+    num = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(values))
+    den = sum((x - mean_x) ** 2 for x in range(n))
+    return num / den
+
+
+class LeakDetector:
+    def __init__(self, page: ScopedPage, snapshot_dir: str = "test-results/leaks",
+                 thresholds: dict = None):
+        self.page = page
+        self.snapshot_dir = snapshot_dir
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+
+    def _session(self):
+        current = self.page.current
+        return current.context.new_cdp_session(current)
+
+    def sample(self) -> dict:
+        cdp = self._session()
+        try:
+            # Twice: the first pass can leave finalizer-reachable garbage behind
+            cdp.send("HeapProfiler.collectGarbage")
+            cdp.send("HeapProfiler.collectGarbage")
+            heap = cdp.send("Runtime.getHeapUsage")
+            counters = cdp.send("Memory.getDOMCounters")
+            try:
+                detached = len(cdp.send("DOM.getDetachedDomNodes")["detachedNodes"])
+            except Exception:
+                detached = None
+            return {
+                "heap_bytes": heap["usedSize"],
+                "nodes": counters["nodes"],
+                "listeners": counters["jsEventListeners"],
+                "detached_nodes": detached,
+            }
+        finally:
+            cdp.detach()
+
+    def heap_snapshot(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        cdp = self._session()
+        try:
+            with open(path, "w") as f:
+                cdp.on("HeapProfiler.addHeapSnapshotChunk", lambda params: f.write(params["chunk"]))
+                cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            cdp.detach()
+
+    def check(self, name: str, cycle, cycles: int = 10, warmup: int = 2) -> LeakResult:
+        """Run `cycle(page)` warmup + cycles times and record the growth per cycle."""
+        for _ in range(warmup):
+            scripts.run(cycle(self.page))
+        start_snapshot = os.path.join(self.snapshot_dir, f"{name}-start.heapsnapshot")
+        self.heap_snapshot(start_snapshot)
+
+        result = LeakResult(name, cycles, samples=[self.sample()])
+        for _ in range(cycles):
+            scripts.run(cycle(self.page))
+            result.samples.append(self.sample())
+
+        for metric, limit in self.thresholds.items():
+            values = [s[metric] for s in result.samples if s[metric] is not None]
+            if len(values) < 2:
+                continue
+            result.slopes[metric] = slope(values)
+            if result.slopes[metric] > limit:
+                result.over.append(f"{metric} +{result.slopes[metric]:.0f}/cycle > {limit}")
+
+        if result.over:
+            end_snapshot = os.path.join(self.snapshot_dir, f"{name}-end.heapsnapshot")
+            self.heap_snapshot(end_snapshot)
+            result.snapshots = [start_snapshot, end_snapshot]
+        else:
+            os.remove(start_snapshot)
+        LEAKS.append(result)
+        if result.over:
+            raise AssertionError(f"Leak in {name}: {'; '.join(result.over)} "
+                                 f"(snapshots in {self.snapshot_dir})")
+        return result
+
+
+def print_report():
+    if not LEAKS:
+        return
+    print("\nLeak check (growth per cycle after forced GC):")
+    for r in LEAKS:
+        parts = []
+        for metric, value in r.slopes.items():
+            if metric == "heap_bytes":
+                parts.append(f"heap {value / 1024:+.1f} KB")
+            else:
+                parts.append(f"{metric.replace('_', ' ')} {value:+.1f}")
+        mark = "✗" if r.over else "✓"
+        print(f"  {mark} {r.cycle:<10} {r.cycles} cycles  {', '.join(parts)}")
+        for path in r.snapshots:
+            print(f"      {path}")
@@ -0,0 +1,218 @@
+"""
+Multi-user load / soak runs of the workflow journey.
+
+A virtual user is one asyncio task with its own browser context (so its own
+localStorage and cache, like a first-time visitor). It repeats the journey
+the suites walk through
+
+  open home → get started (add sources) → create new | use template
+  (structure) → back (add sources)
+
+until the run's duration or iteration count is used up, starting a fresh
+context for every iteration. Users start staggered over `ramp_up` seconds.
+
+The steps are the suites' own click-path scripts (harness.checkpoints) with
+their readiness waits, and contexts come from a CheckpointStore, so the
+network stand-in and context options of the harness apply here too.
+
+Each step is timed from the action to the app's view-ready signal; a step
+whose wait falls back to networkidle never reached its target and fails. A
+failed step ends that iteration and is counted against the step. Only step
+timings and counters are kept (no pages, logs or traces), so long soaks stay
+cheap.
+"""
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+from playwright.async_api import Page
+
+from harness import checkpoints, scripts
+from harness.checkpoints import CheckpointStore
+from harness.readiness import SIGNAL_TIMEOUT_MS
+from harness.stats import mean, percentile
+
+
+@dataclass
+class StepStats:
+    samples: list = field(default_factory=list)
+    errors: int = 0
+    last_error: str = None
+
+
+@dataclass
+class LoadResult:
+    users: int
+    seconds: float = 0.0
+    journeys: int = 0
+    failed_journeys: int = 0
+    steps: dict = field(default_factory=dict)
+    # Completed journeys and p50 step latency per `window` seconds of the run
+    windows: list = field(default_factory=list)
+
+
+def _reached(wait):
+    # A readiness wait that fell back to networkidle never saw its target state
+    if wait.fell_back:
+        raise AssertionError(f"{wait.label}: target state not reached within "
+                             f"{SIGNAL_TIMEOUT_MS / 1000:.0f}s")
+
+
+def step_open_home(page: Page, base_url: str, iteration: int):
+    _reached((yield checkpoints.open_home(page, base_url)))
+
+
+def step_get_started(page: Page, base_url: str, iteration: int):
+    _reached((yield checkpoints.get_started(page)))
+
+
+def step_structure(page: Page, base_url: str, iteration: int):
+    # Alternate the two ways into the structure step
+    if iteration % 2 == 0:
+        _reached((yield checkpoints.create_new(page)))
+    else:
+        _reached((yield checkpoints.use_template(page)))
+
+
+def step_back(page: Page, base_url: str, iteration: int):
+    _reached((yield checkpoints.go_back(page)))
+
+
+JOURNEY = [
+    ("open home", step_open_home),
+    ("get started", step_get_started),
+    ("structure", step_structure),
+    ("back", step_back),
+]
+
+
+class LoadRun:
+    """Virtual users on `journey`, a list of (name, script step(page, base_url, iteration))."""
+
+    def __init__(self, store: CheckpointStore, users: int, duration: float = None,
+                 iterations: int = None, ramp_up: float = 0.0, window: float = 10.0,
+                 journey: list = None):
+        if not duration and not iterations:
+            raise ValueError("a load run needs a duration or an iteration count")
+        self.store = store
+        self.base_url = store.base_url
+        self.users = users
+        self.duration = duration
+        self.iterations = iterations
+        self.ramp_up = ramp_up
+        self.window = window
+        self.journey = journey or JOURNEY
+        self.result = LoadResult(users, steps={name: StepStats() for name, _ in self.journey})
+        self._start = None
+        # window index → [journeys, step samples]
+        self._windows = {}
+
+    def _done(self, iteration: int) -> bool:
+        if self.iterations and iteration >= self.iterations:
+            return True
+        return bool(self.duration) and time.monotonic() - self._start >= self.duration
+
+    def _window(self) -> list:
+        index = int((time.monotonic() - self._start) // self.window)
+        return self._windows.setdefault(index, [0, []])
+
+    async def _journey(self, iteration: int) -> bool:
+        context = await self.store.new_context()
+        try:
+            page = await context.new_page()
+            for name, step in self.journey:
+                stats = self.result.steps[name]
+                start = time.monotonic()
+                try:
+                    await scripts.run_async(step(page, self.base_url, iteration))
+                except Exception as e:
+                    stats.errors += 1
+                    stats.last_error = str(e).splitlines()[0]
+                    return False
+                seconds = time.monotonic() - start
+                stats.samples.append(seconds)
+                self._window()[1].append(seconds)
+            return True
+        finally:
+            await context.close()
+
+    async def _user(self, index: int):
+        if self.users > 1 and self.ramp_up:
+            await asyncio.sleep(self.ramp_up * index / (self.users - 1))
+        iteration = 0
+        while not self._done(iteration):
+            ok = await self._journey(iteration)
+            self.result.journeys += 1
+            if ok:
+                self._window()[0] += 1
+            else:
+                self.result.failed_journeys += 1
+            iteration += 1
+
+    async def run(self) -> LoadResult:
+        self._start = time.monotonic()
+        await asyncio.gather(*(self._user(i) for i in range(self.users)))
+        self.result.seconds = time.monotonic() - self._start
+        self.result.windows = [
+            {"start_s": index * self.window, "journeys": journeys,
+             "step_p50_s": percentile(samples, 50)}
+            for index, (journeys, samples) in sorted(self._windows.items())
+        ]
+        return self.result
+
+
+def summary(result: LoadResult) -> dict:
+    steps = {}
+    for name, stats in result.steps.items():
+        attempts = len(stats.samples) + stats.errors
+        steps[name] = {
+            "count": len(stats.samples),
+            "errors": stats.errors,
+            "error_rate": stats.errors / attempts if attempts else 0.0,
+            "mean": mean(stats.samples),
+            "p50": percentile(stats.samples, 50),
+            "p95": percentile(stats.samples, 95),
+            "p99": percentile(stats.samples, 99),
+            "last_error": stats.last_error,
+        }
+    completed = result.journeys - result.failed_journeys
+    return {
+        "users": result.users,
+        "seconds": result.seconds,
+        "journeys": result.journeys,
+        "failed_journeys": result.failed_journeys,
+        "journeys_per_second": completed / result.seconds if result.seconds else 0.0,
+        "steps_per_second": (sum(s["count"] for s in steps.values()) / result.seconds
+                             if result.seconds else 0.0),
+        "steps": steps,
+        "windows": result.windows,
+    }
+
+
+def print_report(result: LoadResult):
+    s = summary(result)
+    print(f"\nLoad: {s['users']} users, {s['seconds']:.1f}s, {s['journeys']} journeys "
+          f"({s['failed_journeys']} failed)")
+    print(f"  throughput {s['journeys_per_second']:.2f} journeys/s, "
+          f"{s['steps_per_second']:.2f} steps/s")
+    print(f"\n  {'step':<14} {'count':>6} {'err%':>6} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for name, step in s["steps"].items():
+        p = [f"{step[q]:.2f}s" if step[q] is not None else "-" for q in ("p50", "p95", "p99")]
+        print(f"  {name:<14} {step['count']:>6} {step['error_rate']:>6.1%} "
+              f"{p[0]:>7} {p[1]:>7} {p[2]:>7}")
+        if step["last_error"]:
+            print(f"      last error: {step['last_error'][:160]}")
+    if len(s["windows"]) > 1:
+        print("\n  window   journeys  step p50")
+        for w in s["windows"]:
+            p50 = f"{w['step_p50_s']:.2f}s" if w["step_p50_s"] is not None else "-"
+            print(f"  {w['start_s']:6.0f}s  {w['journeys']:>8}  {p50:>8}")
+
+
+def write_report(path: str, result: LoadResult):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(summary(result), f, indent=2)
+    print(f"\nLoad report written to {path}")
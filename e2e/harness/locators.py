@@ -0,0 +1,193 @@
+"""
+Batched locator resolution for the E2E suites.
+
+The suites find controls by trying fallback selectors in order, each with its
+own `locator.count()`, and then read `body.inner_text()` for keyword checks:
+one browser round trip per probe. find() sends the whole candidate list and
+the keywords in a single page.evaluate and returns the first candidate that
+matches, the keywords present in the page text and, on request, the text.
+
+Candidates mirror the Playwright locators they replace, and Match.locator()
+builds that locator for the winner, so clicks keep Playwright's auto-wait:
+
+  has_text("button", "Import")  ≈ page.locator("button").filter(has_text="Import")
+  role("button", "Create")      ≈ page.get_by_role("button", name="Create")
+  by_text("Create New")         ≈ page.get_by_text("Create New")
+
+Text matching is case-insensitive on whitespace-normalised text, as in
+:has-text(); a role name also matches aria-label, and like get_by_role() a
+role candidate only matches a rendered element.
+
+Candidates keep their declared priority. The winner of every candidate set
+is remembered per view (<html data-view>) for the rest of the session; next
+time, if it still matches, the candidates before it (which missed there
+last time) are skipped, otherwise the set is probed in order again. Every
+lookup is recorded in LOOKUPS, and print_summary() reports the round trips
+saved.
+"""
+from dataclasses import dataclass, field
+
+from playwright.sync_api import Page
+
+from harness.runner import register_results
+from harness.scripts import call
+
+# CSS equivalent of the ARIA roles the suites query by
+ROLE_CSS = {
+    "button": "button, [role=button], input[type=button], input[type=submit]",
+    "link": "a[href], [role=link]",
+    "tab": "[role=tab]",
+}
+
+FIND_JS = """([candidates, keywords, wantText, cached]) => {
+  const view = document.documentElement.dataset.view || '';
+  const norm = s => (s || '').replace(/\\s+/g, ' ').toLowerCase();
+  const matches = c => {
+    const want = c.text ? norm(c.text) : null;
+    for (const el of document.querySelectorAll(c.css)) {
+      if (c.role && !el.getClientRects().length) continue;  // get_by_role skips hidden elements
+      if (!want) return true;
+      const label = c.role ? norm(el.getAttribute('aria-label')) : '';
+      if (norm(el.textContent).includes(want) || label.includes(want)) return true;
+    }
+    return false;
+  };
+  let index = null, probed = 0;
+  const probe = i => {
+    probed++;
+    try {
+      return matches(candidates[i]);
+    } catch (e) {
+      return false;  // Not valid CSS in this browser
+    }
+  };
+  const hint = cached[view];
+  if (hint !== undefined && hint < candidates.length && probe(hint)) index = hint;
+  for (let i = 0; index === null && i < candidates.length; i++) {
+    if (i !== hint && probe(i)) index = i;
+  }
+  const body = keywords.length || wantText ? (document.body ? document.body.innerText : '') : '';
+  return {
+    view, index, probed, hit: index !== null && index === hint,
+    keywords: keywords.filter(k => body.includes(k)),
+    text: wantText || keywords.length ? body : null,
+  };
+}"""
+
+
+@dataclass(frozen=True)
+class Candidate:
+    css: str
+    # Case-insensitive substring of the element's text (or accessible name)
+    text: str = None
+    # Set for role(); the locator is then get_by_role(role, name=text)
+    role: str = None
+    # Set for by_text(); the locator is then get_by_text(text)
+    by_text: bool = False
+
+    def locator(self, page: Page):
+        if self.role:
+            return page.get_by_role(self.role, name=self.text).first
+        if self.by_text:
+            return page.get_by_text(self.text).first
+        if self.text:
+            return page.locator(self.css).filter(has_text=self.text).first
+        return page.locator(self.css).first
+
+
+def css(selector: str) -> Candidate:
+    return Candidate(selector)
+
+
+def has_text(selector: str, text: str) -> Candidate:
+    return Candidate(selector, text)
+
+
+def role(name: str, text: str) -> Candidate:
+    return Candidate(ROLE_CSS[name], text, name)
+
+
+def by_text(value: str) -> Candidate:
+    return Candidate("body", value, by_text=True)
+
+
+@dataclass
+class Match:
+    name: str
+    view: str = None
+    # Winning candidate, None when nothing matched
+    candidate: Candidate = None
+    # Keywords found in the page text
+    keywords: list = field(default_factory=list)
+    # body.innerText, when keywords or text=True were requested
+    text: str = ""
+
+    def __bool__(self) -> bool:
+        return self.candidate is not None
+
+    def locator(self, page: Page):
+        return self.candidate.locator(page)
+
+
+@dataclass
+class Lookup:
+    name: str
+    view: str
+    candidates: int
+    # Candidates tried in the page before one matched (or all of them)
+    probed: int
+    keywords: int
+    found: bool
+    cache_hit: bool
+
+
+LOOKUPS = register_results("locators", [])
+
+# name → {view: index of the candidate that won there}; lives for the session
+_winners = {}
+
+
+def find(page: Page, name: str, candidates: list = (), keywords: list = (),
+         text: bool = False) -> Match:
+    """Resolve `candidates` and check `keywords` in one page evaluation.
+
+    `name` identifies the candidate set for the winner cache, so the same
+    name must always come with the same candidates. Like readiness.click(),
+    an awaitable on the async API.
+    """
+    return call(page, _find(page, name, candidates, keywords, text))
+
+
+def _find(page: Page, name: str, candidates, keywords, text: bool):
+    cached = _winners.get(name, {})
+    result = yield page.evaluate(FIND_JS, [
+        [{"css": c.css, "text": c.text, "role": c.role} for c in candidates],
+        list(keywords), text, cached,
+    ])
+    index = result["index"]
+    if index is not None:
+        _winners.setdefault(name, {})[result["view"]] = index
+    LOOKUPS.append(Lookup(name, result["view"], len(candidates), result["probed"],
+                          len(keywords), index is not None, result["hit"]))
+    return Match(name, result["view"] or None,
+                 candidates[index] if index is not None else None,
+                 result["keywords"], result["text"] or "")
+
+
+def page_text(page: Page, keywords: list = ()) -> Match:
+    """The page's text and which of `keywords` it contains, in one evaluation."""
+    return find(page, "page text", keywords=keywords, text=True)
+
+
+def print_summary():
+    if not LOOKUPS:
+        return
+    probes = sum(l.probed for l in LOOKUPS)
+    # One count() per probed candidate, plus the inner_text() behind any keyword check
+    unbatched = probes + sum(1 for l in LOOKUPS if l.keywords or not l.candidates)
+    hits = sum(1 for l in LOOKUPS if l.cache_hit)
+    resolved = sum(1 for l in LOOKUPS if l.candidates)
+    print(f"\nLocator lookups: {len(LOOKUPS)} evaluations for {unbatched} unbatched round trips "
+          f"({probes} candidate probes)")
+    if resolved:
+        print(f"  cached winner matched first: {hits}/{resolved}")
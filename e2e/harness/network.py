@@ -0,0 +1,253 @@
+"""
+Fixture-backed stand-in for the backend APIs, built on context.route().
+
+In demo mode the app answers API calls from its MSW service worker, and
+outside it from the real services; both add latency and variance that have
+nothing to do with the frontend. The stand-in blocks service workers and
+answers ingestor, mapper, calendar, chat, Strava and Garmin requests from the
+JSON under src/api/fixtures/ instead:
+
+  services/<service>.json   default response for that service's main call
+  scenarios/<name>.json     `mocks` override the service defaults (--scenario)
+
+Modes:
+  fixtures — answer from fixtures only
+  replay   — answer from a recorded HAR, falling back to fixtures
+  record   — let API calls through to the live services and record them to a
+             HAR (needs the backends running)
+  live     — no routing; only the injected latency applies
+
+`latency_ms` delays every API fetch inside the page, so concurrent requests
+are still concurrent and a run can model a slow backend deterministically.
+Requests the stand-in has no answer for are logged and get a 404.
+"""
+import glob
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+from harness import scripts
+from harness.checkpoints import CheckpointStore, ScopedPage
+from harness.runner import register_results
+
+MODES = ("live", "fixtures", "replay", "record")
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "src", "api", "fixtures")
+
+# Same env vars and defaults as src/lib/config.ts
+SERVICES = {
+    "mapper": os.environ.get("VITE_MAPPER_API_URL", "http://localhost:8001"),
+    "ingestor": os.environ.get("VITE_INGESTOR_API_URL", "http://localhost:8004"),
+    "strava": os.environ.get("VITE_STRAVA_API_URL", "http://localhost:8000"),
+    "garmin": os.environ.get("VITE_GARMIN_API_URL", "http://localhost:8002"),
+    "calendar": os.environ.get("VITE_CALENDAR_API_URL", "http://localhost:8003"),
+    "chat": os.environ.get("VITE_CHAT_API_URL", "http://localhost:8005"),
+}
+
+API_URL = re.compile(
+    "^(?:" + "|".join(re.escape(origin.rstrip("/")) for origin in SERVICES.values()) + ")(?:[/?].*)?$"
+)
+
+# One dict per API request the stand-in saw: service, method, path, source
+REQUESTS = register_results("network", [])
+
+_LATENCY_JS = """(cfg) => {
+  if (window.__e2eLatency) return;
+  window.__e2eLatency = true;
+  const fetch = window.fetch;
+  window.fetch = function (input, init) {
+    const url = input instanceof Request ? input.url : String(input);
+    if (!cfg.origins.some(o => url.startsWith(o))) return fetch.call(this, input, init);
+    return new Promise(r => setTimeout(r, cfg.ms)).then(() => fetch.call(this, input, init));
+  };
+}"""
+
+
+def scenarios(fixtures_dir: str = FIXTURES_DIR) -> list:
+    return sorted(os.path.splitext(os.path.basename(path))[0]
+                  for path in glob.glob(os.path.join(fixtures_dir, "scenarios", "*.json")))
+
+
+def load_fixtures(scenario: str = None, fixtures_dir: str = FIXTURES_DIR) -> dict:
+    """service → default response body, with the scenario's mocks applied on top."""
+    fixtures = {}
+    for path in glob.glob(os.path.join(fixtures_dir, "services", "*.json")):
+        with open(path) as f:
+            fixtures[os.path.splitext(os.path.basename(path))[0]] = json.load(f)
+    if scenario:
+        with open(os.path.join(fixtures_dir, "scenarios", f"{scenario}.json")) as f:
+            fixtures.update(json.load(f).get("mocks", {}))
+    return fixtures
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _chat_stream(request, fixtures):
+    body = request.post_data_json or {}
+    session = body.get("session_id") or "e2e-session"
+    events = [
+        _sse("message_start", {"session_id": session}),
+        _sse("content_delta", {"text": "This is a fixture response. "}),
+        _sse("content_delta", {"text": f"You said: \"{body.get('message', '')}\""}),
+        _sse("message_end", {"session_id": session, "tokens_used": 42, "latency_ms": 0,
+                             "pending_imports": []}),
+    ]
+    return 200, "".join(events), "text/event-stream"
+
+
+def _fixture(service: str):
+    return lambda request, fixtures: (200, fixtures[service], None)
+
+
+def _static(body):
+    return lambda request, fixtures: (200, body, None)
+
+
+# (service or None for any, method, path regex, responder). First match wins;
+# responders return (status, body, content type or None for JSON), or None to
+# let the request through to the network.
+ROUTES = [
+    ("ingestor", "POST", r"/ingest/.+", _fixture("ingestor")),
+    ("mapper", "POST", r"/exercises/match", _fixture("mapper")),
+    ("mapper", "GET", r"/workouts", _static({"success": True, "workouts": [], "count": 0})),
+    ("mapper", "GET", r"/programs", _static({"success": True, "programs": [], "count": 0})),
+    ("mapper", "GET", r"/tags", _static({"success": True, "tags": [], "count": 0})),
+    ("calendar", "GET", r"/calendar(/connected-calendars)?", _static([])),
+    ("strava", "GET", r"/strava/activities", _static([])),
+    ("chat", "POST", r"/chat/stream", _chat_stream),
+    (None, "GET", r"/health", _static({"status": "ok"})),
+]
+
+
+class NetworkStandIn:
+    """Routes every API request of every context the harness opens."""
+
+    def __init__(self, mode: str = "fixtures", scenario: str = None, har: str = None,
+                 latency_ms: float = 0, fixtures_dir: str = FIXTURES_DIR):
+        if mode not in MODES:
+            raise ValueError(f"mode must be one of {MODES}, got {mode!r}")
+        if mode in ("replay", "record") and not har:
+            raise ValueError(f"{mode} mode needs a HAR file")
+        self.mode = mode
+        self.har = har
+        self.latency_ms = latency_ms
+        self.fixtures = load_fixtures(scenario, fixtures_dir)
+        # Per-instance copy so a benchmark can put its own routes in front
+        self.routes = list(ROUTES)
+        self._parts = 0
+
+    def route(self, service: str, method: str, path: str, responder):
+        """Answer `method path` on `service` with `responder` ahead of the defaults."""
+        self.routes.insert(0, (service, method, path, responder))
+
+    def install(self, page: ScopedPage):
+        self.install_store(page.store)
+        return page.reset()
+
+    def install_store(self, store: CheckpointStore):
+        """Route every context `store` opens from now on (pages come later)."""
+        if self.mode != "live":
+            # The MSW worker would answer before page.route ever sees the request
+            store.context_options["service_workers"] = "block"
+        store.on_new_context(self.attach)
+
+    def attach(self, context):
+        return scripts.call(context, self._attach(context))
+
+    def _attach(self, context):
+        if self.latency_ms:
+            origins = [origin.rstrip("/") for origin in SERVICES.values()]
+            yield context.add_init_script(
+                f"({_LATENCY_JS})({json.dumps({'origins': origins, 'ms': self.latency_ms})})")
+        if self.mode in ("fixtures", "replay"):
+            yield context.route(API_URL, self._on_route)
+        if self.mode == "replay":
+            # Routes added later take precedence; misses fall through to fixtures
+            yield context.route_from_har(self.har, url=API_URL, not_found="fallback")
+        if self.mode == "record":
+            # One part per context (the HAR is written when it closes); merged by finish_recording()
+            self._parts += 1
+            part = os.path.join(_parts_dir(self.har), f"{os.getpid()}-{self._parts}.har")
+            os.makedirs(os.path.dirname(part), exist_ok=True)
+            yield context.route_from_har(part, url=API_URL, update=True, update_content="embed")
+
+    def _on_route(self, route):
+        return scripts.call(route, self._handle(route))
+
+    def _handle(self, route):
+        request = route.request
+        url = urlsplit(request.url)
+        origin = f"{url.scheme}://{url.netloc}"
+        service = next((name for name, base in SERVICES.items()
+                        if base.rstrip("/") == origin), None)
+        record = {"service": service, "method": request.method, "path": url.path}
+        REQUESTS.append(record)
+
+        for route_service, method, pattern, responder in self.routes:
+            if route_service not in (None, service) or method != request.method:
+                continue
+            if re.fullmatch(pattern, url.path):
+                answer = responder(request, self.fixtures)
+                if answer is None:
+                    record["source"] = "network"
+                    yield route.continue_()
+                    return
+                status, body, content_type = answer
+                record["source"] = "fixture"
+                if content_type is None:
+                    yield route.fulfill(status=status, json=body)
+                else:
+                    yield route.fulfill(status=status, body=body, content_type=content_type)
+                return
+
+        if request.method in ("POST", "PUT", "PATCH", "DELETE"):
+            # Writes only need to succeed for the UI to move on
+            record["source"] = "default"
+            yield route.fulfill(status=200, json={"success": True})
+            return
+        record["source"] = "unhandled"
+        yield route.fulfill(status=404, json={"detail": f"No fixture for {request.method} {url.path}"})
+
+
+def _parts_dir(har: str) -> str:
+    return f"{har}.parts"
+
+
+def finish_recording(har: str):
+    """Merge the per-context HAR parts of a recording (from every worker) into `har`."""
+    parts = sorted(glob.glob(os.path.join(_parts_dir(har), "*.har")))
+    merged = None
+    for path in parts:
+        with open(path) as f:
+            data = json.load(f)
+        if merged is None:
+            merged = data
+        else:
+            merged["log"]["entries"].extend(data["log"]["entries"])
+    if merged is None:
+        print(f"\nNo API traffic recorded for {har}")
+        return
+    with open(har, "w") as f:
+        json.dump(merged, f, indent=2)
+    # Only once the merged HAR is on disk, so a failed write keeps the recording
+    for path in parts:
+        os.remove(path)
+    os.rmdir(_parts_dir(har))
+    print(f"\nRecorded {len(merged['log']['entries'])} API responses to {har}")
+
+
+def print_summary():
+    if not REQUESTS:
+        return
+    counts = {}
+    for record in REQUESTS:
+        counts[record["source"]] = counts.get(record["source"], 0) + 1
+    print(f"\nAPI stand-in: {len(REQUESTS)} requests not served from a HAR "
+          f"({', '.join(f'{n} {source}' for source, n in sorted(counts.items()))})")
+    unhandled = sorted({f"{r['method']} {r['service']} {r['path']}"
+                        for r in REQUESTS if r["source"] == "unhandled"})
+    for line in unhandled:
+        print(f"  no fixture: {line}")
@@ -0,0 +1,128 @@
+"""
+Sharded execution of E2E suites across worker processes.
+
+Each worker process owns its own Playwright instance and browser, and every
+suite it runs gets a fresh browser context, so shards never share cookies,
+localStorage or page listeners. Workers buffer their output and hand their
+result lists (runner.RESULTS) back to the parent, which merges them into one
+report.
+
+Two sharding strategies:
+  suite — suites are dealt round-robin to workers (cheapest, coarse)
+  test  — every worker walks all suites but only runs every N-th test()
+"""
+import io
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field
+
+from harness import runner
+from harness.checkpoints import CheckpointStore, ScopedPage
+
+SHARD_BY = ("suite", "test")
+
+
+@dataclass
+class Shard:
+    index: int
+    count: int
+    shard_by: str
+    suites: list
+    # Run options; must include base_url and checkpoints. With base_urls,
+    # shard N runs against base_urls[N % len(base_urls)]
+    options: dict = field(default_factory=dict)
+    # setup(page, options), called once per worker to install plugins
+    setup: object = None
+
+
+@dataclass
+class ShardResult:
+    index: int
+    results: dict = field(default_factory=dict)
+    log: str = ""
+    elapsed: float = 0.0
+
+
+def plan_shards(suites: list, workers: int, shard_by: str = "suite",
+                options: dict = None, setup=None) -> list:
+    if shard_by not in SHARD_BY:
+        raise ValueError(f"shard_by must be one of {SHARD_BY}, got {shard_by!r}")
+    options = options or {}
+    if shard_by == "test":
+        return [Shard(i, workers, shard_by, list(suites), options, setup) for i in range(workers)]
+    # Never spawn more workers than there are suites to hand out
+    count = max(1, min(workers, len(suites)))
+    return [Shard(i, count, shard_by, list(suites[i::count]), options, setup) for i in range(count)]
+
+
+def _base_url(shard: Shard) -> str:
+    urls = shard.options.get("base_urls") or [shard.options["base_url"]]
+    return urls[shard.index % len(urls)]
+
+
+def _run_shard(shard: Shard) -> ShardResult:
+    # Imported here so the parent process never starts Playwright itself
+    from playwright.sync_api import sync_playwright
+
+    start = time.monotonic()
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        if shard.shard_by == "test":
+            runner.select_shard(shard.index, shard.count)
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            # Checkpoints are captured once per worker and shared by its suites
+            store = CheckpointStore(browser, _base_url(shard),
+                                    enabled=shard.options.get("checkpoints", True))
+            page = ScopedPage(store)
+            if shard.setup:
+                shard.setup(page, shard.options)
+            for run in range(shard.options.get("repeat", 1)):
+                for suite in shard.suites:
+                    page.reset()
+                    runner.run_suite(suite, page, run)
+            page.close()
+            browser.close()
+
+    return ShardResult(
+        index=shard.index,
+        results={name: list(items) for name, items in runner.RESULTS.items()},
+        log=buf.getvalue(),
+        elapsed=time.monotonic() - start,
+    )
+
+
+def run_parallel(suites: list, workers: int, shard_by: str = "suite",
+                 options: dict = None, setup=None):
+    """Run `suites` across `workers` processes and merge results into runner."""
+    shards = plan_shards(suites, workers, shard_by, options, setup)
+    print(f"Running {len(suites)} suites on {len(shards)} workers (shard by {shard_by})")
+
+    start = time.monotonic()
+    results = []
+    # spawn, not fork: Playwright's driver threads do not survive a fork
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as pool:
+        futures = {pool.submit(_run_shard, shard): shard for shard in shards}
+        for future in as_completed(futures):
+            shard = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = ShardResult(index=shard.index,
+                                     results={"failed": [(f"shard {shard.index}", str(e))]})
+            results.append(result)
+            print(f"\n━━ Shard {result.index + 1}/{len(shards)} ({result.elapsed:.1f}s) ━━")
+            print(result.log, end="")
+
+    for result in sorted(results, key=lambda r: r.index):
+        for name, items in result.results.items():
+            if name in runner.RESULTS:
+                runner.RESULTS[name].extend(items)
+
+    wall = time.monotonic() - start
+    slowest = max((r.elapsed for r in results), default=0.0)
+    total = sum(r.elapsed for r in results)
+    print(f"\nWall time {wall:.1f}s — slowest shard {slowest:.1f}s, serial sum {total:.1f}s")
@@ -0,0 +1,153 @@
+"""
+Pipeline Observatory benchmark: per-stage latency of the ingestion flows.
+
+The Observatory (pipeline.html, src/dev/pipeline) runs the ingestion flow
+interactively. The benchmark drives it headlessly: it picks a flow, fills in
+the input, clicks "▶ Run" and waits for the run to finish, over and over on
+the same page, as someone iterating in the tool would.
+
+The ingestor and mapper are the API stand-in (harness/network.py) answering
+from src/api/fixtures; `--scenario` and `--api-latency` apply as in the
+suites. Stage timings come from the app's own User Timing measures
+(src/dev/pipeline/runner/stageTimings.ts), read and cleared after every run:
+
+  ingest    ingestor request until its response is parsed
+  validate  schema validation of the ingest and map responses, summed
+  map       mapper /exercises/match until its response is parsed
+  export    mapper Garmin sync (full pipeline only)
+  run       the whole run in the Observatory, IndexedDB history included
+
+Flows that do not reach a stage leave it out. The first `warmup` runs of
+every flow are discarded from the distributions.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, field
+
+from harness.checkpoints import ScopedPage
+from harness.network import NetworkStandIn
+from harness.runner import register_results
+from harness.stats import mean, percentile
+
+FLOWS = ("full-pipeline", "ingest-only", "map-only")
+
+STAGES = ("ingest", "validate", "map", "export", "run")
+
+# Same default as the Observatory's text box (PipelineCanvas.tsx)
+DEFAULT_TEXT = "bench press 3x10, squat 3x5, overhead press 3x8"
+
+RESULTS = register_results("pipeline", [])
+
+_DONE_JS = "() => performance.getEntriesByName('observatory:run').length > 0"
+
+# Every observatory:* measure since the last call, then clear them
+_TAKE_JS = """() => {
+  const entries = performance.getEntriesByType('measure')
+    .filter(m => m.name.startsWith('observatory:'))
+    .map(m => ({ stage: m.name.slice('observatory:'.length), ms: m.duration, detail: m.detail }));
+  for (const name of new Set(entries.map(e => 'observatory:' + e.stage))) {
+    performance.clearMeasures(name);
+  }
+  return entries;
+}"""
+
+
+@dataclass
+class PipelineResult:
+    flow: str
+    run: int
+    warmup: bool = False
+    status: str = None
+    # Stage → milliseconds; stages measured more than once in a run are summed
+    stages: dict = field(default_factory=dict)
+    error: str = None
+
+
+class ObservatoryBenchmark:
+    """Runs Observatory flows on one page and records their stage timings."""
+
+    def __init__(self, page: ScopedPage, stand_in: NetworkStandIn, text: str = DEFAULT_TEXT,
+                 timeout_ms: float = 30_000):
+        self.page = page
+        self.text = text
+        self.timeout_ms = timeout_ms
+        # Map-only runs match the exercises the ingestor fixture returns
+        workout = stand_in.fixtures["ingestor"]
+        self.exercises = ", ".join(exercise["name"] for block in workout.get("blocks", [])
+                                   for exercise in block.get("exercises", []))
+
+    def open(self):
+        url = f"{self.page.store.base_url.rstrip('/')}/pipeline.html"
+        self.page.goto(url)
+        self.page.get_by_role("button", name="▶ Run").wait_for(timeout=self.timeout_ms)
+        self.page.evaluate(_TAKE_JS)
+
+    def run(self, flow: str, run: int = 0, warmup: bool = False) -> PipelineResult:
+        result = PipelineResult(flow, run, warmup)
+        page = self.page
+        try:
+            page.locator("select").first.select_option(flow)
+            page.locator("textarea").first.fill(self.exercises if flow == "map-only" else self.text)
+            page.get_by_role("button", name="▶ Run").click()
+            page.wait_for_function(_DONE_JS, timeout=self.timeout_ms)
+            for entry in page.evaluate(_TAKE_JS):
+                result.stages[entry["stage"]] = result.stages.get(entry["stage"], 0) + entry["ms"]
+                if entry["stage"] == "run":
+                    result.status = (entry["detail"] or {}).get("status")
+            if result.status != "success":
+                result.error = f"run {result.status}"
+        except Exception as e:
+            result.error = str(e).splitlines()[0]
+            # Start the next run from a fresh Observatory
+            self.open()
+        RESULTS.append(result)
+        return result
+
+
+def stage_summary(results: list = None) -> dict:
+    """flow → stage → n, mean, p50, p95, p99, max over the measured (non-warm-up) runs."""
+    results = RESULTS if results is None else results
+    summary = {}
+    for flow in FLOWS:
+        runs = [r for r in results if r.flow == flow and not r.warmup]
+        if not runs:
+            continue
+        stages = {}
+        for stage in STAGES:
+            values = [r.stages[stage] for r in runs if not r.error and stage in r.stages]
+            if values:
+                stages[stage] = {"n": len(values), "mean": mean(values),
+                                 "p50": percentile(values, 50), "p95": percentile(values, 95),
+                                 "p99": percentile(values, 99), "max": max(values)}
+        summary[flow] = {"runs": len(runs), "failed": sum(1 for r in runs if r.error),
+                         "errors": sorted({r.error for r in runs if r.error}), "stages": stages}
+    return summary
+
+
+def _ms(value) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def print_report():
+    if not RESULTS:
+        return
+    print("\nPipeline Observatory stage latency (ms):")
+    print(f"  {'flow':<14} {'stage':<9} {'n':>5} {'mean':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'max':>8}")
+    for flow, row in stage_summary().items():
+        name = flow
+        for stage, m in row["stages"].items():
+            print(f"  {name:<14} {stage:<9} {m['n']:>5} {_ms(m['mean']):>8} {_ms(m['p50']):>8} "
+                  f"{_ms(m['p95']):>8} {_ms(m['p99']):>8} {_ms(m['max']):>8}")
+            name = ""
+        if row["failed"]:
+            print(f"  {name:<14} {row['failed']}/{row['runs']} runs failed")
+        for error in row["errors"]:
+            print(f"      error: {error[:160]}")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"runs": [asdict(r) for r in RESULTS], "flows": stage_summary()}, f, indent=2)
+    print(f"Pipeline report written to {path}")
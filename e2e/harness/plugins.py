@@ -0,0 +1,53 @@
+"""
+Base for runner plugins that collect in-page performance data.
+
+vitals, assets, devices and renders all work the same way: an init script
+records into a window global on every page of the plugin's contexts, the
+page clock is marked before each test, and after it the plugin collects
+what happened since the mark. PagePlugin holds that common part.
+
+A mark is the document's performance.timeOrigin plus performance.now().
+since(mark) returns the mark's time while the page still shows the same
+document, and 0 once it does not: the test navigated, or start_at swapped
+the context mid-test, so everything the new document recorded belongs to it.
+"""
+from harness.checkpoints import ScopedPage
+
+MARK_JS = "() => ({ origin: performance.timeOrigin, now: performance.now() })"
+
+
+class PagePlugin:
+    """Runner plugin bound to `page` that marks the page clock before every test."""
+
+    # Added to every new context of `page`
+    init_script: str = None
+
+    def __init__(self, page: ScopedPage):
+        self.page = page
+        self._mark = None
+        page.on_new_context(self._attach)
+
+    def _attach(self, context):
+        if self.init_script:
+            context.add_init_script(self.init_script)
+
+    def _evaluate(self, script: str, arg=None):
+        try:
+            return self.page.evaluate(script, arg)
+        except Exception:
+            # Closed page or a navigation in flight — no sample this time
+            return None
+
+    def mark(self):
+        """Where the page clock stands now, None if the page cannot be read."""
+        return self._evaluate(MARK_JS)
+
+    def since(self, mark) -> float:
+        """performance.now() of `mark` if the page still shows its document, else 0."""
+        current = self.mark()
+        if mark and current and current["origin"] == mark["origin"]:
+            return mark["now"]
+        return 0
+
+    def before_test(self, name: str):
+        self._mark = self.mark()
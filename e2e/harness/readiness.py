@@ -0,0 +1,155 @@
+"""
+Readiness waits for the E2E harness.
+
+The app mirrors its committed view onto <html data-view data-workflow-step
+data-welcome> (src/app/hooks/useViewReadySignal.ts). Waiting on that signal
+returns as soon as React commits the view, where networkidle always sits out
+its quiet window after the last request. networkidle remains the fallback for
+builds without the signal and for steps that have no better condition.
+
+Every wait is recorded in WAITS so the harness can report where the time went.
+The waits are scripts (harness.scripts), so they work on both Playwright APIs.
+"""
+import time
+from dataclasses import dataclass
+
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+from harness.runner import navigation, register_results
+from harness.scripts import call
+
+SIGNAL_TIMEOUT_MS = 5_000
+
+# Satisfied when the html dataset matches every given field, when it differs
+# from a `changed_from` snapshot, or when the optional CSS selector matches.
+READY_JS = """([want, changedFrom, selector]) => {
+  const d = document.documentElement.dataset;
+  if (selector && document.querySelector(selector)) return true;
+  if (!d.view) return false;
+  if (changedFrom) {
+    return d.view !== changedFrom.view || d.workflowStep !== changedFrom.step;
+  }
+  return Object.entries(want).every(([key, value]) => !value || d[key] === value);
+}"""
+
+SNAPSHOT_JS = """() => {
+  const d = document.documentElement.dataset;
+  return d.view ? { view: d.view, step: d.workflowStep } : null;
+}"""
+
+
+@dataclass
+class Wait:
+    label: str
+    strategy: str
+    seconds: float
+    fell_back: bool = False
+
+
+WAITS = register_results("waits", [])
+LOG_WAITS = False
+
+# Flipped the first time a page never emits the signal, so an older build only
+# pays the signal timeout once and goes straight to networkidle after that.
+_signal_missing = False
+
+
+def snapshot(page: Page):
+    """Current view/step as published by the app, or None without the signal."""
+    return page.evaluate(SNAPSHOT_JS)
+
+
+def wait_strategy(targeted: bool) -> str:
+    return "signal" if targeted and not _signal_missing else "networkidle"
+
+
+def mark_signal_missing():
+    global _signal_missing
+    _signal_missing = True
+
+
+def record_wait(label: str, strategy: str, start: float, fell_back: bool) -> Wait:
+    wait = Wait(label, strategy, time.monotonic() - start, fell_back)
+    WAITS.append(wait)
+    if LOG_WAITS:
+        note = " → networkidle" if fell_back else ""
+        print(f"      ⧗ {label}: {wait.seconds:.2f}s ({strategy}{note})")
+    return wait
+
+
+def settle(page: Page, label: str, view: str = None, step: str = None,
+           welcome: str = None, changed_from: dict = None, selector: str = None):
+    """Wait until the page reaches the given state, falling back to networkidle."""
+    return call(page, _settle(page, label, view, step, welcome, changed_from, selector))
+
+
+def _settle(page: Page, label: str, view: str, step: str, welcome: str,
+            changed_from: dict, selector: str):
+    start = time.monotonic()
+    strategy = wait_strategy(any([view, step, welcome, changed_from, selector]))
+    fell_back = False
+
+    if strategy == "signal":
+        want = {"view": view, "workflowStep": step, "welcome": welcome}
+        try:
+            yield page.wait_for_function(READY_JS, arg=[want, changed_from, selector],
+                                         timeout=SIGNAL_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            fell_back = True
+            if (yield snapshot(page)) is None:
+                mark_signal_missing()
+
+    if strategy == "networkidle" or fell_back:
+        yield page.wait_for_load_state("networkidle")
+
+    return record_wait(label, strategy, start, fell_back)
+
+
+def goto(page: Page, url: str, label: str = "goto", **target):
+    return call(page, _goto(page, url, label, target))
+
+
+def _goto(page: Page, url: str, label: str, target: dict):
+    with navigation():
+        yield page.goto(url)
+        return (yield settle(page, label, **target))
+
+
+def reload(page: Page, label: str = "reload", **target):
+    return call(page, _reload(page, label, target))
+
+
+def _reload(page: Page, label: str, target: dict):
+    with navigation():
+        yield page.reload()
+        return (yield settle(page, label, **target))
+
+
+def click(page: Page, locator, label: str, **target):
+    """Click and wait for `target`; with no target, wait for any view/step change."""
+    return call(page, _click(page, locator, label, target))
+
+
+def _click(page: Page, locator, label: str, target: dict):
+    with navigation():
+        if not target:
+            target = {"changed_from": (yield snapshot(page))}
+        yield locator.click()
+        return (yield settle(page, label, **target))
+
+
+def print_wait_summary():
+    if not WAITS:
+        return
+    total = sum(w.seconds for w in WAITS)
+    print(f"\nReadiness waits: {len(WAITS)} totalling {total:.1f}s")
+    for strategy in ("signal", "networkidle"):
+        waits = [w for w in WAITS if w.strategy == strategy]
+        if waits:
+            spent = sum(w.seconds for w in waits)
+            print(f"  {strategy:<12} {len(waits):>4} waits  {spent:6.1f}s  "
+                  f"avg {spent / len(waits):.2f}s")
+    fallbacks = [w for w in WAITS if w.fell_back]
+    if fallbacks:
+        print(f"  fell back to networkidle: {len(fallbacks)} "
+              f"({', '.join(sorted({w.label for w in fallbacks}))})")
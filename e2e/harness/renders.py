@@ -0,0 +1,301 @@
+"""
+React render-count profiling through the DevTools global hook.
+
+An init script installs `__REACT_DEVTOOLS_GLOBAL_HOOK__` before the app's
+scripts run, the same hook the React DevTools extension provides. React calls
+its onCommitFiberRoot on every commit, and the script walks the committed
+fiber tree to find the components that rendered in that commit (the walk skips
+subtrees that bailed out, as DevTools does). For each commit it keeps, per
+component:
+
+  renders  times the component's function (or class render) ran
+  mounts   how many of those were first renders
+  wasted   re-renders with shallow-equal props, unchanged useState /
+           useReducer state and unchanged context values, i.e. renders that
+           only happened because a parent rendered. React.memo would have
+           skipped them
+  ms       self render time (actualDuration minus rendered children). Only
+           set on development and profiling builds, which is what the dev
+           server serves
+
+Hooks such as useWorkflowState or useWorkflowEditing are not fibers, so their
+cost shows up on the component that calls them (WorkflowView).
+
+RenderProfiler is a runner plugin that records these counts per test. It also
+provides transition(), which measures one user-visible transition (Add Sources →
+Structure) and checks it against a render budget. A budget maps a transition
+to limits on `commits`, `renders` and `wasted`, and on any component name
+(renders of that component). A blown budget fails the test, and so does a
+transition that does not end on its target view/step (TARGETS): its counts
+would describe some other interaction, so they are not booked.
+"""
+import json
+import os
+from contextlib import contextmanager
+
+from harness import runner
+from harness.checkpoints import ScopedPage
+from harness.plugins import PagePlugin
+from harness.readiness import SNAPSHOT_JS
+from harness.runner import register_results
+
+RENDERS = register_results("renders", [])
+TRANSITIONS = register_results("render_transitions", [])
+
+ADD_SOURCES_TO_STRUCTURE = "add-sources → structure"
+
+# View/step each transition must end on, as published by the view-ready signal
+TARGETS = {
+    ADD_SOURCES_TO_STRUCTURE: {"view": "workflow", "step": "structure"},
+}
+
+# Limits per transition. Loose starting points: tighten them to the counts in
+# --render-report once a run on main has been recorded
+DEFAULT_BUDGETS = {
+    ADD_SOURCES_TO_STRUCTURE: {
+        "commits": 8,
+        "wasted": 40,
+        "WorkflowView": 4,
+        "StructureWorkout": 3,
+    },
+}
+
+RENDERS_INIT_JS = """(() => {
+  if (window.__e2eRenders) return;
+  const r = window.__e2eRenders = { commits: [] };
+
+  // Function, class, indeterminate, forwardRef and simple memo components.
+  // MemoComponent (14) is skipped: its child fiber is the wrapped component
+  const COMPONENT_TAGS = new Set([0, 1, 2, 11, 15]);
+  const PERFORMED_WORK = 1;
+
+  const nameOf = fiber => {
+    const type = fiber.type;
+    if (!type) return 'Anonymous';
+    if (fiber.tag === 11) return type.displayName || (type.render && type.render.name) || 'ForwardRef';
+    return type.displayName || type.name || 'Anonymous';
+  };
+  const shallowEqual = (a, b) => {
+    if (Object.is(a, b)) return true;
+    if (typeof a !== 'object' || typeof b !== 'object' || !a || !b) return false;
+    const keys = Object.keys(a);
+    if (keys.length !== Object.keys(b).length) return false;
+    return keys.every(k => Object.prototype.hasOwnProperty.call(b, k) && Object.is(a[k], b[k]));
+  };
+  const stateChanged = (fiber, prev) => {
+    if (fiber.tag === 1) return fiber.memoizedState !== prev.memoizedState;
+    // Hook list: only hooks with an update queue hold state; effects are new every render
+    let hook = fiber.memoizedState, old = prev.memoizedState;
+    while (hook && old) {
+      if (hook.queue && !Object.is(hook.memoizedState, old.memoizedState)) return true;
+      hook = hook.next;
+      old = old.next;
+    }
+    return false;
+  };
+  const contextChanged = (fiber, prev) => {
+    let dep = fiber.dependencies && fiber.dependencies.firstContext;
+    let old = prev.dependencies && prev.dependencies.firstContext;
+    while (dep && old) {
+      if (!Object.is(dep.memoizedValue, old.memoizedValue)) return true;
+      dep = dep.next;
+      old = old.next;
+    }
+    return Boolean(dep) !== Boolean(old);
+  };
+  const rendered = fiber => fiber.alternate === null || (fiber.flags & PERFORMED_WORK) !== 0;
+
+  const walk = (fiber, components) => {
+    for (; fiber; fiber = fiber.sibling) {
+      if (COMPONENT_TAGS.has(fiber.tag) && rendered(fiber)) {
+        const prev = fiber.alternate;
+        const name = nameOf(fiber);
+        const c = components[name] || (components[name] = { renders: 0, mounts: 0, wasted: 0, ms: null });
+        c.renders += 1;
+        if (!prev) {
+          c.mounts += 1;
+        } else if (shallowEqual(fiber.memoizedProps, prev.memoizedProps)
+                   && !stateChanged(fiber, prev) && !contextChanged(fiber, prev)) {
+          c.wasted += 1;
+        }
+        if (typeof fiber.actualDuration === 'number') {
+          let self = fiber.actualDuration;
+          for (let child = fiber.child; child; child = child.sibling) {
+            if (rendered(child)) self -= child.actualDuration || 0;
+          }
+          c.ms = (c.ms || 0) + Math.max(0, self);
+        }
+      }
+      // Same child as the previous tree: the whole subtree bailed out
+      if (fiber.child && (!fiber.alternate || fiber.child !== fiber.alternate.child)) {
+        walk(fiber.child, components);
+      }
+    }
+  };
+
+  const onCommit = root => {
+    const components = {};
+    try {
+      walk(root.current.child, components);
+    } catch (e) { /* unknown fiber layout: skip the commit rather than break the app */ }
+    r.commits.push({ t: performance.now(), components });
+  };
+
+  const existing = window.__REACT_DEVTOOLS_GLOBAL_HOOK__;
+  if (existing) {
+    const original = existing.onCommitFiberRoot;
+    existing.onCommitFiberRoot = function (id, root, ...rest) {
+      onCommit(root);
+      if (original) return original.call(this, id, root, ...rest);
+    };
+    return;
+  }
+  let nextId = 0;
+  window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+    renderers: new Map(),
+    supportsFiber: true,
+    inject(renderer) {
+      const id = ++nextId;
+      this.renderers.set(id, renderer);
+      return id;
+    },
+    onCommitFiberRoot(id, root) { onCommit(root); },
+    onCommitFiberUnmount() {},
+    onPostCommitFiberRoot() {},
+    checkDCE() {},
+  };
+})();"""
+
+_COLLECT_JS = """(since) => {
+  const r = window.__e2eRenders;
+  if (!r) return null;
+  const commits = r.commits.filter(c => c.t >= since);
+  const components = {};
+  for (const commit of commits) {
+    for (const [name, c] of Object.entries(commit.components)) {
+      const total = components[name] || (components[name] = { renders: 0, mounts: 0, wasted: 0, ms: null });
+      total.renders += c.renders;
+      total.mounts += c.mounts;
+      total.wasted += c.wasted;
+      if (c.ms !== null) total.ms = (total.ms || 0) + c.ms;
+    }
+  }
+  return { commits: commits.length, components };
+}"""
+
+
+# The profiler installed in this process, for transition()
+_active = None
+
+
+def totals(record: dict) -> dict:
+    components = record["components"].values()
+    return {
+        "commits": record["commits"],
+        "renders": sum(c["renders"] for c in components),
+        "wasted": sum(c["wasted"] for c in components),
+    }
+
+
+def check_budget(label: str, record: dict, budgets: dict) -> list:
+    """Return 'metric value > limit' strings for every exceeded limit of `label`."""
+    counts = totals(record)
+    over = []
+    for metric, limit in budgets.get(label, {}).items():
+        if metric in counts:
+            value = counts[metric]
+        else:
+            value = record["components"].get(metric, {}).get("renders", 0)
+        if value > limit:
+            over.append(f"{metric} {value} > {limit}")
+    return over
+
+
+def load_budgets(path: str = None) -> dict:
+    if not path:
+        return DEFAULT_BUDGETS
+    with open(path) as f:
+        return json.load(f)
+
+
+class RenderProfiler(PagePlugin):
+    """Runner plugin that records React commits and renders for every test run on `page`."""
+
+    init_script = RENDERS_INIT_JS
+
+    def __init__(self, page: ScopedPage, budgets: dict = None):
+        global _active
+        super().__init__(page)
+        self.budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self._test = None
+        _active = self
+
+    def before_test(self, name: str):
+        self._test = name
+        super().before_test(name)
+
+    def after_test(self, name: str, error):
+        record = self._evaluate(_COLLECT_JS, self.since(self._mark))
+        if record is None:
+            return
+        record.update(suite=runner.current_suite(), test=name)
+        RENDERS.append(record)
+
+    @contextmanager
+    def transition(self, label: str):
+        mark = self.mark()
+        yield
+        state = self._evaluate(SNAPSHOT_JS)
+        target = TARGETS.get(label)
+        # Without the signal (state None) the end state cannot be checked
+        ended = state and (state.get("view"), state.get("step"))
+        if target and ended and ended != (target["view"], target["step"]):
+            raise AssertionError(f"{label} ended on {'/'.join(filter(None, ended))}, not "
+                                 f"{target['view']}/{target['step']}; renders not booked")
+        record = self._evaluate(_COLLECT_JS, self.since(mark))
+        if record is None:
+            return
+        over = check_budget(label, record, self.budgets)
+        record.update(label=label, test=self._test, over_budget=over)
+        TRANSITIONS.append(record)
+        if over:
+            raise AssertionError(f"Render budget exceeded on {label}: {'; '.join(over)}")
+
+
+@contextmanager
+def transition(label: str):
+    """Measure the renders of the enclosed transition; a no-op unless profiling is on."""
+    if _active is None:
+        yield
+        return
+    with _active.transition(label):
+        yield
+
+
+def print_report(top: int = 10):
+    if not RENDERS:
+        return
+    components = {}
+    for record in RENDERS:
+        for name, c in record["components"].items():
+            total = components.setdefault(name, {"renders": 0, "wasted": 0, "ms": 0.0})
+            total["renders"] += c["renders"]
+            total["wasted"] += c["wasted"]
+            total["ms"] += c["ms"] or 0
+    commits = sum(r["commits"] for r in RENDERS)
+    print(f"\nReact renders: {commits} commits over {len(RENDERS)} tests")
+    print(f"  {'component':<32} {'renders':>8} {'wasted':>7} {'self ms':>8}")
+    for name, c in sorted(components.items(), key=lambda item: -item[1]["renders"])[:top]:
+        print(f"  {name:<32} {c['renders']:>8} {c['wasted']:>7} {c['ms']:>8.1f}")
+    for record in TRANSITIONS:
+        t = totals(record)
+        mark = "✗" if record["over_budget"] else "✓"
+        print(f"  {mark} {record['label']}: {t['commits']} commits, {t['renders']} renders, "
+              f"{t['wasted']} wasted  — {record['test']}")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"tests": RENDERS, "transitions": TRANSITIONS}, f, indent=2)
+    print(f"Render profile written to {path}")
@@ -0,0 +1,354 @@
+"""
+Runner core for the E2E harness.
+
+`test()` is the wrapper every suite calls. Results land in the module-level
+PASSED / FAILED lists so a serial run and a sharded worker report the same
+way, and the parent process can merge worker results back into them.
+
+Every test and suite is also timed with a monotonic clock. Time spent inside
+`navigation()` blocks (readiness waits, checkpoint restores) is booked as
+setup/navigation, separately from the rest of the test body, so reports can
+tell slow assertions apart from slow page transitions.
+
+Other harness modules register their own result lists in RESULTS so they are
+merged the same way, and hook into every test through PLUGINS.
+
+`use_cached()` books named tests from earlier results instead of running them
+(incremental mode, see harness.impact). Cached results are reported but left
+out of timing statistics.
+
+Under a device profile (set_profile) results carry the profile, and test_key()
+("name [profile]") keeps each profile's samples apart in summaries, JUnit,
+baselines and the incremental cache.
+
+Suites and test bodies may be scripts (harness.scripts). Under the asyncio
+runner (harness.aio) every suite task sets its own state with set_task(), and
+`test()` and `navigation()` defer to it instead of the module-level state.
+"""
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+from harness import scripts
+from harness.stats import mean, percentile
+
+PASSED = []
+FAILED = []
+
+
+@dataclass
+class TestResult:
+    name: str
+    suite: str
+    run: int
+    passed: bool
+    seconds: float
+    navigation_seconds: float
+    error: str = None
+    # Booked from an earlier run by use_cached(), not run this time
+    cached: bool = False
+    # Device profile the test ran under (harness.devices), None without one
+    profile: str = None
+
+    @property
+    def key(self) -> str:
+        return test_key(self.name, self.profile)
+
+
+@dataclass
+class SuiteResult:
+    name: str
+    run: int
+    seconds: float
+    profile: str = None
+
+
+TESTS = []
+SUITES = []
+
+# name → module-level list that sharded workers ship back to the parent
+RESULTS = {"passed": PASSED, "failed": FAILED, "tests": TESTS, "suites": SUITES}
+
+# Objects with optional before_test(name) / after_test(name, error) methods.
+# after_test may raise (a budget assertion, say) to fail a test that passed.
+PLUGINS = []
+
+# (index, count) when this process only owns a slice of the tests
+_shard = None
+_seen = 0
+
+# name → TestResult fields of tests to book instead of running
+_cached = {}
+
+_suite = ""
+_run = 0
+_profile = None
+_navigation = 0.0
+_navigation_depth = 0
+
+# Test state of the current asyncio suite task; None on the sync runner
+_task = ContextVar("runner_task", default=None)
+
+
+def register_results(name: str, items: list) -> list:
+    RESULTS[name] = items
+    return items
+
+
+def current_suite() -> str:
+    return _suite
+
+
+def current_profile() -> str:
+    return _profile
+
+
+def set_profile(name: str = None):
+    """Attribute the tests that follow to device profile `name`."""
+    global _profile
+    _profile = name
+
+
+def test_key(name: str, profile: str = None) -> str:
+    """Name that tells the same test under different device profiles apart."""
+    return f"{name} [{profile}]" if profile else name
+
+
+def set_task(task):
+    """Book tests and navigation of the current asyncio task into `task`.
+
+    `task` provides navigation() (a context manager) and test(name, fn) (a
+    coroutine function), see harness.aio.
+    """
+    _task.set(task)
+
+
+def select_shard(index: int, count: int):
+    """Only run every `count`-th test, starting at `index` (per-test sharding)."""
+    global _shard, _seen
+    _shard = (index, count)
+    _seen = 0
+
+
+def use_cached(results: dict):
+    """Book the tests in `results` (test_key → TestResult fields) instead of running them."""
+    global _cached
+    _cached = dict(results)
+
+
+def _owned() -> bool:
+    global _seen
+    position = _seen
+    _seen += 1
+    if _shard is None:
+        return True
+    index, count = _shard
+    return position % count == index
+
+
+@contextmanager
+def navigation():
+    """Book the enclosed time as setup/navigation for the running test."""
+    global _navigation, _navigation_depth
+    task = _task.get()
+    if task is not None:
+        with task.navigation():
+            yield
+        return
+    _navigation_depth += 1
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        _navigation_depth -= 1
+        # Nested blocks (a restore that calls goto) are only counted once
+        if _navigation_depth == 0:
+            _navigation += time.monotonic() - start
+
+
+def _call_plugins(hook: str, *args):
+    """Run `hook` on every plugin, then re-raise the first error, if any."""
+    first_error = None
+    for plugin in PLUGINS:
+        method = getattr(plugin, hook, None)
+        if method is None:
+            continue
+        try:
+            method(*args)
+        except Exception as e:
+            first_error = first_error or e
+    if first_error:
+        raise first_error
+
+
+def test(name: str, fn):
+    """Run test body `fn` (a plain function or a script) and book its result.
+
+    In an asyncio suite task this returns a coroutine to await instead.
+    """
+    global _navigation
+    task = _task.get()
+    if task is not None:
+        return task.test(name, fn)
+    if not _owned():
+        return
+    if test_key(name, _profile) in _cached:
+        _record_cached(name, _cached[test_key(name, _profile)])
+        return
+    error = None
+    _navigation = 0.0
+    start = time.monotonic()
+    try:
+        _call_plugins("before_test", name)
+        scripts.run(fn())
+    except Exception as e:
+        error = e
+    seconds = time.monotonic() - start
+    try:
+        _call_plugins("after_test", name, error)
+    except Exception as e:
+        error = error or e
+    record_test(name, _suite, _run, seconds, _navigation, error)
+
+
+def record_test(name: str, suite: str, run: int, seconds: float, navigation_seconds: float,
+                error: Exception = None):
+    """Book one finished test into the result lists and print its line."""
+    TESTS.append(TestResult(name, suite, run, error is None, seconds, navigation_seconds,
+                            None if error is None else str(error), profile=_profile))
+    if error is None:
+        PASSED.append(test_key(name, _profile))
+        print(f"  ✓ {name} ({seconds:.2f}s)")
+    else:
+        FAILED.append((test_key(name, _profile), str(error)))
+        print(f"  ✗ {name} ({seconds:.2f}s)")
+        print(f"      {error}")
+
+
+def _record_cached(name: str, cached: dict):
+    TESTS.append(TestResult(name, _suite, _run, cached["passed"], cached["seconds"],
+                            cached["navigation_seconds"], cached.get("error"), cached=True,
+                            profile=_profile))
+    if cached["passed"]:
+        PASSED.append(test_key(name, _profile))
+        print(f"  ✓ {name} (cached)")
+    else:
+        FAILED.append((test_key(name, _profile), cached.get("error") or "failed (cached)"))
+        print(f"  ✗ {name} (cached)")
+        print(f"      {cached.get('error')}")
+
+
+def run_suite(suite, page, run: int = 0):
+    """Call `suite(page)` with its tests attributed to it, and time it."""
+    global _suite, _run
+    _suite, _run = suite.__name__, run
+    start = time.monotonic()
+    try:
+        scripts.run(suite(page))
+    finally:
+        SUITES.append(SuiteResult(suite.__name__, run, time.monotonic() - start, _profile))
+
+
+def _group(results: list, key) -> dict:
+    grouped = {}
+    for result in results:
+        grouped.setdefault(key(result), []).append(result)
+    return grouped
+
+
+def timing_summary() -> dict:
+    """Per-test (and per-profile, see test_key) duration statistics across all runs."""
+    summary = {}
+    ran = [r for r in TESTS if not r.cached]
+    for key, results in _group(ran, lambda r: r.key).items():
+        seconds = [r.seconds for r in results]
+        summary[key] = {
+            "suite": results[0].suite,
+            "profile": results[0].profile,
+            "runs": len(results),
+            "failures": sum(1 for r in results if not r.passed),
+            "mean": mean(seconds),
+            "p50": percentile(seconds, 50),
+            "p95": percentile(seconds, 95),
+            "navigation_p50": percentile([r.navigation_seconds for r in results], 50),
+        }
+    return summary
+
+
+def print_slowest(n: int = 10):
+    if not TESTS or n <= 0:
+        return
+    summary = timing_summary()
+    if not summary:
+        return
+    slowest = sorted(summary.items(), key=lambda item: item[1]["p50"], reverse=True)[:n]
+    runs = max(s["runs"] for s in summary.values())
+    print(f"\nSlowest {len(slowest)} tests (p50 / p95 over {runs} run{'s' if runs != 1 else ''}):")
+    for name, s in slowest:
+        share = s["navigation_p50"] / s["p50"] if s["p50"] else 0
+        print(f"  {s['p50']:6.2f}s  {s['p95']:6.2f}s  nav {share:4.0%}  {name}")
+
+    suites = _group(SUITES, lambda r: test_key(r.name, r.profile))
+    print("\nSuites (p50):")
+    for name, results in sorted(suites.items(),
+                                key=lambda item: -percentile([r.seconds for r in item[1]], 50)):
+        print(f"  {percentile([r.seconds for r in results], 50):6.2f}s  {name}")
+
+
+def _ensure_dir(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+
+def write_json(path: str):
+    _ensure_dir(path)
+    with open(path, "w") as f:
+        json.dump({
+            "tests": [dict(asdict(r), key=r.key) for r in TESTS],
+            "suites": [asdict(r) for r in SUITES],
+            "summary": timing_summary(),
+        }, f, indent=2)
+    print(f"JSON results written to {path}")
+
+
+def write_junit(path: str):
+    runs = len({r.run for r in TESTS})
+    root = ET.Element("testsuites", tests=str(len(TESTS)),
+                      failures=str(sum(1 for r in TESTS if not r.passed)),
+                      time=f"{sum(r.seconds for r in SUITES):.3f}")
+    for suite, results in _group(TESTS, lambda r: r.suite).items():
+        element = ET.SubElement(root, "testsuite", name=suite, tests=str(len(results)),
+                                failures=str(sum(1 for r in results if not r.passed)),
+                                time=f"{sum(r.seconds for r in results):.3f}")
+        for r in results:
+            name = r.key if runs == 1 else f"{r.key} [run {r.run + 1}]"
+            case = ET.SubElement(element, "testcase", classname=suite, name=name,
+                                 time=f"{r.seconds:.3f}")
+            if not r.passed:
+                failure = ET.SubElement(case, "failure", message=(r.error or "")[:200])
+                failure.text = r.error
+    _ensure_dir(path)
+    ET.ElementTree(root).write(path, encoding="utf-8", xml_declaration=True)
+    print(f"JUnit results written to {path}")
+
+
+def summarize():
+    """Print the PASSED/FAILED summary and exit with the matching status."""
+    print(f"\n{'='*60}")
+    print(f"  PASSED: {len(PASSED)}")
+    print(f"  FAILED: {len(FAILED)}")
+    print(f"{'='*60}")
+
+    if FAILED:
+        print("\nFailed tests:")
+        for name, err in FAILED:
+            print(f"  ✗ {name}")
+            print(f"      {err[:200]}")
+        sys.exit(1)
+    else:
+        print("\n  All E2E tests passed!")
+        sys.exit(0)
@@ -0,0 +1,313 @@
+"""
+Scale benchmark for the Workouts list on synthetic libraries.
+
+The API stand-in answers mapper GET /workouts with a generated library of N
+workouts (1k, 10k and 50k by default) and GET /tags with a fixed tag set. For
+each size the benchmark opens a fresh context, goes to the Workouts view and
+measures:
+
+  initial render   nav click → the list reports "of N workouts" (fetch, schema
+                   parse, normalisation, the filteredWorkouts memo and the
+                   first page of cards)
+  search           per keystroke: keydown → next frame, while typing queries
+                   into the search box
+  sort             change → next frame for every sort option
+  page             click → next frame on "Next" page
+  scroll           frame intervals while the list scrolls down and back up,
+                   one scroll step per animation frame
+
+"next frame" is a setTimeout queued from a requestAnimationFrame callback
+that the event handler schedules. It runs after the frame that shows the
+update, the same approximation web-vitals uses before Event Timing.
+
+The stand-in serves the whole library and ignores the `limit` the client
+asks for, so the derivations in useWorkoutList see all N items. Tag filters
+are not measured: the app does not carry API tags onto the unified workout
+yet (normalizeApiWorkoutItem), so every tag would filter down to an empty
+list whatever tags the library has.
+
+`scaling()` fits metric ∝ size^k on a log-log scale. k near 0 is flat, near 1
+is linear in the library size.
+"""
+import json
+import os
+import random
+import time
+from dataclasses import asdict, dataclass, field
+
+from harness.checkpoints import ScopedPage, start_at
+from harness.network import NetworkStandIn
+from harness.readiness import click
+from harness.runner import register_results
+from harness.stats import mean, percentile, size_exponent
+
+SIZES = (1_000, 10_000, 50_000)
+
+QUERIES = ("squat", "hiit ")
+
+TAGS = ("strength", "cardio", "mobility", "hyrox", "favourite", "travel", "home", "gym")
+
+RESULTS = register_results("scale", [])
+
+_EXERCISES = (
+    "Back Squat", "Front Squat", "Deadlift", "Romanian Deadlift", "Bench Press", "Push Up",
+    "Pull Up", "Bent Over Row", "Overhead Press", "Lunge", "Burpee", "Kettlebell Swing",
+    "Box Jump", "Wall Ball", "Sled Push", "Row Erg", "Ski Erg", "Plank", "Hip Thrust", "Run",
+)
+_TITLES = (
+    "Leg Day", "Upper Body Strength", "HIIT Circuit", "Hyrox Simulation", "Tabata Blast",
+    "Mobility Flow", "Easy Run", "Tempo Run", "EMOM Burner", "Full Body Lift", "Cardio Mix",
+    "Core Stretch",
+)
+_DEVICES = ("garmin", "apple", "zwift", None)
+
+
+def synthetic_library(size: int, seed: int = 865) -> list:
+    """`size` mapper SavedWorkout records, the same for the same seed."""
+    rng = random.Random(seed)
+    workouts = []
+    for i in range(size):
+        title = f"{rng.choice(_TITLES)} #{i + 1}"
+        blocks = [
+            {
+                "label": f"Block {b + 1}",
+                "exercises": [{"name": rng.choice(_EXERCISES), "sets": rng.randint(2, 5),
+                               "reps": rng.randint(5, 15)} for _ in range(rng.randint(2, 4))],
+            }
+            for b in range(rng.randint(1, 3))
+        ]
+        day = f"2026-{rng.randint(1, 9):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:00:00Z"
+        workout = {
+            "id": f"scale-{i + 1}",
+            "profile_id": "demo-user-1",
+            "workout_data": {"title": title, "blocks": blocks},
+            "sources": [],
+            "title": title,
+            "is_favorite": rng.random() < 0.1,
+            "is_exported": rng.random() < 0.5,
+            "tags": rng.sample(TAGS, rng.randint(0, 2)),
+            "created_at": day,
+            "updated_at": day,
+        }
+        device = rng.choice(_DEVICES)
+        if device:
+            workout["device"] = device
+        workouts.append(workout)
+    return workouts
+
+
+def _tags() -> list:
+    return [{"id": f"tag-{name}", "profile_id": "demo-user-1", "name": name,
+             "created_at": "2026-01-01T00:00:00Z"} for name in TAGS]
+
+
+SCALE_INIT_JS = """(() => {
+  if (window.__e2eScale) return;
+  const s = window.__e2eScale = { samples: [] };
+  const measure = e => {
+    const t0 = e.timeStamp;
+    requestAnimationFrame(() => setTimeout(() => s.samples.push(performance.now() - t0)));
+  };
+  addEventListener('keydown', measure, { capture: true });
+  addEventListener('click', measure, { capture: true });
+  addEventListener('change', e => { if (e.target.tagName === 'SELECT') measure(e); }, { capture: true });
+})();"""
+
+_TAKE_JS = "() => window.__e2eScale.samples.splice(0)"
+
+_WAIT_SAMPLES_JS = "(n) => window.__e2eScale.samples.length >= n"
+
+_SCROLL_JS = """async ([steps, px]) => {
+  const target = document.querySelector('[role=tabpanel] [data-radix-scroll-area-viewport]')
+    || document.scrollingElement;
+  const intervals = [];
+  await new Promise(resolve => {
+    let i = 0, last = null;
+    const tick = now => {
+      if (last !== null) intervals.push(now - last);
+      last = now;
+      if (i >= steps) return resolve();
+      // Down for the first half, back up for the second
+      target.scrollBy(0, i < steps / 2 ? px : -px);
+      i += 1;
+      requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+  });
+  return intervals;
+}"""
+
+_LIST_COUNT_JS = "(n) => document.body.innerText.includes(`of ${n} workout`)"
+
+# How long one interaction may take to produce its sample
+SAMPLE_TIMEOUT_MS = 10_000
+
+# A 60 Hz frame is 16.7 ms; anything past two frames is visible jank
+JANK_MS = 1000 / 60 * 2
+
+
+@dataclass
+class ScaleResult:
+    size: int
+    run: int
+    initial_render_ms: float = None
+    # interaction → latency samples in ms
+    latencies: dict = field(default_factory=dict)
+    frame_intervals_ms: list = field(default_factory=list)
+    error: str = None
+
+
+class ScaleBenchmark:
+    """Serves synthetic libraries through `stand_in` and times the Workouts view on `page`."""
+
+    def __init__(self, page: ScopedPage, stand_in: NetworkStandIn,
+                 queries: tuple = QUERIES, scroll_steps: int = 120, timeout_ms: float = 120_000):
+        self.page = page
+        self.queries = queries
+        self.scroll_steps = scroll_steps
+        self.timeout_ms = timeout_ms
+        # Serialised once per size: 50k workouts are ~30 MB of JSON
+        self._body = None
+        stand_in.route("mapper", "GET", r"/workouts",
+                       lambda request, fixtures: (200, self._body, "application/json"))
+        stand_in.route("mapper", "GET", r"/tags",
+                       lambda request, fixtures: (200, {"success": True, "tags": _tags(),
+                                                        "count": len(TAGS)}, None))
+        page.on_new_context(lambda context: context.add_init_script(SCALE_INIT_JS))
+
+    def _take(self, expected: int) -> list:
+        try:
+            self.page.wait_for_function(_WAIT_SAMPLES_JS, arg=expected, timeout=SAMPLE_TIMEOUT_MS)
+        except Exception:
+            pass  # Keep whatever landed; a missing sample is a click that did nothing
+        return self.page.evaluate(_TAKE_JS)
+
+    def _open(self, size: int) -> float:
+        start_at(self.page, "home")
+        nav = self.page.locator("nav button:has-text('Workouts'), "
+                                "[role=navigation] button:has-text('Workouts')").first
+        start = time.monotonic()
+        click(self.page, nav, "nav: Workouts", view="workouts")
+        self.page.wait_for_function(_LIST_COUNT_JS, arg=size, timeout=self.timeout_ms)
+        return (time.monotonic() - start) * 1000
+
+    def _search(self) -> list:
+        search = self.page.get_by_test_id("workout-search-input")
+        samples = []
+        for query in self.queries:
+            search.click()
+            self._take(1)
+            for char in query:
+                self.page.keyboard.press(char if char != " " else "Space")
+                samples.extend(self._take(1))
+            search.fill("")
+            self._take(0)
+        return samples
+
+    def _sorts(self) -> list:
+        select = self.page.get_by_label("Sort by")
+        if select.count() == 0:
+            return []
+        samples = []
+        values = select.locator("option").evaluate_all("options => options.map(o => o.value)")
+        for value in values[1:] + values[:1]:
+            select.select_option(value)
+            samples.extend(self._take(1))
+        return samples
+
+    def _pages(self, flips: int = 3) -> list:
+        samples = []
+        for _ in range(flips):
+            next_page = self.page.get_by_role("button", name="Next")
+            if next_page.count() == 0 or next_page.first.is_disabled():
+                break
+            next_page.first.click()
+            samples.extend(self._take(1))
+        return samples
+
+    def run(self, size: int, run: int = 0) -> ScaleResult:
+        library = synthetic_library(size)
+        self._body = json.dumps({"success": True, "workouts": library, "count": size})
+        result = ScaleResult(size, run)
+        # A first-time visitor: no cached responses or local history between sizes
+        self.page.reset()
+        try:
+            result.initial_render_ms = self._open(size)
+            result.latencies["search"] = self._search()
+            result.latencies["sort"] = self._sorts()
+            result.latencies["page"] = self._pages()
+            result.frame_intervals_ms = self.page.evaluate(_SCROLL_JS, [self.scroll_steps, 40])
+        except Exception as e:
+            result.error = str(e).splitlines()[0]
+        RESULTS.append(result)
+        return result
+
+
+def size_summary(results: list = None) -> dict:
+    """size → p50 / p95 of every metric over the runs at that size."""
+    results = RESULTS if results is None else results
+    by_size = {}
+    for r in results:
+        by_size.setdefault(r.size, []).append(r)
+    summary = {}
+    for size, runs in sorted(by_size.items()):
+        row = {"runs": len(runs), "errors": [r.error for r in runs if r.error]}
+        renders = [r.initial_render_ms for r in runs if r.initial_render_ms is not None]
+        row["initial_render_ms"] = {"p50": percentile(renders, 50), "p95": percentile(renders, 95)}
+        for kind in ("search", "sort", "page"):
+            samples = [ms for r in runs for ms in r.latencies.get(kind, [])]
+            row[f"{kind}_ms"] = {"p50": percentile(samples, 50), "p95": percentile(samples, 95)}
+        frames = [ms for r in runs for ms in r.frame_intervals_ms]
+        row["scroll"] = {
+            "fps": 1000 / mean(frames) if frames else None,
+            "frame_p95_ms": percentile(frames, 95),
+            "janky_frames": sum(1 for ms in frames if ms > JANK_MS),
+        }
+        summary[size] = row
+    return summary
+
+
+def scaling(summary: dict) -> dict:
+    """metric → exponent k of the p50 (scroll: p95 frame time) against library size."""
+    metrics = {
+        "initial_render": lambda row: row["initial_render_ms"]["p50"],
+        **{kind: (lambda row, kind=kind: row[f"{kind}_ms"]["p50"])
+           for kind in ("search", "sort", "page")},
+        "scroll_frame": lambda row: row["scroll"]["frame_p95_ms"],
+    }
+    return {name: size_exponent([(size, value(row)) for size, row in summary.items()])
+            for name, value in metrics.items()}
+
+
+def _ms(value) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def print_report():
+    if not RESULTS:
+        return
+    summary = size_summary()
+    print("\nWorkouts list at scale (p50 / p95, ms):")
+    print(f"  {'size':>7} {'initial':>13} {'search':>11} {'sort':>11} "
+          f"{'page':>11} {'scroll fps':>11} {'jank':>5}")
+    for size, row in summary.items():
+        cells = [f"{_ms(row[m]['p50'])}/{_ms(row[m]['p95'])}"
+                 for m in ("initial_render_ms", "search_ms", "sort_ms", "page_ms")]
+        fps = row["scroll"]["fps"]
+        print(f"  {size:>7} {cells[0]:>13} {cells[1]:>11} {cells[2]:>11} "
+              f"{cells[3]:>11} {fps or 0:>11.1f} {row['scroll']['janky_frames']:>5}")
+        for error in row["errors"]:
+            print(f"      error: {error[:160]}")
+    if len(summary) > 1:
+        exponents = scaling(summary)
+        print("  scaling (time ∝ size^k): " + ", ".join(
+            f"{name} k={k:.2f}" for name, k in exponents.items() if k is not None))
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    summary = size_summary()
+    with open(path, "w") as f:
+        json.dump({"runs": [asdict(r) for r in RESULTS], "sizes": summary,
+                   "scaling": scaling(summary)}, f, indent=2)
+    print(f"Scale report written to {path}")
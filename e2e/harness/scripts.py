@@ -0,0 +1,81 @@
+"""
+Browser scripts that run on either Playwright API.
+
+A script is a generator function that yields every call which touches the
+browser and gets its result back:
+
+    text = yield page.locator("body").inner_text()
+    wait = yield click(page, button, "create new", step="structure")
+
+On playwright.sync_api the call has already run and its value is sent
+straight back; on playwright.async_api the yielded awaitable is awaited first.
+A yielded script is run in turn and its return value sent back, and errors
+are raised inside the script at the yield, so try/except works on both APIs.
+
+The readiness waits, waypoint paths, checkpoint restores, locator lookups
+and the WorkflowView suites are written once this way; the sync runner drives
+them with run() and harness.aio with run_async(). Public helpers built on a
+script go through call(), so on the sync API they still run immediately and
+return their result, and on the async API they return something to await.
+"""
+import inspect
+
+from playwright.async_api import expect as async_expect
+from playwright.sync_api import expect as sync_expect
+
+
+def run(script):
+    """Drive `script` on playwright.sync_api and return its result."""
+    if not inspect.isgenerator(script):
+        return script
+    value, error = None, None
+    while True:
+        try:
+            item = script.throw(error) if error is not None else script.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            value = run(item)
+        except Exception as e:
+            error = e
+
+
+async def run_async(script):
+    """Drive `script` on playwright.async_api and return its result."""
+    if inspect.isawaitable(script):
+        return await script
+    if not inspect.isgenerator(script):
+        return script
+    value, error = None, None
+    while True:
+        try:
+            item = script.throw(error) if error is not None else script.send(value)
+        except StopIteration as stop:
+            return stop.value
+        value, error = None, None
+        try:
+            value = await run_async(item)
+        except Exception as e:
+            error = e
+
+
+def is_async(target) -> bool:
+    """Whether `target` belongs to the async API.
+
+    Harness objects (ScopedPage, CheckpointStore) answer through their own
+    `is_async`; Playwright objects by the module their class comes from.
+    """
+    if hasattr(type(target), "is_async"):
+        return target.is_async
+    return type(target).__module__.startswith("playwright.async_api")
+
+
+def call(target, script):
+    """Run `script` now on the sync API; on the async API, return it to await."""
+    return run_async(script) if is_async(target) else run(script)
+
+
+def expect(actual):
+    """Playwright's expect() for the API `actual` comes from; yield its assertions."""
+    return async_expect(actual) if is_async(actual) else sync_expect(actual)
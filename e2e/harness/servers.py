@@ -0,0 +1,394 @@
+"""
+App servers managed by the harness, in dev or production-build mode.
+
+The suites used to assume someone had started `vite` on BASE_URL. A
+ServerPool starts the app itself instead, one instance per parallel worker:
+
+  dev   `vite --mode demo` — unbundled ESM modules, transformed on request
+  prod  `vite build --mode demo` once, then `vite preview` on the bundle
+
+`--mode demo` loads .env.demo (VITE_DEMO_MODE=true). The build goes to
+test-results/servers/build-<key>, keyed by a hash of the build inputs
+(src/, public/, index.html, package*.json, vite.config.ts, …), so an
+unchanged tree never rebuilds. The `prebuild` step (generate-build-info.mjs)
+is not run: it rewrites the tracked src/build-info.json on every call.
+
+Servers are detached and recorded in test-results/servers/servers.json. The
+next run reuses a recorded server when its process is alive, its port still
+answers and it serves the same kind and build; anything else on the port is
+stopped and started again. stop_all() ends every recorded server.
+
+Cold start is the time from spawning the server to its first HTTP 200 (plus
+the build, reported separately). measure_load() opens a fresh context, with
+an empty browser cache, and times a load to the home view; the first load
+after a cold start is what dev mode's on-demand transforms make slow.
+"""
+import hashlib
+import json
+import os
+import signal
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+
+from harness import readiness
+from harness.runner import register_results
+from harness.stats import percentile
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", ".."))
+STATE_DIR = os.path.join(REPO_ROOT, "test-results", "servers")
+
+KINDS = ("dev", "prod")
+# First port of each kind; worker N of a pool listens on BASE_PORTS[kind] + N
+BASE_PORTS = {"dev": 3100, "prod": 3200}
+START_TIMEOUT_S = {"dev": 60, "prod": 30}
+BUILD_TIMEOUT_S = 600
+
+# Files and directories the production bundle is built from
+BUILD_INPUTS = ("src", "public", "index.html", "pipeline.html", "package.json",
+                "package-lock.json", "vite.config.ts", "tsconfig.json", "tsconfig.node.json",
+                ".env.demo")
+
+# Resource Timing keeps 250 entries by default; dev mode loads far more modules
+TIMING_BUFFER_JS = "performance.setResourceTimingBufferSize(100000)"
+
+LOAD_JS = """() => {
+  const nav = performance.getEntriesByType('navigation')[0] || {};
+  const resources = performance.getEntriesByType('resource');
+  const bytes = resources.reduce((sum, r) => sum + (r.transferSize || 0), nav.transferSize || 0);
+  return {
+    ready_ms: performance.now(),
+    ttfb_ms: nav.responseStart || 0,
+    dcl_ms: nav.domContentLoadedEventEnd || 0,
+    load_ms: nav.loadEventEnd || 0,
+    requests: resources.length + 1,
+    scripts: resources.filter(r => r.initiatorType === 'script'
+                               || /\\.(m?js|tsx?|jsx)(\\?|$)/.test(r.name)).length,
+    transfer_kb: bytes / 1024,
+  };
+}"""
+
+
+@dataclass
+class Server:
+    kind: str
+    port: int
+    pid: int = None
+    # Build key of the bundle a prod server serves
+    build: str = None
+    reused: bool = False
+    cold_start_s: float = None
+    build_s: float = None
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+
+@dataclass
+class Load:
+    kind: str
+    url: str
+    # First load after the server started in this run
+    cold: bool
+    run: int
+    ready_ms: float = None
+    ttfb_ms: float = None
+    dcl_ms: float = None
+    load_ms: float = None
+    requests: int = 0
+    scripts: int = 0
+    transfer_kb: float = 0.0
+    error: str = None
+
+
+SERVERS = register_results("servers", [])
+LOADS = register_results("server_loads", [])
+
+
+# ---------------------------------------------------------------------------
+# Processes and state
+# ---------------------------------------------------------------------------
+def _state_path() -> str:
+    return os.path.join(STATE_DIR, "servers.json")
+
+
+def _load_state() -> dict:
+    try:
+        with open(_state_path()) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: dict):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(_state_path(), "w") as f:
+        json.dump(state, f, indent=1)
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except (OSError, TypeError):
+        return False
+    return True
+
+
+def _answers(url: str) -> bool:
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError):
+        return False
+
+
+def _spawn(cmd: list, log_name: str) -> subprocess.Popen:
+    os.makedirs(STATE_DIR, exist_ok=True)
+    log = open(os.path.join(STATE_DIR, log_name), "ab")
+    # Own session: the server outlives this run and is stopped as a group
+    return subprocess.Popen(cmd, cwd=REPO_ROOT, stdin=subprocess.DEVNULL, stdout=log,
+                            stderr=subprocess.STDOUT, start_new_session=True)
+
+
+def _terminate(pid: int, timeout: float = 5.0):
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(pid, sig)
+        except OSError:
+            return
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if not _alive(pid):
+                return
+            try:
+                os.waitpid(pid, os.WNOHANG)  # Reap it if this run started it
+            except ChildProcessError:
+                pass
+            time.sleep(0.1)
+
+
+def stop_all():
+    """Stop every server the harness has recorded."""
+    state = _load_state()
+    for port, entry in state.items():
+        if _alive(entry["pid"]):
+            _terminate(entry["pid"])
+            print(f"Stopped {entry['kind']} server on :{port} (pid {entry['pid']})")
+    _save_state({})
+
+
+# ---------------------------------------------------------------------------
+# Production build
+# ---------------------------------------------------------------------------
+def build_key() -> str:
+    """Hash of every tracked or untracked, non-ignored build input."""
+    listing = subprocess.run(["git", "ls-files", "-z", "--cached", "--others", "--exclude-standard",
+                              "--", *BUILD_INPUTS],
+                             cwd=REPO_ROOT, capture_output=True, check=True).stdout
+    digest = hashlib.sha256()
+    for path in sorted(set(filter(None, listing.decode().split("\0")))):
+        full = os.path.join(REPO_ROOT, path)
+        if not os.path.isfile(full):
+            continue
+        digest.update(path.encode() + b"\0")
+        with open(full, "rb") as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+def build(key: str):
+    """Build the bundle for `key` unless it exists; returns (out_dir, seconds or None)."""
+    out_dir = os.path.join(STATE_DIR, f"build-{key}")
+    if os.path.isfile(os.path.join(out_dir, "index.html")):
+        return out_dir, None
+    print(f"Building production bundle {key} …")
+    start = time.monotonic()
+    with open(os.path.join(STATE_DIR, f"build-{key}.log"), "wb") as log:
+        result = subprocess.run(["npx", "vite", "build", "--mode", "demo",
+                                 "--outDir", out_dir, "--emptyOutDir"],
+                                cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                                timeout=BUILD_TIMEOUT_S)
+    if result.returncode:
+        raise RuntimeError(f"vite build failed (exit {result.returncode}), "
+                           f"see {os.path.join(STATE_DIR, f'build-{key}.log')}")
+    return out_dir, time.monotonic() - start
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+class ServerPool:
+    """`count` app servers of one kind on consecutive ports."""
+
+    def __init__(self, kind: str, count: int = 1, base_port: int = None, reuse: bool = True):
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, got {kind!r}")
+        self.kind = kind
+        self.count = max(1, count)
+        self.base_port = base_port or BASE_PORTS[kind]
+        self.reuse = reuse
+        self.servers = []
+
+    @property
+    def urls(self) -> list:
+        return [server.url for server in self.servers]
+
+    def start(self) -> list:
+        """Start or reuse the pool's servers; returns their base URLs."""
+        os.makedirs(STATE_DIR, exist_ok=True)
+        key = out_dir = build_s = None
+        if self.kind == "prod":
+            key = build_key()
+            out_dir, build_s = build(key)
+
+        state = _load_state()
+        spawned = []
+        for port in range(self.base_port, self.base_port + self.count):
+            server = Server(self.kind, port, build=key)
+            entry = state.get(str(port))
+            if entry and self.reuse and entry["kind"] == self.kind and entry.get("build") == key \
+                    and _alive(entry["pid"]) and _answers(server.url):
+                server.pid, server.reused = entry["pid"], True
+            else:
+                if entry and _alive(entry["pid"]):
+                    _terminate(entry["pid"])
+                if _answers(server.url):
+                    raise RuntimeError(f"port {port} is taken by a server the harness did not start")
+                server.pid = self._spawn(port, out_dir)
+                state[str(port)] = {"kind": self.kind, "pid": server.pid, "build": key,
+                                    "started": time.time()}
+                spawned.append((server, time.monotonic()))
+            self.servers.append(server)
+        _save_state(state)
+
+        # Started together, so cold starts overlap instead of adding up
+        for server, started in spawned:
+            server.cold_start_s = self._wait_ready(server, started)
+        if build_s is not None and spawned:
+            spawned[0][0].build_s = build_s
+        SERVERS.extend(self.servers)
+        for server in self.servers:
+            print(f"{server.kind} server on :{server.port} — {_describe(server)}")
+        return self.urls
+
+    def _spawn(self, port: int, out_dir: str) -> int:
+        if self.kind == "dev":
+            cmd = ["npx", "vite", "--mode", "demo", "--port", str(port), "--strictPort"]
+        else:
+            cmd = ["npx", "vite", "preview", "--mode", "demo", "--port", str(port),
+                   "--strictPort", "--outDir", out_dir]
+        return _spawn(cmd, f"{self.kind}-{port}.log").pid
+
+    def _wait_ready(self, server: Server, started: float) -> float:
+        deadline = started + START_TIMEOUT_S[server.kind]
+        while time.monotonic() < deadline:
+            if _answers(server.url):
+                return time.monotonic() - started
+            if not _alive(server.pid):
+                break
+            time.sleep(0.05)
+        log = os.path.join(STATE_DIR, f"{server.kind}-{server.port}.log")
+        raise RuntimeError(f"{server.kind} server on :{server.port} did not come up, see {log}")
+
+    def stop(self):
+        state = _load_state()
+        for server in self.servers:
+            _terminate(server.pid)
+            state.pop(str(server.port), None)
+        _save_state(state)
+        self.servers = []
+
+
+def _describe(server: Server) -> str:
+    if server.reused:
+        return "reused warm server"
+    text = f"cold start {server.cold_start_s:.1f}s"
+    if server.build_s is not None:
+        text += f" after a {server.build_s:.1f}s build"
+    return text
+
+
+# ---------------------------------------------------------------------------
+# First load
+# ---------------------------------------------------------------------------
+def measure_load(browser, server: Server, run: int, cold: bool = False) -> Load:
+    """Load `server` in a fresh context (empty cache) up to the home view."""
+    load = Load(server.kind, server.url, cold, run)
+    context = browser.new_context()
+    context.add_init_script(TIMING_BUFFER_JS)
+    try:
+        page = context.new_page()
+        readiness.goto(page, server.url, f"{server.kind} first load", view="home")
+        for name, value in page.evaluate(LOAD_JS).items():
+            setattr(load, name, value)
+    except Exception as e:
+        load.error = str(e).splitlines()[0]
+    finally:
+        context.close()
+    LOADS.append(load)
+    return load
+
+
+def load_summary() -> dict:
+    """kind → {"cold": first loads after a cold start, "warm": p50 of the rest}."""
+    summary = {}
+    for kind in KINDS:
+        loads = [l for l in LOADS if l.kind == kind and not l.error]
+        if not loads:
+            continue
+        row = {}
+        for label, group in (("cold", [l for l in loads if l.cold]),
+                             ("warm", [l for l in loads if not l.cold])):
+            if group:
+                row[label] = {metric: percentile([getattr(l, metric) for l in group], 50)
+                              for metric in ("ready_ms", "ttfb_ms", "dcl_ms", "load_ms",
+                                             "requests", "scripts", "transfer_kb")}
+        summary[kind] = row
+    return summary
+
+
+def _ms(value) -> str:
+    return "—" if value is None else f"{value:.0f}"
+
+
+def print_report():
+    if not SERVERS and not LOADS:
+        return
+    print("\nApp servers:")
+    print(f"  {'kind':<5} {'port':>5} {'build':>7} {'cold start':>11}")
+    for server in SERVERS:
+        build_s = "—" if server.build_s is None else f"{server.build_s:.1f}s"
+        cold = "reused" if server.reused else f"{server.cold_start_s:.2f}s"
+        print(f"  {server.kind:<5} {server.port:>5} {build_s:>7} {cold:>11}")
+
+    summary = load_summary()
+    if summary:
+        print("\nFirst load to the home view (ms, p50):")
+        print(f"  {'kind':<5} {'load':<5} {'ready':>7} {'TTFB':>6} {'DCL':>7} {'onload':>7} "
+              f"{'requests':>9} {'scripts':>8} {'KB':>8}")
+        for kind, row in summary.items():
+            for label, m in row.items():
+                print(f"  {kind:<5} {label:<5} {_ms(m['ready_ms']):>7} {_ms(m['ttfb_ms']):>6} "
+                      f"{_ms(m['dcl_ms']):>7} {_ms(m['load_ms']):>7} {m['requests']:>9.0f} "
+                      f"{m['scripts']:>8.0f} {m['transfer_kb']:>8.0f}")
+        if all(summary.get(kind, {}).get("cold") for kind in KINDS):
+            dev, prod = summary["dev"]["cold"]["ready_ms"], summary["prod"]["cold"]["ready_ms"]
+            if prod:
+                print(f"  cold first load: dev takes {dev / prod:.1f}× as long as prod")
+    for load in LOADS:
+        if load.error:
+            print(f"  {load.kind} load {load.run + 1} failed: {load.error[:160]}")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "servers": [dict(asdict(s), url=s.url) for s in SERVERS],
+            "loads": [asdict(l) for l in LOADS],
+            "summary": load_summary(),
+        }, f, indent=2)
+    print(f"Server report written to {path}")
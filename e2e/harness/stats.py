@@ -0,0 +1,33 @@
+"""
+Small statistics helpers shared by the harness reports.
+"""
+import math
+
+
+def percentile(values: list, q: float) -> float:
+    """Linear-interpolated percentile, q in [0, 100]; None for an empty list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def mean(values: list) -> float:
+    return sum(values) / len(values) if values else None
+
+
+def size_exponent(points: list) -> float:
+    """Least-squares k of value ∝ size^k over (size, value) points with positive values."""
+    points = [(math.log(s), math.log(v)) for s, v in points if s > 0 and v and v > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    den = sum((x - mean_x) ** 2 for x, _ in points)
+    if not den:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / den
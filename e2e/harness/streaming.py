@@ -0,0 +1,386 @@
+"""
+Streaming chat benchmark against a local SSE stand-in for the chat service.
+
+SSEStandIn is a small HTTP server that answers POST /chat/stream the way
+chat-api does: message_start, stage events, content_delta tokens, then a
+generate_workout function_call / function_result (rendered by
+WorkoutStreamPreview) and message_end. Tokens are paced at a fixed rate on
+an absolute schedule, so a slow reader cannot slow the server down. It
+binds to the chat service's own origin (VITE_CHAT_API_URL), so the app needs
+no changes. The chat service must not be running at the same time.
+
+Every token carries its sequence number (`w17…`). The page-side script
+watches the last assistant message and stamps each sequence number with the
+frame it first painted in (a setTimeout queued from requestAnimationFrame).
+It also records animation-frame intervals while the stream runs. For each
+stream rate the benchmark reports:
+
+  ttft_ms             send click → first token painted
+  chunk latency       server write → token painted, per token. This includes
+                      useChatStream's 80 ms delta batching
+  lag growth          chunk-latency p50 over the last quarter of the stream
+                      minus the first quarter. When it keeps growing, the UI
+                      consumes events slower than they arrive (falling behind)
+  dropped frames      frames missed at 60 Hz while streaming
+  main-thread time    CDP Performance.getMetrics TaskDuration over the stream,
+                      per SSE event (the page-side probes are included)
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from harness.checkpoints import ScopedPage, start_at
+from harness.network import SERVICES, NetworkStandIn
+from harness.runner import register_results
+from harness.stats import mean, percentile
+
+RATES = (10, 50, 100, 250)
+
+RESULTS = register_results("streaming", [])
+
+FRAME_MS = 1000 / 60
+
+_STAGES = ("researching", "searching", "creating")
+
+
+@dataclass
+class StreamSpec:
+    # content_delta events per second
+    rate: float = 50
+    tokens: int = 300
+    # Characters per token, including the sequence marker
+    token_chars: int = 12
+    # A stage event after every N tokens (0 for none)
+    stage_every: int = 50
+    # Exercises in the generated workout
+    exercises: int = 8
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+def _token(seq: int, chars: int) -> str:
+    marker = f"w{seq}"
+    return marker + "a" * max(0, chars - len(marker) - 1) + " "
+
+
+def _workout(spec: StreamSpec) -> dict:
+    return {
+        "type": "workout_generated",
+        "workout": {
+            "name": "Stand-in Strength Session",
+            "duration_minutes": 45,
+            "difficulty": "intermediate",
+            "exercises": [{"name": f"Exercise {i + 1}", "sets": 3, "reps": 10,
+                           "muscle_group": "full body"} for i in range(spec.exercises)],
+        },
+    }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "SSEStandIn/1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _cors(self):
+        self.send_header("Access-Control-Allow-Origin", self.headers.get("Origin") or "*")
+        self.send_header("Access-Control-Allow-Credentials", "true")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers",
+                         self.headers.get("Access-Control-Request-Headers") or "*")
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors()
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        body = json.dumps({"status": "ok", "service": "chat-api"}).encode()
+        self.send_response(200 if self.path.startswith("/health") else 404)
+        self._cors()
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.startswith("/chat/stream"):
+            self.send_response(404)
+            self._cors()
+            self.end_headers()
+            return
+        self.send_response(200)
+        self._cors()
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            self.server.stand_in.stream(self.wfile, request)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # The page navigated away or aborted the stream
+
+
+class SSEStandIn:
+    """Chat service stand-in; `spec` sets the shape of the next stream."""
+
+    def __init__(self, url: str = SERVICES["chat"], spec: StreamSpec = None):
+        self.url = url.rstrip("/")
+        self.spec = spec or StreamSpec()
+        # seq → epoch ms the token was written, for the last stream
+        self.sent = {}
+        self.events = 0
+        self._server = None
+
+    def start(self):
+        address = urlsplit(self.url)
+        try:
+            self._server = ThreadingHTTPServer((address.hostname, address.port or 80), _Handler)
+        except OSError as e:
+            raise RuntimeError(f"cannot listen on {self.url} ({e}); stop the chat service or "
+                               "point VITE_CHAT_API_URL somewhere free") from None
+        self._server.daemon_threads = True
+        self._server.stand_in = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def stream(self, out, request: dict):
+        spec = self.spec
+        self.sent, self.events = {}, 0
+        session = request.get("session_id") or "e2e-stream"
+        start = time.monotonic()
+        interval = 1 / spec.rate
+
+        def emit(event: str, data: dict, slot: int):
+            # Absolute schedule: a late write does not push the later ones back
+            delay = start + slot * interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            out.write(_sse(event, data))
+            out.flush()
+            self.events += 1
+
+        slot = 0
+        emit("message_start", {"session_id": session}, slot)
+        emit("stage", {"stage": "analyzing", "message": "Analyzing your request"}, slot)
+        for seq in range(1, spec.tokens + 1):
+            slot += 1
+            emit("content_delta", {"text": _token(seq, spec.token_chars)}, slot)
+            self.sent[seq] = time.time() * 1000
+            if spec.stage_every and seq % spec.stage_every == 0:
+                stage = _STAGES[(seq // spec.stage_every - 1) % len(_STAGES)]
+                emit("stage", {"stage": stage, "message": stage.capitalize()}, slot)
+        call_id = "toolu_e2e_stream"
+        emit("function_call", {"id": call_id, "name": "generate_workout"}, slot + 1)
+        emit("function_result", {"tool_use_id": call_id, "name": "generate_workout",
+                                 "result": json.dumps(_workout(spec))}, slot + 2)
+        emit("stage", {"stage": "complete", "message": "Done"}, slot + 2)
+        emit("message_end", {"session_id": session, "tokens_used": spec.tokens,
+                             "latency_ms": (time.monotonic() - start) * 1000,
+                             "pending_imports": []}, slot + 3)
+
+
+STREAM_INIT_JS = """(() => {
+  if (window.__e2eStream) return;
+  const s = window.__e2eStream = { painted: {}, maxSeq: 0, frames: [], running: false, start: null };
+  const epoch = () => performance.timeOrigin + performance.now();
+  const scan = () => {
+    const messages = document.querySelectorAll('[data-testid="chat-message-assistant"]');
+    const last = messages[messages.length - 1];
+    if (!s.running || !last) return;
+    // The message body only: tool calls, the workout preview and the timestamp
+    // render after it. Filler is all 'a', so the last 'w' starts the newest marker
+    const body = last.querySelector('.prose');
+    if (!body) return;
+    const text = body.textContent;
+    const m = /^w(\\d+)/.exec(text.slice(text.lastIndexOf('w')));
+    const max = m ? Number(m[1]) : 0;
+    if (max <= s.maxSeq) return;
+    const from = s.maxSeq + 1;
+    s.maxSeq = max;
+    requestAnimationFrame(() => setTimeout(() => {
+      const t = epoch();
+      for (let seq = from; seq <= max; seq++) s.painted[seq] = t;
+    }));
+  };
+  new MutationObserver(scan).observe(document, { subtree: true, childList: true, characterData: true });
+  s.begin = () => {
+    Object.assign(s, { painted: {}, maxSeq: 0, frames: [], running: true, start: epoch() });
+    let last = null;
+    const tick = now => {
+      if (!s.running) return;
+      if (last !== null) s.frames.push(now - last);
+      last = now;
+      requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+  };
+  s.end = () => {
+    s.running = false;
+    return { start: s.start, painted: s.painted, frames: s.frames };
+  };
+})();"""
+
+_DONE_JS = """(n) => window.__e2eStream.maxSeq >= n
+  && !document.querySelector('[data-testid="chat-streaming-indicator"]')"""
+
+
+@dataclass
+class StreamResult:
+    rate: float
+    run: int
+    events: int = 0
+    ttft_ms: float = None
+    # Per token, in sequence order
+    chunk_latency_ms: list = field(default_factory=list)
+    frame_intervals_ms: list = field(default_factory=list)
+    main_thread_ms: float = None
+    error: str = None
+
+    @property
+    def dropped_frames(self) -> int:
+        return sum(max(0, round(ms / FRAME_MS) - 1) for ms in self.frame_intervals_ms)
+
+    @property
+    def lag_growth_ms(self) -> float:
+        quarter = len(self.chunk_latency_ms) // 4
+        if quarter < 2:
+            return None
+        return (percentile(self.chunk_latency_ms[-quarter:], 50)
+                - percentile(self.chunk_latency_ms[:quarter], 50))
+
+
+class StreamBenchmark:
+    """Drives the chat panel on `page` against `server` at each stream rate."""
+
+    def __init__(self, page: ScopedPage, server: SSEStandIn, stand_in: NetworkStandIn = None,
+                 timeout_ms: float = 120_000):
+        self.page = page
+        self.server = server
+        self.timeout_ms = timeout_ms
+        if stand_in:
+            # Everything else from fixtures; the chat stream goes to the SSE server
+            stand_in.route("chat", "POST", r"/chat/stream", lambda request, fixtures: None)
+            stand_in.route("chat", "GET", r"/health", lambda request, fixtures: None)
+        page.on_new_context(lambda context: context.add_init_script(STREAM_INIT_JS))
+
+    def _main_thread_seconds(self, cdp) -> float:
+        metrics = cdp.send("Performance.getMetrics")["metrics"]
+        return next((m["value"] for m in metrics if m["name"] == "TaskDuration"), 0.0)
+
+    def run(self, rate: float, run: int = 0, message: str = "Build me a strength workout") -> StreamResult:
+        self.server.spec.rate = rate
+        result = StreamResult(rate, run)
+        # Fresh context: no earlier conversation in the panel
+        self.page.reset()
+        try:
+            start_at(self.page, "home")
+            trigger = self.page.get_by_test_id("chat-trigger-button")
+            if trigger.count() == 0:
+                raise AssertionError("chat panel not available (chat_enabled flag off?)")
+            trigger.click()
+            self.page.get_by_test_id("chat-input-textarea").fill(message)
+
+            cdp = self.page.context.new_cdp_session(self.page.current)
+            cdp.send("Performance.enable")
+            before = self._main_thread_seconds(cdp)
+            self.page.evaluate("() => window.__e2eStream.begin()")
+            self.page.get_by_test_id("chat-send-button").click()
+            self.page.wait_for_function(_DONE_JS, arg=self.server.spec.tokens,
+                                        timeout=self.timeout_ms)
+            # The last stamps land one frame after the last mutation
+            self.page.wait_for_timeout(100)
+            data = self.page.evaluate("() => window.__e2eStream.end()")
+            result.events = self.server.events
+            result.main_thread_ms = (self._main_thread_seconds(cdp) - before) * 1000
+            cdp.detach()
+
+            painted = {int(seq): t for seq, t in data["painted"].items()}
+            if 1 in painted:
+                result.ttft_ms = painted[1] - data["start"]
+            result.chunk_latency_ms = [painted[seq] - sent
+                                       for seq, sent in sorted(self.server.sent.items())
+                                       if seq in painted]
+            result.frame_intervals_ms = data["frames"]
+        except Exception as e:
+            result.error = str(e).splitlines()[0]
+        RESULTS.append(result)
+        return result
+
+
+def rate_summary(results: list = None) -> dict:
+    """rate → TTFT, chunk latency, lag growth, dropped frames and main-thread ms per event."""
+    results = RESULTS if results is None else results
+    by_rate = {}
+    for r in results:
+        by_rate.setdefault(r.rate, []).append(r)
+    summary = {}
+    for rate, runs in sorted(by_rate.items()):
+        ok = [r for r in runs if not r.error]
+        latencies = [ms for r in ok for ms in r.chunk_latency_ms]
+        frames = sum(len(r.frame_intervals_ms) for r in ok)
+        dropped = sum(r.dropped_frames for r in ok)
+        per_event = [r.main_thread_ms / r.events for r in ok if r.events and r.main_thread_ms]
+        growth = [r.lag_growth_ms for r in ok if r.lag_growth_ms is not None]
+        summary[rate] = {
+            "runs": len(runs),
+            "errors": [r.error for r in runs if r.error],
+            "ttft_ms": percentile([r.ttft_ms for r in ok if r.ttft_ms is not None], 50),
+            "chunk_p50_ms": percentile(latencies, 50),
+            "chunk_p95_ms": percentile(latencies, 95),
+            "lag_growth_ms": mean(growth) if growth else None,
+            "dropped_frames": dropped,
+            "dropped_ratio": dropped / (frames + dropped) if frames else None,
+            "main_thread_ms_per_event": mean(per_event) if per_event else None,
+        }
+    return summary
+
+
+def falls_behind(row: dict, lag_ms: float = 100) -> bool:
+    return row["lag_growth_ms"] is not None and row["lag_growth_ms"] > lag_ms
+
+
+def _ms(value) -> str:
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def print_report():
+    if not RESULTS:
+        return
+    summary = rate_summary()
+    print("\nStreaming chat (per stream rate):")
+    print(f"  {'events/s':>8} {'ttft':>6} {'chunk p50/p95':>14} {'lag +':>6} "
+          f"{'dropped':>9} {'main ms/event':>14}")
+    for rate, row in summary.items():
+        dropped = (f"{row['dropped_frames']} ({row['dropped_ratio']:.0%})"
+                   if row["dropped_ratio"] is not None else "-")
+        per_event = row["main_thread_ms_per_event"]
+        mark = "  ← falling behind" if falls_behind(row) else ""
+        print(f"  {rate:>8g} {_ms(row['ttft_ms']):>6} "
+              f"{_ms(row['chunk_p50_ms']) + '/' + _ms(row['chunk_p95_ms']):>14} "
+              f"{_ms(row['lag_growth_ms']):>6} {dropped:>9} "
+              f"{f'{per_event:.2f}' if per_event is not None else '-':>14}{mark}")
+        for error in row["errors"]:
+            print(f"      error: {error[:160]}")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"runs": [dict(asdict(r), dropped_frames=r.dropped_frames,
+                                 lag_growth_ms=r.lag_growth_ms) for r in RESULTS],
+                   "rates": rate_summary()}, f, indent=2)
+    print(f"Streaming report written to {path}")
@@ -0,0 +1,308 @@
+"""
+Chromium performance traces per test, with long-task hot spots.
+
+With tracing on, the Tracer plugin records a browser-wide trace
+(browser.start_tracing, timeline + V8 sampling profiler) around every test
+and saves it as <dir>/<test>.json. The traces are then read offline:
+
+  1. long tasks: RunTask slices over 50 ms on a renderer main thread;
+  2. the V8 CPU samples that fall inside each long task;
+  3. each sampled stack is mapped through the script's source map (inline
+     or `.map`, fetched from the server) and charged to its innermost frame
+     from src/ (`WorkflowView`, `useWorkflowEditing`, …), or to the leaf frame
+     when no app code is on the stack (React's commit phase, say).
+
+The result is a ranked list of hot spots with their total time inside long
+tasks, written as text and JSON. Traces can be re-analysed later without a
+browser:
+
+    cd e2e && python -m harness.traces test-results/traces/*.json
+"""
+import json
+import os
+import re
+import sys
+import urllib.request
+from base64 import b64decode
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urljoin
+
+from harness.checkpoints import ScopedPage
+from harness.runner import register_results
+
+LONG_TASK_US = 50_000
+
+CATEGORIES = [
+    "toplevel",
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "v8.execute",
+    "disabled-by-default-v8.cpu_profiler",
+]
+
+# One {"test", "path"} per recorded trace
+TRACES = register_results("traces", [])
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower()
+
+
+class Tracer:
+    """Runner plugin that records a Chromium trace around every test."""
+
+    def __init__(self, page: ScopedPage, trace_dir: str = "test-results/traces"):
+        self.page = page
+        self.trace_dir = trace_dir
+        self._path = None
+
+    def before_test(self, name: str):
+        os.makedirs(self.trace_dir, exist_ok=True)
+        self._path = os.path.join(self.trace_dir, f"{_slug(name)}-{os.getpid()}-{len(TRACES)}.json")
+        # Browser-wide, not per page: start_at swaps the page mid-test
+        self.page.store.browser.start_tracing(path=self._path, categories=CATEGORIES)
+
+    def after_test(self, name: str, error):
+        self.page.store.browser.stop_tracing()
+        TRACES.append({"test": name, "path": self._path})
+
+
+# ---------------------------------------------------------------------------
+# Source maps
+# ---------------------------------------------------------------------------
+_B64 = {c: i for i, c in enumerate("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/")}
+
+
+def _vlq(segment: str) -> list:
+    values, value, shift = [], 0, 0
+    for char in segment:
+        digit = _B64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value, shift = 0, 0
+    return values
+
+
+class SourceMap:
+    """Decoded source map v3: generated (line, column) → original position."""
+
+    def __init__(self, data: dict):
+        self.sources = data.get("sources", [])
+        self.names = data.get("names", [])
+        # Per generated line: [(column, source, line, column, name)] in column order
+        self.lines = []
+        source = src_line = src_col = name = 0
+        for line in data.get("mappings", "").split(";"):
+            segments, column = [], 0
+            for raw in filter(None, line.split(",")):
+                fields = _vlq(raw)
+                column += fields[0]
+                if len(fields) >= 4:
+                    source += fields[1]
+                    src_line += fields[2]
+                    src_col += fields[3]
+                    if len(fields) >= 5:
+                        name += fields[4]
+                    segments.append((column, source, src_line, src_col,
+                                     name if len(fields) >= 5 else None))
+            self.lines.append(segments)
+
+    def lookup(self, line: int, column: int):
+        """(source, line, name) for a 0-based generated position, or None."""
+        if line >= len(self.lines):
+            return None
+        best = None
+        for segment in self.lines[line]:
+            if segment[0] > column:
+                break
+            best = segment
+        if best is None:
+            return None
+        _, source, src_line, _, name = best
+        return (self.sources[source] if source < len(self.sources) else None,
+                src_line, self.names[name] if name is not None and name < len(self.names) else None)
+
+
+class SourceMapResolver:
+    """Fetches and caches the source map of every script URL it is asked about."""
+
+    def __init__(self):
+        self._maps = {}
+
+    def _load(self, url: str):
+        try:
+            with urllib.request.urlopen(url, timeout=5) as response:
+                script = response.read().decode("utf-8", "replace")
+            match = re.search(r"//[#@] sourceMappingURL=(\S+)\s*$", script)
+            if not match:
+                return None
+            ref = match.group(1)
+            if ref.startswith("data:"):
+                return SourceMap(json.loads(b64decode(ref.split(",", 1)[1])))
+            with urllib.request.urlopen(urljoin(url, ref), timeout=5) as response:
+                return SourceMap(json.loads(response.read()))
+        except (OSError, ValueError):
+            # Server gone (offline analysis) or no usable map: keep the raw location
+            return None
+
+    def resolve(self, url: str, line: int, column: int):
+        if not url.startswith("http"):
+            return None
+        if url not in self._maps:
+            self._maps[url] = self._load(url)
+        source_map = self._maps[url]
+        return source_map.lookup(line, column) if source_map else None
+
+
+# ---------------------------------------------------------------------------
+# Trace analysis
+# ---------------------------------------------------------------------------
+@dataclass
+class Frame:
+    function: str
+    source: str
+    line: int
+
+    @property
+    def is_app(self) -> bool:
+        return "src/" in self.source and "node_modules" not in self.source
+
+    @property
+    def label(self) -> str:
+        base = os.path.basename(self.source.split("?")[0]) or "(native)"
+        return f"{self.function or '(anonymous)'} ({base}:{self.line + 1})"
+
+
+@dataclass
+class LongTask:
+    test: str
+    start_ms: float
+    duration_ms: float
+    # label → sampled ms inside the task, highest first
+    hot_spots: list = field(default_factory=list)
+
+
+def _frame(call_frame: dict, resolver: SourceMapResolver) -> Frame:
+    url = call_frame.get("url", "")
+    line, column = call_frame.get("lineNumber", 0), call_frame.get("columnNumber", 0)
+    function = call_frame.get("functionName", "")
+    resolved = resolver.resolve(url, line, column) if url else None
+    if resolved and resolved[0]:
+        source, line, name = resolved
+        return Frame(name or function, source, line)
+    return Frame(function, url, line)
+
+
+def _load_events(path: str) -> list:
+    with open(path) as f:
+        data = json.load(f)
+    return data["traceEvents"] if isinstance(data, dict) else data
+
+
+def analyze(path: str, test: str, resolver: SourceMapResolver) -> list:
+    events = _load_events(path)
+    main_threads = {(e["pid"], e["tid"]) for e in events
+                    if e.get("ph") == "M" and e.get("name") == "thread_name"
+                    and e.get("args", {}).get("name") == "CrRendererMain"}
+
+    # Rebuild the sampled stacks: (pid, tid) → [(ts, node id)], plus node tables
+    nodes, samples, clocks, threads = {}, {}, {}, {}
+    for e in events:
+        if e.get("ph") != "P" or e.get("name") not in ("Profile", "ProfileChunk"):
+            continue
+        key = (e["pid"], e.get("id"))
+        data = e.get("args", {}).get("data", {})
+        if e["name"] == "Profile":
+            # Chunks may be emitted from another thread; the Profile event names the sampled one
+            clocks[key] = data.get("startTime", e["ts"])
+            threads[key] = (e["pid"], e["tid"])
+            continue
+        profile = data.get("cpuProfile", {})
+        table = nodes.setdefault(key, {})
+        for node in profile.get("nodes", []):
+            table[node["id"]] = node
+        clock = clocks.get(key, e["ts"])
+        thread = samples.setdefault(threads.get(key, (e["pid"], e["tid"])), [])
+        for node_id, delta in zip(profile.get("samples", []), data.get("timeDeltas", [])):
+            clock += delta
+            thread.append((clock, key, node_id, delta))
+        clocks[key] = clock
+
+    frames = {}
+
+    def stack(key, node_id) -> list:
+        """Innermost-first frames of a sampled node."""
+        result = []
+        table = nodes.get(key, {})
+        while node_id in table:
+            node = table[node_id]
+            if (key, node_id) not in frames:
+                frames[(key, node_id)] = _frame(node.get("callFrame", {}), resolver)
+            result.append(frames[(key, node_id)])
+            node_id = node.get("parent")
+        return result
+
+    tasks = []
+    for e in events:
+        if e.get("ph") != "X" or e.get("name") not in ("RunTask", "ThreadControllerImpl::RunTask"):
+            continue
+        if (e["pid"], e["tid"]) not in main_threads or e.get("dur", 0) < LONG_TASK_US:
+            continue
+        start, end = e["ts"], e["ts"] + e["dur"]
+        spent = {}
+        for ts, key, node_id, delta in samples.get((e["pid"], e["tid"]), []):
+            if not start <= ts <= end:
+                continue
+            frames_here = [f for f in stack(key, node_id) if f.function not in ("(root)", "(program)")]
+            if not frames_here:
+                continue
+            owner = next((f for f in frames_here if f.is_app), frames_here[0])
+            spent[owner.label] = spent.get(owner.label, 0) + delta / 1000
+        hot = sorted(spent.items(), key=lambda item: -item[1])
+        tasks.append(LongTask(test, start / 1000, e["dur"] / 1000, hot))
+    return tasks
+
+
+def hot_spots(tasks: list) -> list:
+    """Hot spots across all long tasks: label, total ms, long tasks it appeared in, tests."""
+    ranked = {}
+    for task in tasks:
+        for label, ms in task.hot_spots:
+            spot = ranked.setdefault(label, {"label": label, "ms": 0.0, "tasks": 0, "tests": set()})
+            spot["ms"] += ms
+            spot["tasks"] += 1
+            spot["tests"].add(task.test)
+    return [dict(spot, tests=sorted(spot["tests"]))
+            for spot in sorted(ranked.values(), key=lambda s: -s["ms"])]
+
+
+def report(traces: list = None, path: str = "test-results/e2e-hotspots.json", top: int = 15):
+    traces = TRACES if traces is None else traces
+    if not traces:
+        return
+    resolver = SourceMapResolver()
+    tasks = []
+    for trace in traces:
+        tasks.extend(analyze(trace["path"], trace["test"], resolver))
+    spots = hot_spots(tasks)
+
+    print(f"\nLong tasks: {len(tasks)} over {LONG_TASK_US // 1000} ms in {len(traces)} traces")
+    for task in sorted(tasks, key=lambda t: -t.duration_ms)[:5]:
+        top_spot = task.hot_spots[0][0] if task.hot_spots else "(no samples)"
+        print(f"  {task.duration_ms:7.0f}ms  {top_spot}  — {task.test}")
+    if spots:
+        print(f"\nHot spots inside long tasks (top {min(top, len(spots))}):")
+        for spot in spots[:top]:
+            print(f"  {spot['ms']:8.1f}ms  {spot['tasks']:4d} tasks  {spot['label']}")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"hot_spots": spots, "long_tasks": [asdict(t) for t in tasks]}, f, indent=2)
+    print(f"Hot-spot report written to {path}")
+
+
+if __name__ == "__main__":
+    report([{"test": os.path.basename(p), "path": p} for p in sys.argv[1:]])
@@ -0,0 +1,141 @@
+"""
+Per-test Web Vitals and navigation timing, with per-view budgets.
+
+Each record also carries the request count and the JS heap size (Chromium's
+performance.memory) so the baseline store can track them per test.
+
+An init script installs buffered PerformanceObservers in every document the
+harness opens and keeps their entries on `window.__e2eVitals`. It also stamps
+the last user input and every `amakaflow:view-ready` event, which gives the
+input → view-committed latency for SPA view switches that never produce a new
+navigation entry.
+
+VitalsRecorder is a runner plugin: after each test it reads the page's
+entries (only those newer than the test's start when the document survived
+from an earlier test), appends a record to RECORDS and checks the budget for
+the view the test ended on. A blown budget fails the test.
+"""
+import json
+import os
+
+from harness import runner
+from harness.checkpoints import ScopedPage
+from harness.plugins import PagePlugin
+from harness.runner import register_results
+
+RECORDS = register_results("vitals", [])
+
+# Budgets per view (the app's data-view); "*" applies to every view without
+# its own entry. Metrics missing from a record are not checked.
+DEFAULT_BUDGETS = {
+    "*": {"fcp_ms": 3000, "lcp_ms": 4000, "cls": 0.1, "tbt_ms": 600},
+    "analytics": {"view_ready_ms": 1500, "tbt_ms": 400, "long_tasks": 6},
+    "workouts": {"view_ready_ms": 1500, "tbt_ms": 400, "long_tasks": 6},
+    "settings": {"view_ready_ms": 1000, "tbt_ms": 300, "long_tasks": 4},
+}
+
+VITALS_INIT_JS = """(() => {
+  if (window.__e2eVitals) return;
+  const v = window.__e2eVitals = {
+    paints: [], lcp: [], shifts: [], longTasks: [], views: [], lastInput: null,
+  };
+  const observe = (type, sink) => {
+    try {
+      new PerformanceObserver(list => sink(list.getEntries()))
+        .observe({ type, buffered: true });
+    } catch (e) { /* entry type unsupported in this browser */ }
+  };
+  observe('paint', es => es.forEach(e => v.paints.push({ name: e.name, t: e.startTime })));
+  observe('largest-contentful-paint', es => es.forEach(e => v.lcp.push({ t: e.startTime })));
+  observe('layout-shift', es => es.forEach(e => {
+    if (!e.hadRecentInput) v.shifts.push({ t: e.startTime, value: e.value });
+  }));
+  observe('longtask', es => es.forEach(e => v.longTasks.push({ t: e.startTime, d: e.duration })));
+  for (const type of ['pointerdown', 'keydown']) {
+    addEventListener(type, () => { v.lastInput = performance.now(); }, { capture: true });
+  }
+  addEventListener('amakaflow:view-ready', e => {
+    v.views.push({ view: e.detail.view, step: e.detail.step, t: performance.now(), input: v.lastInput });
+  });
+})();"""
+
+_COLLECT_JS = """(since) => {
+  const v = window.__e2eVitals;
+  if (!v) return null;
+  const nav = performance.getEntriesByType('navigation')[0];
+  const after = list => list.filter(e => e.t >= since);
+  const fcp = v.paints.find(p => p.name === 'first-contentful-paint');
+  const lcp = v.lcp.length ? v.lcp[v.lcp.length - 1].t : null;
+  const tasks = after(v.longTasks);
+  const lastView = after(v.views).filter(x => x.input !== null && x.input >= since).pop();
+  return {
+    time_origin: performance.timeOrigin,
+    view: document.documentElement.dataset.view || null,
+    navigation: nav ? {
+      ttfb_ms: nav.responseStart,
+      dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+      load_ms: nav.loadEventEnd,
+      transfer_bytes: nav.transferSize,
+    } : null,
+    fcp_ms: since === 0 && fcp ? fcp.t : null,
+    lcp_ms: since === 0 ? lcp : null,
+    cls: after(v.shifts).reduce((sum, s) => sum + s.value, 0),
+    tbt_ms: tasks.reduce((sum, task) => sum + Math.max(0, task.d - 50), 0),
+    long_tasks: tasks.length,
+    view_ready_ms: lastView ? lastView.t - lastView.input : null,
+    requests: performance.getEntriesByType('resource').filter(e => e.startTime >= since).length,
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null,
+  };
+}"""
+
+def load_budgets(path: str = None) -> dict:
+    if not path:
+        return DEFAULT_BUDGETS
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_budget(record: dict, budgets: dict) -> list:
+    """Return 'metric value > limit' strings for every exceeded budget."""
+    limits = dict(budgets.get("*", {}))
+    limits.update(budgets.get(record.get("view") or "", {}))
+    over = []
+    for metric, limit in limits.items():
+        value = record.get(metric)
+        if value is not None and value > limit:
+            over.append(f"{metric} {value:.3g} > {limit}")
+    return over
+
+
+class VitalsRecorder(PagePlugin):
+    """Runner plugin that records vitals for every test run on `page`."""
+
+    init_script = VITALS_INIT_JS
+
+    def __init__(self, page: ScopedPage, budgets: dict = None):
+        super().__init__(page)
+        self.budgets = DEFAULT_BUDGETS if budgets is None else budgets
+
+    def after_test(self, name: str, error):
+        # Same document as before the test: only count what happened during it
+        since = self.since(self._mark)
+        record = self._evaluate(_COLLECT_JS, since)
+        if record is None:
+            return
+        record["test"] = name
+        record["profile"] = runner.current_profile()
+        record["navigated"] = since == 0
+        over = check_budget(record, self.budgets)
+        record["over_budget"] = over
+        RECORDS.append(record)
+        if over and error is None:
+            raise AssertionError(f"Performance budget exceeded on {record['view']}: {'; '.join(over)}")
+
+
+def write_report(path: str):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"tests": RECORDS}, f, indent=2)
+    over = [r for r in RECORDS if r["over_budget"]]
+    print(f"\nVitals: {len(RECORDS)} samples written to {path}"
+          f"{f', {len(over)} over budget' if over else ''}")
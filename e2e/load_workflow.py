@@ -0,0 +1,93 @@
+"""
+Load / soak mode for the workflow journey (Create → Add Sources → Create New /
+Template → Structure) against the demo server.
+
+Server must be running on port 3030 with VITE_DEMO_MODE=true, unless --server
+starts one (harness/servers.py).
+
+Run: python e2e/load_workflow.py --users 20 --duration 300 [--ramp-up 30]
+     python e2e/load_workflow.py --users 5 --iterations 10 --report test-results/e2e-load.json
+     python e2e/load_workflow.py --users 10 --iterations 5 --server prod --network fixtures
+"""
+import argparse
+import asyncio
+import sys
+
+from playwright.async_api import async_playwright
+
+from harness import load, network, servers
+from harness.checkpoints import CheckpointStore
+from test_workflow_refactor import BASE_URL
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent virtual users on the workflow journey")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    limit = parser.add_mutually_exclusive_group(required=True)
+    limit.add_argument("--duration", type=float, metavar="SECONDS",
+                       help="keep starting journeys for this long")
+    limit.add_argument("--iterations", type=int, help="journeys per user")
+    parser.add_argument("--ramp-up", type=float, default=0, metavar="SECONDS",
+                        help="stagger user start times over this long")
+    parser.add_argument("--window", type=float, default=10, metavar="SECONDS",
+                        help="bucket size of the throughput-over-time table")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, metavar="RATIO",
+                        help="exit non-zero when any step fails more often than this")
+    parser.add_argument("--report", metavar="FILE", help="write the load summary as JSON")
+    parser.add_argument("--server", choices=("external",) + servers.KINDS, default="external",
+                        help="load the app on BASE_URL, or start (or reuse) a dev server or "
+                             "production build")
+    parser.add_argument("--stop-servers", action="store_true",
+                        help="stop the server --server started instead of keeping it warm")
+    parser.add_argument("--network", choices=network.MODES, default="live",
+                        help="answer API calls from src/api/fixtures, replay or record a HAR, "
+                             "or leave them to the app (live, the default)")
+    parser.add_argument("--scenario", choices=network.scenarios(),
+                        help="fixture scenario whose mocks override the per-service fixtures")
+    parser.add_argument("--har", metavar="FILE", default="test-results/e2e-api.har",
+                        help="HAR file for --network replay / record")
+    parser.add_argument("--api-latency", type=float, default=0, metavar="MS",
+                        help="delay every API request by MS milliseconds")
+    return parser.parse_args(argv)
+
+
+async def main(args, base_url: str):
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        # Checkpoints are not used; the store only hands out contexts
+        store = CheckpointStore(browser, base_url, enabled=False)
+        if args.network != "live" or args.api_latency:
+            network.NetworkStandIn(args.network, args.scenario, args.har,
+                                   args.api_latency).install_store(store)
+        run = load.LoadRun(store, args.users, duration=args.duration,
+                           iterations=args.iterations, ramp_up=args.ramp_up, window=args.window)
+        result = await run.run()
+        await browser.close()
+    return result
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    base_url = BASE_URL
+    if args.server != "external":
+        pool = servers.ServerPool(args.server)
+        base_url = pool.start()[0]
+    print(f"Load: {args.users} users against {base_url}")
+    result = asyncio.run(main(args, base_url))
+    if args.server != "external" and args.stop_servers:
+        pool.stop()
+    load.print_report(result)
+    network.print_summary()
+    if args.network == "record":
+        network.finish_recording(args.har)
+    if args.report:
+        load.write_report(args.report, result)
+    over = [name for name, step in load.summary(result)["steps"].items()
+            if step["error_rate"] > args.max_error_rate]
+    if over:
+        print(f"\nError rate above {args.max_error_rate:.1%}: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    run()
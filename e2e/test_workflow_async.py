@@ -0,0 +1,51 @@
+"""
+The WorkflowView E2E suites (AMA-865) on the asyncio runner.
+
+Runs the suites of test_workflow_refactor.py, unchanged, on
+playwright.async_api (see harness/aio.py): each suite runs in its own browser
+context and up to --concurrency suites share one event loop.
+
+Server must be running on port 3030 with VITE_DEMO_MODE=true.
+
+Run: python e2e/test_workflow_async.py [--concurrency 8] [--repeat 3]
+"""
+import argparse
+
+from harness import aio, events, locators, readiness, runner
+from harness.runner import summarize
+from test_workflow_refactor import BASE_URL, SUITES
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WorkflowView E2E suites (asyncio runner)")
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="suites in flight at once, each in its own browser context")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run every suite N times; timings are reported as p50/p95")
+    parser.add_argument("--no-checkpoints", action="store_true",
+                        help="replay the click path to each waypoint instead of restoring a snapshot")
+    parser.add_argument("--slowest", type=int, default=10, metavar="N",
+                        help="list the N slowest tests (0 to disable)")
+    parser.add_argument("--junit", metavar="FILE", help="write JUnit XML results")
+    parser.add_argument("--json", metavar="FILE", help="write JSON results with per-test timings")
+    return parser.parse_args(argv)
+
+
+def run(argv=None):
+    args = parse_args(argv)
+    aio.run(SUITES, BASE_URL, concurrency=args.concurrency, repeat=args.repeat,
+            checkpoints=not args.no_checkpoints)
+
+    runner.print_slowest(args.slowest)
+    readiness.print_wait_summary()
+    locators.print_summary()
+    events.print_summary()
+    if args.junit:
+        runner.write_junit(args.junit)
+    if args.json:
+        runner.write_json(args.json)
+    summarize()
+
+
+if __name__ == "__main__":
+    run()
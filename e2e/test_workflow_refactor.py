@@ -2,35 +2,75 @@
 Playwright E2E tests for WorkflowView refactor (AMA-865).
 
 Tests that the refactored hook-based architecture preserves all user-facing
-behaviour. Server must be running on port 3030 with VITE_DEMO_MODE=true.
-
-Run: python /tmp/test_workflow_e2e.py
+behaviour. Server must be running on port 3030 with VITE_DEMO_MODE=true, unless
+--server starts one (harness/servers.py).
+
+Run: python e2e/test_workflow_refactor.py
+     python e2e/test_workflow_refactor.py --workers 4 [--shard-by test]
+     python e2e/test_workflow_refactor.py --repeat 5 --save-baseline      (on main)
+     python e2e/test_workflow_refactor.py --repeat 5 --compare-baseline   (on a branch)
+     python e2e/test_workflow_refactor.py --network fixtures [--scenario file-upload] [--api-latency 200]
+     python e2e/test_workflow_refactor.py --leak-check 20
+     python e2e/test_workflow_refactor.py --profiles desktop,mid-tier-4g,low-end-3g
+     python e2e/test_workflow_refactor.py --renders
+     python e2e/test_workflow_refactor.py --incremental
+     python e2e/test_workflow_refactor.py --server prod --workers 4 [--stop-servers]
 """
-import sys
-from playwright.sync_api import sync_playwright, Page, expect
+import argparse
+from playwright.sync_api import sync_playwright, Page
+
+from harness import (assets, baseline, checkpoints, devices, events, impact, leaks, locators,
+                     network, readiness, renders, runner, servers, traces, vitals)
+from harness.locators import by_text, has_text, role
+from harness.parallel import SHARD_BY, run_parallel
+from harness.checkpoints import CheckpointStore, ScopedPage, start_at
+from harness.readiness import click, goto, reload
+from harness.runner import summarize, test
+from harness.scripts import expect
 
 BASE_URL = "http://localhost:3030"
 
-PASSED = []
-FAILED = []
+# Console / page error text that points at a real regression, not noise
+CRITICAL_JS_ERRORS = ("TypeError", "is not a function", "Cannot read", "undefined is not")
+
+# Nav button label → the view it switches to (see src/app/NavBar.tsx)
+NAV_VIEWS = {
+    "Analytics": "analytics",
+    "Workouts": "workouts",
+    "Settings": "settings",
+    "Import": "import",
+}
+
+
+# The logo button in the nav bar returns to the home view
+HOME_BUTTON = "button:has(img[alt='AmakaFlow'])"
 
 
-def test(name: str, fn):
-    try:
-        fn()
-        PASSED.append(name)
-        print(f"  ✓ {name}")
-    except Exception as e:
-        FAILED.append((name, str(e)))
-        print(f"  ✗ {name}")
-        print(f"      {e}")
+def click_nav(p: Page, nav_text: str):
+    """Click the nav entry labelled `nav_text` and wait for its view, if known."""
+    link = yield locators.find(p, f"nav: {nav_text}", [
+        has_text("[role=navigation] button", nav_text),
+        has_text("[role=navigation] a", nav_text),
+        has_text("nav button", nav_text),
+        role("link", nav_text),
+        role("button", nav_text),
+    ])
+    if link:
+        view = NAV_VIEWS.get(nav_text)
+        if view:
+            yield click(p, link.locator(p), f"nav: {nav_text}", view=view)
+        else:
+            yield click(p, link.locator(p), f"nav: {nav_text}")
 
 
 def wait_ready(page: Page):
-    page.goto(BASE_URL)
-    page.wait_for_load_state("networkidle")
+    return start_at(page, "home")
 
 
+# Suites and their test bodies are scripts (harness/scripts.py): every call
+# that touches the browser is yielded, so test_workflow_async.py runs the same
+# code on playwright.async_api.
+
 # ---------------------------------------------------------------------------
 # 1. Initial render — HomeScreen or WelcomeGuide loads
 # ---------------------------------------------------------------------------
@@ -38,32 +78,30 @@ def suite_home(page: Page):
     print("\n── Home view ──")
 
     def home_renders():
-        wait_ready(page)
+        yield wait_ready(page)
         # Demo mode: no auth wall — should land on home or workflow
         body = page.locator("body")
-        expect(body).to_be_visible()
+        yield expect(body).to_be_visible()
 
     def nav_visible():
-        wait_ready(page)
+        yield wait_ready(page)
         # Nav bar should be present (contains nav links)
         nav = page.locator("nav, [role=navigation]").first
-        expect(nav).to_be_visible()
+        yield expect(nav).to_be_visible()
 
     def can_navigate_to_workflow():
-        wait_ready(page)
+        yield wait_ready(page)
         # Click the workflow/create link in nav
-        create_link = page.get_by_role("button", name="Create").or_(
-            page.get_by_role("link", name="Create")
-        ).first
-        if create_link.count() > 0:
-            create_link.click()
-            page.wait_for_load_state("networkidle")
+        create_link = yield locators.find(page, "nav: Create",
+                                          [role("button", "Create"), role("link", "Create")])
+        if create_link:
+            yield click(page, create_link.locator(page), "nav: Create")
         # Page must not crash — body is visible
-        expect(page.locator("body")).to_be_visible()
+        yield expect(page.locator("body")).to_be_visible()
 
-    test("home: page renders", home_renders)
-    test("home: nav is visible", nav_visible)
-    test("home: can navigate to workflow", can_navigate_to_workflow)
+    yield test("home: page renders", home_renders)
+    yield test("home: nav is visible", nav_visible)
+    yield test("home: can navigate to workflow", can_navigate_to_workflow)
 
 
 # ---------------------------------------------------------------------------
@@ -72,44 +110,23 @@ def suite_home(page: Page):
 def suite_workflow_header(page: Page):
     print("\n── Workflow header ──")
 
-    def navigate_to_workflow(p: Page):
-        p.goto(BASE_URL)
-        p.wait_for_load_state("networkidle")
-        # Clear welcome dismissed state so WelcomeGuide shows, then click Get Started
-        # which sets welcomeDismissed and navigates to workflow
-        p.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        p.reload()
-        p.wait_for_load_state("networkidle")
-        gs = p.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            p.wait_for_load_state("networkidle")
-            return
-        # Already on workflow if we see the step indicator
-        if p.locator("text=Ingest").count() > 0:
-            return
-
     def step_indicator_shows():
-        navigate_to_workflow(page)
+        yield start_at(page, "add-sources")
         # The workflow header should show step numbers or labels
         # from the steps array: add-sources, structure, validate, export
-        header_text = page.locator("body").inner_text()
-        assert any(
-            kw in header_text
-            for kw in ["Create Workout", "Ingest", "Add Sources", "Structure", "Validate"]
-        ), f"Expected workflow header text, got: {header_text[:200]}"
+        header = yield locators.page_text(
+            page, ["Create Workout", "Ingest", "Add Sources", "Structure", "Validate"])
+        assert header.keywords, f"Expected workflow header text, got: {header.text[:200]}"
 
     def add_sources_step_visible():
-        navigate_to_workflow(page)
-        body_text = page.locator("body").inner_text()
+        yield start_at(page, "add-sources")
+        body = yield locators.page_text(
+            page, ["Add Sources", "source", "Generate", "Template", "Create New", "Ingest"])
         # AddSources component should be visible (step 1)
-        assert any(
-            kw in body_text
-            for kw in ["Add Sources", "source", "Generate", "Template", "Create New", "Ingest"]
-        ), f"Expected add-sources content, got: {body_text[:300]}"
+        assert body.keywords, f"Expected add-sources content, got: {body.text[:300]}"
 
-    test("workflow: step indicator renders", step_indicator_shows)
-    test("workflow: add-sources step is default", add_sources_step_visible)
+    yield test("workflow: step indicator renders", step_indicator_shows)
+    yield test("workflow: add-sources step is default", add_sources_step_visible)
 
 
 # ---------------------------------------------------------------------------
@@ -118,50 +135,35 @@ def suite_workflow_header(page: Page):
 def suite_create_new(page: Page):
     print("\n── Create new workout ──")
 
-    def find_workflow(p: Page):
-        p.goto(BASE_URL)
-        p.wait_for_load_state("networkidle")
-        p.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        p.reload()
-        p.wait_for_load_state("networkidle")
-        gs = p.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            p.wait_for_load_state("networkidle")
-
     def create_new_button_exists():
-        find_workflow(page)
-        # Look for "Create New" button in AddSources
-        btn = page.get_by_role("button", name="Create New").or_(
-            page.get_by_role("button", name="Blank")
-        ).or_(
-            page.locator("button:has-text('Create New')")
-        ).first
-        # It may be under a different label — just check we're on step 1
-        body_text = page.locator("body").inner_text()
-        assert any(
-            kw in body_text
-            for kw in ["Template", "Create New", "Generate", "Add Sources", "source"]
-        ), f"Expected add-sources step, got: {body_text[:300]}"
+        yield start_at(page, "add-sources")
+        # Look for "Create New" button in AddSources; it may be under a
+        # different label — just check we're on step 1
+        body = yield locators.find(
+            page, "create new",
+            [role("button", "Create New"), role("button", "Blank"),
+             has_text("button", "Create New")],
+            keywords=["Template", "Create New", "Generate", "Add Sources", "source"])
+        assert body.keywords, f"Expected add-sources step, got: {body.text[:300]}"
 
     def create_new_navigates_to_structure():
-        find_workflow(page)
-        btn = page.locator("button:has-text('Create New'), button:has-text('Blank Workout')").first
-        if btn.count() == 0:
+        yield start_at(page, "add-sources")
+        btn = yield locators.find(page, "create new or blank", [
+            has_text("button", "Create New"),
+            has_text("button", "Blank Workout"),
             # Try finding it via text
-            btn = page.get_by_text("Create New", exact=False).first
-        if btn.count() > 0:
-            btn.click()
-            page.wait_for_load_state("networkidle")
+            by_text("Create New"),
+        ])
+        if btn:
+            with renders.transition(renders.ADD_SOURCES_TO_STRUCTURE):
+                yield click(page, btn.locator(page), "create new", step="structure")
             # Should navigate to structure step
-            body_text = page.locator("body").inner_text()
-            assert any(
-                kw in body_text
-                for kw in ["Structure", "Workout", "Add Block", "block", "exercise"]
-            ), f"Expected structure step, got: {body_text[:300]}"
+            body = yield locators.page_text(
+                page, ["Structure", "Workout", "Add Block", "block", "exercise"])
+            assert body.keywords, f"Expected structure step, got: {body.text[:300]}"
 
-    test("create-new: button exists on add-sources", create_new_button_exists)
-    test("create-new: navigates to structure step", create_new_navigates_to_structure)
+    yield test("create-new: button exists on add-sources", create_new_button_exists)
+    yield test("create-new: navigates to structure step", create_new_navigates_to_structure)
 
 
 # ---------------------------------------------------------------------------
@@ -170,40 +172,29 @@ def suite_create_new(page: Page):
 def suite_load_template(page: Page):
     print("\n── Load template ──")
 
-    def find_add_sources(p: Page):
-        p.goto(BASE_URL)
-        p.wait_for_load_state("networkidle")
-        p.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        p.reload()
-        p.wait_for_load_state("networkidle")
-        gs = p.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            p.wait_for_load_state("networkidle")
-
     def template_button_exists():
-        find_add_sources(page)
-        body_text = page.locator("body").inner_text()
-        assert any(
-            kw in body_text
-            for kw in ["Template", "template"]
-        ), f"Expected template option, got: {body_text[:300]}"
+        yield start_at(page, "add-sources")
+        body = yield locators.page_text(page, ["Template", "template"])
+        assert body.keywords, f"Expected template option, got: {body.text[:300]}"
 
     def template_navigates_to_structure():
-        find_add_sources(page)
-        btn = page.locator("button:has-text('Template'), button:has-text('Load Template')").first
-        if btn.count() > 0:
-            btn.click()
-            page.wait_for_load_state("networkidle")
+        yield start_at(page, "add-sources")
+        btn = yield locators.find(page, "load template", [
+            # The card button; a bare "Template" also matches the Templates tab
+            has_text("button", "Use Template"),
+            has_text("button", "Load Template"),
+            has_text("button", "Template"),
+        ])
+        if btn:
+            with renders.transition(renders.ADD_SOURCES_TO_STRUCTURE):
+                yield click(page, btn.locator(page), "load template", step="structure")
             # Should navigate to structure step
-            body_text = page.locator("body").inner_text()
-            assert any(
-                kw in body_text
-                for kw in ["Structure", "block", "exercise", "Workout"]
-            ), f"Expected structure step after template load, got: {body_text[:300]}"
+            body = yield locators.page_text(page, ["Structure", "block", "exercise", "Workout"])
+            assert body.keywords, \
+                f"Expected structure step after template load, got: {body.text[:300]}"
 
-    test("template: button exists", template_button_exists)
-    test("template: navigates to structure after click", template_navigates_to_structure)
+    yield test("template: button exists", template_button_exists)
+    yield test("template: navigates to structure after click", template_navigates_to_structure)
 
 
 # ---------------------------------------------------------------------------
@@ -213,22 +204,12 @@ def suite_navigation(page: Page):
     print("\n── Navigation ──")
 
     def navigate_to_view(p: Page, nav_text: str):
-        p.goto(BASE_URL)
-        p.wait_for_load_state("networkidle")
-        link = p.locator(f"[role=navigation] button:has-text('{nav_text}'), "
-                         f"[role=navigation] a:has-text('{nav_text}'), "
-                         f"nav button:has-text('{nav_text}')").first
-        if link.count() == 0:
-            link = p.get_by_role("link", name=nav_text).or_(
-                p.get_by_role("button", name=nav_text)
-            ).first
-        if link.count() > 0:
-            link.click()
-            p.wait_for_load_state("networkidle")
-        return p.locator("body").inner_text()
+        yield start_at(p, "home")
+        yield click_nav(p, nav_text)
+        return (yield locators.page_text(p)).text
 
     def analytics_view_renders():
-        text = navigate_to_view(page, "Analytics")
+        text = yield navigate_to_view(page, "Analytics")
         # If nav link exists — check view loaded
         if "Analytics" in text or "Volume" in text or "stats" in text.lower():
             pass  # Fine
@@ -236,28 +217,25 @@ def suite_navigation(page: Page):
         # The test just checks we don't crash
 
     def workouts_view_renders():
-        text = navigate_to_view(page, "Workouts")
+        text = yield navigate_to_view(page, "Workouts")
         # Even if list is empty, the view should render
-        body_visible = page.locator("body").is_visible()
+        body_visible = yield page.locator("body").is_visible()
         assert body_visible
 
     def settings_view_renders():
-        text = navigate_to_view(page, "Settings")
-        body_visible = page.locator("body").is_visible()
+        text = yield navigate_to_view(page, "Settings")
+        body_visible = yield page.locator("body").is_visible()
         assert body_visible
 
     def no_js_errors_on_nav():
-        errors = []
-        page.on("console", lambda msg: errors.append(msg.text) if msg.type == "error" else None)
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        critical = [e for e in errors if "TypeError" in e or "is not a function" in e or "Cannot read" in e]
+        yield goto(page, page.store.base_url, "home", view="home")
+        critical = events.errors(CRITICAL_JS_ERRORS)
         assert len(critical) == 0, f"JS errors on load: {critical}"
 
-    test("nav: analytics view loads without crash", analytics_view_renders)
-    test("nav: workouts view loads without crash", workouts_view_renders)
-    test("nav: settings view loads without crash", settings_view_renders)
-    test("nav: no JS errors on initial load", no_js_errors_on_nav)
+    yield test("nav: analytics view loads without crash", analytics_view_renders)
+    yield test("nav: workouts view loads without crash", workouts_view_renders)
+    yield test("nav: settings view loads without crash", settings_view_renders)
+    yield test("nav: no JS errors on initial load", no_js_errors_on_nav)
 
 
 # ---------------------------------------------------------------------------
@@ -266,49 +244,30 @@ def suite_navigation(page: Page):
 def suite_back_button(page: Page):
     print("\n── Back button ──")
 
-    def reach_structure_step(p: Page):
-        p.goto(BASE_URL)
-        p.wait_for_load_state("networkidle")
-        p.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        p.reload()
-        p.wait_for_load_state("networkidle")
-        gs = p.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            p.wait_for_load_state("networkidle")
-        # Click Create New
-        btn = p.locator("button:has-text('Create New'), button:has-text('Blank')").first
-        if btn.count() > 0:
-            btn.click()
-            p.wait_for_load_state("networkidle")
-
     def back_button_appears_on_step2():
-        reach_structure_step(page)
-        body_text = page.locator("body").inner_text()
+        yield start_at(page, "structure")
+        back = yield locators.find(page, "back", [has_text("button", "Back")], text=True)
         # If we're on structure step, back button should be present
-        if "Structure" in body_text or "block" in body_text.lower():
-            back = page.locator("button:has-text('Back')").first
+        if "Structure" in back.text or "block" in back.text.lower():
             # Either the back button is there or we're still on step 1
-            if back.count() > 0:
-                expect(back).to_be_visible()
+            if back:
+                yield expect(back.locator(page)).to_be_visible()
 
     def back_button_returns_to_step1():
-        reach_structure_step(page)
-        body_text = page.locator("body").inner_text()
-        if "Structure" in body_text or "block" in body_text.lower():
-            back = page.locator("button:has-text('Back')").first
-            if back.count() > 0:
-                back.click()
-                page.wait_for_load_state("networkidle")
+        yield start_at(page, "structure")
+        back = yield locators.find(page, "back", [has_text("button", "Back")], text=True)
+        if "Structure" in back.text or "block" in back.text.lower():
+            if back:
+                # handleBack may ask for confirmation instead of changing step
+                yield click(page, back.locator(page), "back", step="add-sources",
+                            selector="[role=alertdialog]")
                 # Should now be on add-sources again
-                body_text2 = page.locator("body").inner_text()
-                assert any(
-                    kw in body_text2
-                    for kw in ["Add Sources", "source", "Generate", "Template", "Create Workout"]
-                ), f"Expected to return to step 1, got: {body_text2[:300]}"
+                body = yield locators.page_text(
+                    page, ["Add Sources", "source", "Generate", "Template", "Create Workout"])
+                assert body.keywords, f"Expected to return to step 1, got: {body.text[:300]}"
 
-    test("back: back button appears when past step 1", back_button_appears_on_step2)
-    test("back: back button returns to step 1", back_button_returns_to_step1)
+    yield test("back: back button appears when past step 1", back_button_appears_on_step2)
+    yield test("back: back button returns to step 1", back_button_returns_to_step1)
 
 
 # ---------------------------------------------------------------------------
@@ -318,43 +277,35 @@ def suite_footer_stats(page: Page):
     print("\n── Footer stats bar ──")
 
     def no_footer_on_home():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
+        yield start_at(page, "home")
         # Footer only shows when workout is set and we're on workflow view
         footer = page.locator("div.fixed.bottom-0").first
         # On home view (no workout), footer should not be visible
-        if footer.count() > 0:
-            visible = footer.is_visible()
+        if (yield footer.count()) > 0:
+            visible = yield footer.is_visible()
             # If no workout, it shouldn't show
             # (don't assert hidden — demo might show one from localStorage)
 
     def footer_shows_workout_info_after_create():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        page.reload()
-        page.wait_for_load_state("networkidle")
-        gs = page.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            page.wait_for_load_state("networkidle")
+        yield start_at(page, "add-sources")
         btn = page.locator("button:has-text('Create New')").first
-        if btn.count() > 0:
-            btn.click()
-            page.wait_for_load_state("networkidle")
+        if (yield btn.count()) > 0:
+            with renders.transition(renders.ADD_SOURCES_TO_STRUCTURE):
+                yield click(page, btn, "create new", step="structure")
             # Now on structure step with a workout — footer should appear
             footer = page.locator("div.fixed.bottom-0").first
-            if footer.count() > 0:
-                expect(footer).to_be_visible()
-                footer_text = footer.inner_text()
+            if (yield footer.count()) > 0:
+                yield expect(footer).to_be_visible()
+                footer_text = yield footer.inner_text()
                 # Should show blocks/exercise counts
                 assert any(
                     kw in footer_text
                     for kw in ["block", "exercise", "Workout"]
                 ), f"Footer should show workout info, got: {footer_text}"
 
-    test("footer: not shown before workout created", no_footer_on_home)
-    test("footer: shows workout stats after create new", footer_shows_workout_info_after_create)
+    yield test("footer: not shown before workout created", no_footer_on_home)
+    yield test("footer: shows workout stats after create new",
+               footer_shows_workout_info_after_create)
 
 
 # ---------------------------------------------------------------------------
@@ -364,18 +315,18 @@ def suite_dialogs(page: Page):
     print("\n── Dialogs ──")
 
     def dialogs_not_visible_by_default():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
+        yield start_at(page, "home")
         # ConfirmDialog and WorkoutTypeDialog should not be open by default
         dialogs = page.locator("[role=dialog]")
-        for i in range(dialogs.count()):
+        for i in range((yield dialogs.count())):
             d = dialogs.nth(i)
             # Check data-state attribute — shadcn dialogs use data-state=open/closed
-            state = d.get_attribute("data-state")
+            state = yield d.get_attribute("data-state")
             if state:
-                assert state != "open", f"Dialog was unexpectedly open: {d.inner_text()[:100]}"
+                text = yield d.inner_text()
+                assert state != "open", f"Dialog was unexpectedly open: {text[:100]}"
 
-    test("dialogs: no dialog open on initial render", dialogs_not_visible_by_default)
+    yield test("dialogs: no dialog open on initial render", dialogs_not_visible_by_default)
 
 
 # ---------------------------------------------------------------------------
@@ -385,42 +336,35 @@ def suite_import(page: Page):
     print("\n── Import screen ──")
 
     def import_view_renders():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
+        yield start_at(page, "home")
         # Try clicking Import in nav
-        for sel in [
-            "button:has-text('Import')",
-            "a:has-text('Import')",
-            "[role=navigation] *:has-text('Import')"
-        ]:
-            el = page.locator(sel).first
-            if el.count() > 0:
-                el.click()
-                page.wait_for_load_state("networkidle")
-                break
-        body_text = page.locator("body").inner_text()
+        el = yield locators.find(page, "import link", [
+            has_text("button", "Import"),
+            has_text("a", "Import"),
+            has_text("[role=navigation] *", "Import"),
+        ])
+        if el:
+            yield click(page, el.locator(page), "nav: Import", view="import")
+        body = yield locators.page_text(page, ["Import", "URL", "File", "source"])
         # Import screen should show tabs or the import heading
-        assert any(
-            kw in body_text
-            for kw in ["Import", "URL", "File", "source"]
-        ), f"Expected import view, got: {body_text[:300]}"
+        assert body.keywords, f"Expected import view, got: {body.text[:300]}"
 
     def import_tabs_accessible():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        for sel in ["button:has-text('Import')", "a:has-text('Import')"]:
-            el = page.locator(sel).first
-            if el.count() > 0:
-                el.click()
-                page.wait_for_load_state("networkidle")
-                break
+        yield start_at(page, "home")
+        el = yield locators.find(page, "import link", [
+            has_text("button", "Import"),
+            has_text("a", "Import"),
+            has_text("[role=navigation] *", "Import"),
+        ])
+        if el:
+            yield click(page, el.locator(page), "nav: Import", view="import")
         # If on import view, tabs should be accessible
         tabs = page.locator("[role=tablist]").first
-        if tabs.count() > 0:
-            expect(tabs).to_be_visible()
+        if (yield tabs.count()) > 0:
+            yield expect(tabs).to_be_visible()
 
-    test("import: view renders", import_view_renders)
-    test("import: tabs are accessible", import_tabs_accessible)
+    yield test("import: view renders", import_view_renders)
+    yield test("import: tabs are accessible", import_tabs_accessible)
 
 
 # ---------------------------------------------------------------------------
@@ -430,41 +374,28 @@ def suite_welcome(page: Page):
     print("\n── Welcome / Home screen ──")
 
     def welcome_or_home_shows():
-        # Clear localStorage to reset welcomeDismissed
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        page.evaluate("localStorage.clear()")
-        page.reload()
-        page.wait_for_load_state("networkidle")
-        body_text = page.locator("body").inner_text()
+        # Fresh context with empty localStorage, so welcomeDismissed is reset
+        yield start_at(page, "welcome")
+        body = yield locators.page_text(
+            page, ["Welcome", "Get Started", "Create Workout", "Home", "AmakaFlow", "Recent"])
         # Should show either welcome guide or home screen
-        assert any(
-            kw in body_text
-            for kw in ["Welcome", "Get Started", "Create Workout", "Home", "AmakaFlow", "Recent"]
-        ), f"Expected welcome or home screen, got: {body_text[:300]}"
+        assert body.keywords, f"Expected welcome or home screen, got: {body.text[:300]}"
 
     def dismiss_welcome_shows_home():
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        page.evaluate("localStorage.clear()")
-        page.reload()
-        page.wait_for_load_state("networkidle")
+        yield start_at(page, "welcome")
         # Click get started or dismiss
-        for sel in [
-            "button:has-text('Get Started')",
-            "button:has-text('Dismiss')",
-            "button:has-text('Skip')",
-        ]:
-            btn = page.locator(sel).first
-            if btn.count() > 0:
-                btn.click()
-                page.wait_for_load_state("networkidle")
-                break
+        btn = yield locators.find(page, "dismiss welcome", [
+            has_text("button", "Get Started"),
+            has_text("button", "Dismiss"),
+            has_text("button", "Skip"),
+        ])
+        if btn:
+            yield click(page, btn.locator(page), "dismiss welcome", welcome="dismissed")
         # After dismissal, should be on workflow or home (not stuck)
-        expect(page.locator("body")).to_be_visible()
+        yield expect(page.locator("body")).to_be_visible()
 
-    test("welcome: shows on fresh load (no localStorage)", welcome_or_home_shows)
-    test("welcome: dismiss leads to workflow/home", dismiss_welcome_shows_home)
+    yield test("welcome: shows on fresh load (no localStorage)", welcome_or_home_shows)
+    yield test("welcome: dismiss leads to workflow/home", dismiss_welcome_shows_home)
 
 
 # ---------------------------------------------------------------------------
@@ -474,87 +405,297 @@ def suite_no_errors(page: Page):
     print("\n── No runtime errors ──")
 
     def no_uncaught_errors_on_workflow():
-        errors = []
-        def capture(msg):
-            if msg.type == "error":
-                errors.append(msg.text)
-        page.on("console", capture)
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        page.reload()
-        page.wait_for_load_state("networkidle")
+        yield goto(page, page.store.base_url, "home", view="home")
+        yield page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
+        yield reload(page, "welcome", view="home", welcome="shown")
         gs = page.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            page.wait_for_load_state("networkidle")
-        critical = [e for e in errors if any(
-            kw in e for kw in ["TypeError", "is not a function", "Cannot read properties", "undefined is not"]
-        )]
+        if (yield gs.count()) > 0:
+            yield click(page, gs, "get started", view="workflow", step="add-sources")
+        critical = events.errors(CRITICAL_JS_ERRORS)
         assert len(critical) == 0, f"Critical JS errors: {critical[:3]}"
 
     def no_uncaught_errors_create_new():
-        errors = []
-        page.on("console", lambda msg: errors.append(msg.text) if msg.type == "error" else None)
-        page.goto(BASE_URL)
-        page.wait_for_load_state("networkidle")
-        page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
-        page.reload()
-        page.wait_for_load_state("networkidle")
+        yield goto(page, page.store.base_url, "home", view="home")
+        yield page.evaluate("localStorage.removeItem('amakaflow_welcome_dismissed')")
+        yield reload(page, "welcome", view="home", welcome="shown")
         gs = page.locator("button:has-text('Get Started')").first
-        if gs.count() > 0:
-            gs.click()
-            page.wait_for_load_state("networkidle")
+        if (yield gs.count()) > 0:
+            yield click(page, gs, "get started", view="workflow", step="add-sources")
         btn = page.locator("button:has-text('Create New')").first
-        if btn.count() > 0:
-            btn.click()
-            page.wait_for_load_state("networkidle")
-        critical = [e for e in errors if any(
-            kw in e for kw in ["TypeError", "is not a function", "Cannot read properties", "undefined is not"]
-        )]
+        if (yield btn.count()) > 0:
+            with renders.transition(renders.ADD_SOURCES_TO_STRUCTURE):
+                yield click(page, btn, "create new", step="structure")
+        critical = events.errors(CRITICAL_JS_ERRORS)
         assert len(critical) == 0, f"Critical JS errors after create new: {critical[:3]}"
 
-    test("no-errors: workflow navigation is error-free", no_uncaught_errors_on_workflow)
-    test("no-errors: create-new flow is error-free", no_uncaught_errors_create_new)
+    yield test("no-errors: workflow navigation is error-free", no_uncaught_errors_on_workflow)
+    yield test("no-errors: create-new flow is error-free", no_uncaught_errors_create_new)
+
+
+# ---------------------------------------------------------------------------
+# 12. Leak check — repeated round trips must not grow heap or DOM (--leak-check)
+# ---------------------------------------------------------------------------
+def cycle_views(page: Page):
+    for nav_text in NAV_VIEWS:
+        yield click_nav(page, nav_text)
+    yield click(page, page.locator(HOME_BUTTON).first, "nav: home", view="home")
+
+
+def cycle_workflow(page: Page):
+    yield checkpoints.create_new(page)
+    yield checkpoints.go_back(page)
+
+
+def make_suite_leaks(cycles: int, warmup: int, thresholds: dict):
+    def suite_leaks(page: Page):
+        print("\n── Leak check ──")
+        detector = leaks.LeakDetector(page, thresholds=thresholds)
+
+        def views_do_not_leak():
+            start_at(page, "home")
+            detector.check("views", cycle_views, cycles, warmup)
+
+        def workflow_does_not_leak():
+            start_at(page, "add-sources")
+            detector.check("workflow", cycle_workflow, cycles, warmup)
+
+        test("leaks: nav view round trips", views_do_not_leak)
+        test("leaks: add-sources → structure → back", workflow_does_not_leak)
+
+    return suite_leaks
 
 
 # ---------------------------------------------------------------------------
 # Run all suites
 # ---------------------------------------------------------------------------
-def run():
+SUITES = [
+    suite_home,
+    suite_workflow_header,
+    suite_create_new,
+    suite_load_template,
+    suite_navigation,
+    suite_back_button,
+    suite_footer_stats,
+    suite_dialogs,
+    suite_import,
+    suite_welcome,
+    suite_no_errors,
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="WorkflowView E2E suites")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes; each suite gets an isolated browser context")
+    parser.add_argument("--shard-by", choices=SHARD_BY, default="suite",
+                        help="split work across workers by whole suite or by individual test")
+    parser.add_argument("--log-waits", action="store_true",
+                        help="print how long every readiness wait took")
+    parser.add_argument("--no-checkpoints", action="store_true",
+                        help="replay the click path to each waypoint instead of restoring a snapshot")
+    parser.add_argument("--vitals", action="store_true",
+                        help="record Web Vitals per test and fail tests that exceed their view budget")
+    parser.add_argument("--vitals-budgets", metavar="FILE",
+                        help="JSON budgets keyed by view (default: harness.vitals.DEFAULT_BUDGETS)")
+    parser.add_argument("--vitals-report", metavar="FILE", default="test-results/e2e-vitals.json")
+    parser.add_argument("--assets", action="store_true",
+                        help="record transfer sizes per route; with --server prod, fail tests "
+                             "over the asset budget")
+    parser.add_argument("--asset-budgets", metavar="FILE",
+                        help="JSON asset budgets keyed by view (default: harness.assets.DEFAULT_BUDGETS)")
+    parser.add_argument("--assets-report", metavar="FILE", default="test-results/e2e-assets.json")
+    parser.add_argument("--profiles", metavar="NAMES",
+                        help="comma-separated device profiles to run the suites under, e.g. "
+                             f"desktop,mid-tier-4g (known: {', '.join(devices.PROFILES)})")
+    parser.add_argument("--renders", action="store_true",
+                        help="count React commits and renders per component and check the render "
+                             "budget of the add-sources → structure transition")
+    parser.add_argument("--render-budgets", metavar="FILE",
+                        help="JSON render budgets keyed by transition "
+                             "(default: harness.renders.DEFAULT_BUDGETS)")
+    parser.add_argument("--render-report", metavar="FILE", default="test-results/e2e-renders.json")
+    parser.add_argument("--trace", action="store_true",
+                        help="record a Chromium trace per test and rank long-task hot spots")
+    parser.add_argument("--trace-dir", metavar="DIR", default="test-results/traces")
+    parser.add_argument("--hotspots-report", metavar="FILE", default="test-results/e2e-hotspots.json")
+    parser.add_argument("--incremental", action="store_true",
+                        help="collect JS coverage per test and only run tests whose covered src/ "
+                             "files changed since the last green run; the rest come from cache")
+    parser.add_argument("--impact-state", metavar="FILE", default="test-results/e2e-impact.json",
+                        help="coverage map, file hashes and results of the last green run")
+    parser.add_argument("--server", choices=("external",) + servers.KINDS, default="external",
+                        help="test the app on BASE_URL (external, the default), or start a dev "
+                             "server or a production build per worker; warm servers are reused")
+    parser.add_argument("--stop-servers", action="store_true",
+                        help="stop the servers --server started instead of keeping them warm")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="run every suite N times; timings are reported as p50/p95")
+    parser.add_argument("--slowest", type=int, default=10, metavar="N",
+                        help="list the N slowest tests (0 to disable)")
+    parser.add_argument("--junit", metavar="FILE", help="write JUnit XML results")
+    parser.add_argument("--json", metavar="FILE", help="write JSON results with per-test timings")
+    parser.add_argument("--baseline", metavar="FILE", default="test-results/e2e-baseline.json",
+                        help="performance baseline file used by --save-baseline / --compare-baseline")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save-baseline", action="store_true",
+                      help="store this run's timings and vitals as the baseline (use with --repeat)")
+    mode.add_argument("--compare-baseline", action="store_true",
+                      help="fail on statistically significant regressions against the baseline")
+    parser.add_argument("--regression-threshold", type=float, default=0.10, metavar="RATIO",
+                        help="minimum relative change of the median to report (default 0.10)")
+    parser.add_argument("--alpha", type=float, default=baseline.DEFAULT_ALPHA,
+                        help="significance level of the Mann-Whitney U test (default 0.05)")
+    parser.add_argument("--network", choices=network.MODES, default="live",
+                        help="answer API calls from src/api/fixtures, replay or record a HAR, "
+                             "or leave them to the app (live, the default)")
+    parser.add_argument("--scenario", choices=network.scenarios(),
+                        help="fixture scenario whose mocks override the per-service fixtures")
+    parser.add_argument("--har", metavar="FILE", default="test-results/e2e-api.har",
+                        help="HAR file for --network replay / record")
+    parser.add_argument("--api-latency", type=float, default=0, metavar="MS",
+                        help="delay every API request by MS milliseconds")
+    parser.add_argument("--event-buffer", type=int, default=1000, metavar="N",
+                        help="keep the last N console/page/request events in memory")
+    parser.add_argument("--slow-request-ms", type=float, default=1000, metavar="MS",
+                        help="record requests slower than MS as slow-request events")
+    parser.add_argument("--leak-check", type=int, metavar="CYCLES",
+                        help="instead of the suites, loop view and workflow round trips CYCLES "
+                             "times and fail on heap / DOM growth (serial, Chromium only)")
+    parser.add_argument("--leak-warmup", type=int, default=2, metavar="CYCLES")
+    parser.add_argument("--leak-heap-kb", type=float, default=256,
+                        help="allowed JS heap growth per cycle in KB")
+    parser.add_argument("--leak-nodes", type=float, default=50,
+                        help="allowed DOM node / detached node growth per cycle")
+    args = parser.parse_args(argv)
+    if args.profiles:
+        args.profiles = args.profiles.split(",")
+        unknown = [p for p in args.profiles if p not in devices.PROFILES]
+        if unknown:
+            parser.error(f"unknown device profile(s): {', '.join(unknown)}")
+    if not 0 < args.alpha < 1:
+        parser.error("--alpha must be between 0 and 1")
+    needed = baseline.min_samples(args.alpha)
+    if (args.save_baseline or args.compare_baseline) and args.repeat < needed:
+        parser.error(f"baselines need --repeat {needed} or more at --alpha {args.alpha}: with "
+                     f"fewer samples no change can be significant")
+    if args.incremental and (args.leak_check or args.save_baseline or args.compare_baseline):
+        parser.error("--incremental skips tests, so it cannot feed --leak-check or baselines")
+    # Baselines track vitals too
+    args.vitals = args.vitals or args.save_baseline or args.compare_baseline
+    return args
+
+
+def setup_page(page: ScopedPage, options: dict):
+    """Install the plugins selected on the command line; runs once per worker."""
+    readiness.LOG_WAITS = options["log_waits"]
+    runner.set_profile(options.get("profile"))
+    if options["network"] != "live" or options["api_latency"]:
+        network.NetworkStandIn(options["network"], options["scenario"], options["har"],
+                               options["api_latency"]).install(page)
+    runner.PLUGINS.append(events.install(page, options["event_buffer"], options["slow_request_ms"]))
+    if options["trace"]:
+        runner.PLUGINS.append(traces.Tracer(page, options["trace_dir"]))
+    if options.get("profile"):
+        runner.PLUGINS.append(devices.DeviceProfiler(page, devices.PROFILES[options["profile"]]))
+    if options["vitals"]:
+        budgets = vitals.load_budgets(options["vitals_budgets"])
+        runner.PLUGINS.append(vitals.VitalsRecorder(page, budgets))
+    if options["assets"]:
+        budgets = assets.load_budgets(options["asset_budgets"])
+        # Budgets are production sizes; other servers only get the report
+        runner.PLUGINS.append(assets.AssetAudit(page, budgets,
+                                                enforce=options["server"] == "prod"))
+    if options["renders"]:
+        budgets = renders.load_budgets(options["render_budgets"])
+        runner.PLUGINS.append(renders.RenderProfiler(page, budgets))
+    if options["incremental"]:
+        runner.PLUGINS.append(impact.CoverageCollector(page))
+        runner.use_cached(options["cached"])
+
+
+def run_serial(suites: list, options: dict):
+    # Plugins are bound to the page they were installed on
+    runner.PLUGINS.clear()
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
-        page = context.new_page()
-
-        suite_home(page)
-        suite_workflow_header(page)
-        suite_create_new(page)
-        suite_load_template(page)
-        suite_navigation(page)
-        suite_back_button(page)
-        suite_footer_stats(page)
-        suite_dialogs(page)
-        suite_import(page)
-        suite_welcome(page)
-        suite_no_errors(page)
+        store = CheckpointStore(browser, options["base_url"], enabled=options["checkpoints"])
+        page = ScopedPage(store)
+        setup_page(page, options)
+
+        for run in range(options["repeat"]):
+            for suite in suites:
+                runner.run_suite(suite, page, run)
 
+        page.close()
         browser.close()
 
-    print(f"\n{'='*60}")
-    print(f"  PASSED: {len(PASSED)}")
-    print(f"  FAILED: {len(FAILED)}")
-    print(f"{'='*60}")
-
-    if FAILED:
-        print("\nFailed tests:")
-        for name, err in FAILED:
-            print(f"  ✗ {name}")
-            print(f"      {err[:200]}")
-        sys.exit(1)
-    else:
-        print("\n  All E2E tests passed!")
-        sys.exit(0)
+
+def run(argv=None):
+    args = parse_args(argv)
+    options = dict(vars(args), base_url=BASE_URL, checkpoints=not args.no_checkpoints)
+    suites = SUITES
+    if args.leak_check:
+        thresholds = {"heap_bytes": args.leak_heap_kb * 1024,
+                      "nodes": args.leak_nodes, "detached_nodes": args.leak_nodes}
+        suites = [make_suite_leaks(args.leak_check, args.leak_warmup, thresholds)]
+    if args.server != "external":
+        workers = args.workers if args.workers > 1 and not args.leak_check else 1
+        pool = servers.ServerPool(args.server, workers)
+        # One server per worker; parallel shards pick theirs by index
+        options["base_urls"] = pool.start()
+        options["base_url"] = options["base_urls"][0]
+    if args.incremental:
+        # Hashed before the run, so the state describes the code that was tested
+        hashes = impact.tree_hashes()
+        state = impact.load_state(args.impact_state)
+        selection = impact.select(state, hashes)
+        impact.print_selection(selection)
+        options["cached"] = selection.cached
+
+    # One full pass per device profile; a plain run is a single pass without one
+    for profile in args.profiles or [None]:
+        if profile:
+            print(f"\n━━ Device profile: {profile} ━━")
+        options["profile"] = profile
+        if args.workers > 1 and not args.leak_check:
+            run_parallel(suites, args.workers, args.shard_by, options, setup_page)
+        else:
+            run_serial(suites, options)
+
+    if args.server != "external" and args.stop_servers:
+        pool.stop()
+
+    runner.print_slowest(args.slowest)
+    readiness.print_wait_summary()
+    locators.print_summary()
+    network.print_summary()
+    events.print_summary()
+    leaks.print_report()
+    devices.print_report()
+    servers.print_report()
+    if args.network == "record":
+        network.finish_recording(args.har)
+    if args.vitals:
+        vitals.write_report(args.vitals_report)
+    if args.assets:
+        assets.print_report()
+        assets.write_report(args.assets_report)
+    if args.renders:
+        renders.print_report()
+        renders.write_report(args.render_report)
+    if args.trace:
+        traces.report(path=args.hotspots_report)
+    if args.incremental and not runner.FAILED:
+        impact.save_state(args.impact_state, state, hashes)
+    if args.save_baseline:
+        baseline.save(args.baseline, baseline.collect_samples())
+    if args.compare_baseline:
+        baseline.check(args.baseline, args.regression_threshold, args.alpha)
+    if args.junit:
+        runner.write_junit(args.junit)
+    if args.json:
+        runner.write_json(args.json)
+    summarize()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+Unit tests for the baseline regression detector (harness/baseline.py).
+
+Run from e2e/: python -m pytest tests   (or python -m unittest discover -s tests -t .)
+"""
+import unittest
+
+from harness import baseline
+
+
+class MinSamplesTest(unittest.TestCase):
+    def test_complete_separation_at_min_samples_is_flagged(self):
+        n = baseline.MIN_SAMPLES
+        before = {"t": {"seconds": [1.0 + i * 0.01 for i in range(n)]}}
+        after = {"t": {"seconds": [2.0 + i * 0.01 for i in range(n)]}}
+        findings = baseline.compare(before, after)
+        self.assertEqual([(f.test, f.verdict) for f in findings], [("t", "regression")])
+
+    def test_fewer_samples_cannot_reach_alpha(self):
+        for alpha in (0.1, baseline.DEFAULT_ALPHA, 0.01):
+            n = baseline.min_samples(alpha)
+            self.assertLess(baseline.mann_whitney_p(list(range(n)), list(range(n, 2 * n))), alpha)
+            self.assertGreaterEqual(
+                baseline.mann_whitney_p(list(range(n - 1)), list(range(n - 1, 2 * n - 2))), alpha)
+
+    def test_metrics_below_min_samples_are_skipped(self):
+        n = baseline.MIN_SAMPLES - 1
+        before = {"t": {"seconds": [1.0] * n}}
+        after = {"t": {"seconds": [2.0] * n}}
+        self.assertEqual(baseline.comparable(before, after), (0, 1))
+        self.assertEqual(baseline.compare(before, after), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
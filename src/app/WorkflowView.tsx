@@ -20,6 +20,7 @@ import {
   WorkoutList,
   MobileCompanion,
   ImportScreen,
+  BulkImport,
   HelpPage,
   ProgramDetail,
   ProgramsList,
@@ -34,6 +35,8 @@ import { isDemoMode } from '../lib/demo-mode';
 import { setCurrentProfileId } from '../lib/workout-history';
 import { normalizeWorkoutStructure } from '../lib/api';
 import { useWorkflowState } from './useWorkflowState';
+import { useViewReadySignal } from './hooks/useViewReadySignal';
+import { useCheckpointRestore } from './hooks/useCheckpointRestore';
 import type { WorkoutStructure } from '../types/workout';
 
 export interface WorkflowViewProps {
@@ -85,6 +88,9 @@ export function WorkflowView({
     setCurrentView,
   });
 
+  useViewReadySignal(currentView, currentStep, welcomeDismissed);
+  useCheckpointRestore({ setCurrentView, handleCreateNew });
+
   const [exportingWorkout, setExportingWorkout] = React.useState<WorkoutStructure | null>(null);
   const [exportingWorkouts, setExportingWorkouts] = React.useState<WorkoutStructure[]>([]);
   const [exportingDevice, setExportingDevice] = React.useState<DeviceId | null>(null);
@@ -498,6 +504,16 @@ export function WorkflowView({
           />
         )}
 
+        {/* No nav entry yet: only mounted in demo mode, for the E2E deep link (lib/e2e-checkpoint) */}
+        {isDemoMode && currentView === 'bulk-import' && (
+          <BulkImport
+            userId={user.id}
+            onBack={() => setCurrentView('import')}
+            onViewCalendar={() => setCurrentView('calendar')}
+            onViewPrograms={() => setCurrentView('programs')}
+          />
+        )}
+
         {currentView === 'program-detail' && selectedProgramId && (
           <ProgramDetail
             programId={selectedProgramId}
@@ -0,0 +1,46 @@
+import { renderHook } from '@testing-library/react';
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { useViewReadySignal, VIEW_READY_EVENT } from '../useViewReadySignal';
+import type { View } from '../../router';
+
+describe('useViewReadySignal', () => {
+  afterEach(() => {
+    const root = document.documentElement;
+    delete root.dataset.view;
+    delete root.dataset.workflowStep;
+    delete root.dataset.welcome;
+  });
+
+  it('mirrors view, step and welcome state onto the html element', () => {
+    renderHook(() => useViewReadySignal('workflow', 'structure', true));
+    const root = document.documentElement;
+    expect(root.dataset.view).toBe('workflow');
+    expect(root.dataset.workflowStep).toBe('structure');
+    expect(root.dataset.welcome).toBe('dismissed');
+  });
+
+  it('dispatches a view-ready event with the committed state', () => {
+    const listener = vi.fn();
+    window.addEventListener(VIEW_READY_EVENT, listener);
+    renderHook(() => useViewReadySignal('home', 'add-sources', false));
+    window.removeEventListener(VIEW_READY_EVENT, listener);
+
+    expect(listener).toHaveBeenCalledTimes(1);
+    const event = listener.mock.calls[0][0] as CustomEvent;
+    expect(event.detail).toEqual({ view: 'home', step: 'add-sources', welcome: 'shown' });
+  });
+
+  it('re-signals when the view changes', () => {
+    const listener = vi.fn();
+    window.addEventListener(VIEW_READY_EVENT, listener);
+    const { rerender } = renderHook(
+      ({ view }: { view: View }) => useViewReadySignal(view, 'add-sources', true),
+      { initialProps: { view: 'home' as View } },
+    );
+    rerender({ view: 'analytics' });
+    window.removeEventListener(VIEW_READY_EVENT, listener);
+
+    expect(listener).toHaveBeenCalledTimes(2);
+    expect(document.documentElement.dataset.view).toBe('analytics');
+  });
+});
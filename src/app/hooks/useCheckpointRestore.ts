@@ -0,0 +1,27 @@
+import { useEffect } from 'react';
+import { readCheckpoint, clearCheckpointParams } from '../../lib/e2e-checkpoint';
+import type { View } from '../router';
+
+export interface UseCheckpointRestoreProps {
+  setCurrentView: (v: View) => void;
+  handleCreateNew: () => Promise<void>;
+}
+
+/**
+ * Applies an E2E checkpoint deep link (see lib/e2e-checkpoint) once on mount.
+ * The structure step needs a workout, so it is reached the same way the
+ * "Create New Workout" button gets there.
+ */
+export function useCheckpointRestore({ setCurrentView, handleCreateNew }: UseCheckpointRestoreProps): void {
+  useEffect(() => {
+    const checkpoint = readCheckpoint();
+    if (!checkpoint) return;
+    clearCheckpointParams();
+    setCurrentView(checkpoint.view as View);
+    if (checkpoint.step === 'structure') {
+      void handleCreateNew();
+    }
+    // Mount-only: the params are consumed on first read
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+}
@@ -0,0 +1,34 @@
+import { useEffect } from 'react';
+import type { View } from '../router';
+
+export const VIEW_READY_EVENT = 'amakaflow:view-ready';
+
+export interface ViewReadyDetail {
+  view: View;
+  step: string;
+  welcome: 'shown' | 'dismissed';
+}
+
+/**
+ * Publishes the committed view/workflow step so browser automation can wait
+ * for the UI itself instead of an idle network.
+ *
+ * Mirrors the state onto <html data-view data-workflow-step data-welcome> and
+ * dispatches `amakaflow:view-ready` on window. Runs in an effect, so it fires
+ * only after React has committed the view — including lazy views that had to
+ * wait for their chunk behind Suspense.
+ */
+export function useViewReadySignal(view: View, step: string, welcomeDismissed: boolean): void {
+  useEffect(() => {
+    const detail: ViewReadyDetail = {
+      view,
+      step,
+      welcome: welcomeDismissed ? 'dismissed' : 'shown',
+    };
+    const root = document.documentElement;
+    root.dataset.view = detail.view;
+    root.dataset.workflowStep = detail.step;
+    root.dataset.welcome = detail.welcome;
+    window.dispatchEvent(new CustomEvent<ViewReadyDetail>(VIEW_READY_EVENT, { detail }));
+  }, [view, step, welcomeDismissed]);
+}
@@ -12,6 +12,7 @@ export type View =
   | 'workouts'
   | 'mobile-companion'
   | 'import'
+  | 'bulk-import'
   | 'help'
   | 'program-detail'
   | 'programs'
@@ -46,6 +47,10 @@ export const ImportScreen = lazy(() =>
   import('../components/Import').then(m => ({ default: m.ImportScreen }))
 );
 
+export const BulkImport = lazy(() =>
+  import('../components/BulkImport').then(m => ({ default: m.BulkImport }))
+);
+
 export const HelpPage = lazy(() =>
   import('../components/help/HelpPage').then(m => ({ default: m.HelpPage }))
 );
@@ -1,6 +1,7 @@
 import { useState, useCallback, useRef } from 'react';
 import { runPipeline } from '../runner/pipelineRunner';
 import { saveRun, applyEventToRun } from '../store/runStore';
+import { measureStage } from '../runner/stageTimings';
 import type { PipelineRun, FlowId, RunMode, PipelineStep } from '../store/runTypes';
 
 export function usePipelineRunner() {
@@ -19,6 +20,7 @@ export function usePipelineRunner() {
     isRunningRef.current = true;
     cancelledRef.current = false;
     setIsRunning(true);
+    const startedAt = performance.now();
 
     const newRun: PipelineRun = {
       id: crypto.randomUUID(),
@@ -43,6 +45,10 @@ export function usePipelineRunner() {
       await saveRun(currentRun);
     }
 
+    measureStage('run', startedAt, {
+      flowId,
+      status: cancelledRef.current ? 'cancelled' : currentRun.status,
+    });
     isRunningRef.current = false;
     setIsRunning(false);
   }, []);
@@ -0,0 +1,29 @@
+import { describe, it, expect, vi, afterEach } from 'vitest';
+import { measureStage, STAGE_PREFIX } from '../stageTimings';
+
+describe('measureStage', () => {
+  afterEach(() => {
+    vi.restoreAllMocks();
+  });
+
+  it('records a prefixed measure from start to now', () => {
+    const measure = vi.spyOn(performance, 'measure').mockImplementation(() => undefined as never);
+    vi.spyOn(performance, 'now').mockReturnValue(250);
+
+    measureStage('ingest', 100, { flowId: 'ingest-only' });
+
+    expect(measure).toHaveBeenCalledWith(`${STAGE_PREFIX}ingest`, {
+      start: 100,
+      end: 250,
+      detail: { flowId: 'ingest-only' },
+    });
+  });
+
+  it('never throws when User Timing rejects the measure', () => {
+    vi.spyOn(performance, 'measure').mockImplementation(() => {
+      throw new TypeError('unsupported');
+    });
+
+    expect(() => measureStage('map', 0)).not.toThrow();
+  });
+});
@@ -0,0 +1,25 @@
+/**
+ * User Timing measures for the Observatory's pipeline stages.
+ *
+ * Every stage records an `observatory:<stage>` measure on the page's
+ * performance timeline; the Python benchmark (e2e/bench_pipeline.py) reads
+ * them after each run to build per-stage latency distributions:
+ *
+ *   ingest    ingestor request, response parsed
+ *   validate  schema validation of a service response (ingest and map)
+ *   map       mapper /exercises/match request, response parsed
+ *   export    mapper Garmin sync request
+ *   run       whole run as the Observatory sees it, persistence included;
+ *             its detail carries the flow and final status
+ */
+export const STAGE_PREFIX = 'observatory:';
+
+export type Stage = 'ingest' | 'validate' | 'map' | 'export' | 'run';
+
+export function measureStage(stage: Stage, start: number, detail?: Record<string, unknown>): void {
+  try {
+    performance.measure(`${STAGE_PREFIX}${stage}`, { start, end: performance.now(), detail });
+  } catch {
+    // User Timing Level 3 unavailable; timings are diagnostics only
+  }
+}
@@ -2,6 +2,7 @@ import { API_URLS } from '../../../lib/config';
 import { WorkoutStructureSchema } from '../../../api/schemas/ingestor';
 import { ValidationResponseSchema } from '../../../api/schemas/mapper';
 import { validateAgainstSchema } from './schemaValidator';
+import { measureStage } from './stageTimings';
 import type { PipelineStep, ServiceName, SchemaValidationResult } from '../store/runTypes';
 
 const TEST_USER_ID = 'observatory-test';
@@ -63,6 +64,7 @@ export async function executeIngest(
   // Use longer timeout for video platforms (YouTube, TikTok)
   const timeout = inputType === 'youtube' || inputType === 'tiktok' ? 60000 : 30000;
   try {
+    const start = performance.now();
     const res = await fetch(url, {
       method: 'POST',
       headers: request.headers,
@@ -70,7 +72,10 @@ export async function executeIngest(
       signal: AbortSignal.timeout(timeout),
     });
     const body = await res.json();
+    measureStage('ingest', start);
+    const validateStart = performance.now();
     const schemaValidation = validateAgainstSchema(body, WorkoutStructureSchema);
+    measureStage('validate', validateStart);
     return {
       request,
       response: { status: res.status, body },
@@ -94,6 +99,7 @@ export async function executeMap(exercises: string[]): Promise<ExecuteResult> {
     body: bodyPayload,
   };
   try {
+    const start = performance.now();
     const res = await fetch(url, {
       method: 'POST',
       headers: request.headers,
@@ -101,7 +107,10 @@ export async function executeMap(exercises: string[]): Promise<ExecuteResult> {
       signal: AbortSignal.timeout(15000),
     });
     const body = await res.json();
+    measureStage('map', start);
+    const validateStart = performance.now();
     const schemaValidation = validateAgainstSchema(body, ValidationResponseSchema);
+    measureStage('validate', validateStart);
     return {
       request,
       response: { status: res.status, body },
@@ -172,6 +181,7 @@ export async function executeExport(
     body: bodyPayload,
   };
   try {
+    const start = performance.now();
     const res = await fetch(url, {
       method: 'POST',
       headers: request.headers,
@@ -179,6 +189,7 @@ export async function executeExport(
       signal: AbortSignal.timeout(30000),
     });
     const body = await res.json().catch(() => ({}));
+    measureStage('export', start);
     return {
       request,
       response: { status: res.status, body },
@@ -0,0 +1,36 @@
+// src/lib/__tests__/e2e-checkpoint.test.ts
+import { describe, it, expect, vi } from 'vitest';
+
+// isDemoMode is evaluated at module load time, so mock it before importing.
+vi.mock('../demo-mode', () => ({ isDemoMode: true }));
+
+import { readCheckpoint, clearCheckpointParams } from '../e2e-checkpoint';
+
+describe('readCheckpoint', () => {
+  it('returns null when no checkpoint params are present', () => {
+    expect(readCheckpoint('')).toBeNull();
+    expect(readCheckpoint('?foo=bar')).toBeNull();
+  });
+
+  it('reads view and step', () => {
+    expect(readCheckpoint('?e2e-view=workflow&e2e-step=structure')).toEqual({
+      view: 'workflow',
+      step: 'structure',
+    });
+  });
+
+  it('ignores unknown steps', () => {
+    expect(readCheckpoint('?e2e-view=workflow&e2e-step=export')).toEqual({
+      view: 'workflow',
+      step: null,
+    });
+  });
+});
+
+describe('clearCheckpointParams', () => {
+  it('removes only the checkpoint params from the URL', () => {
+    window.history.replaceState(null, '', '/?e2e-view=workflow&e2e-step=structure&keep=1');
+    clearCheckpointParams();
+    expect(window.location.search).toBe('?keep=1');
+  });
+});
@@ -0,0 +1,37 @@
+// src/lib/__tests__/e2e-network.test.ts
+import { describe, it, expect, vi, afterEach } from 'vitest';
+
+// isDemoMode is evaluated at module load time, so mock it before importing.
+vi.mock('../demo-mode', () => ({ isDemoMode: true }));
+
+import { E2E_NETWORK_FLAG, isE2ENetworkEnabled, answersWithDemoData } from '../e2e-network';
+
+const flags = window as unknown as Record<string, unknown>;
+
+afterEach(() => {
+  delete flags[E2E_NETWORK_FLAG];
+});
+
+describe('isE2ENetworkEnabled', () => {
+  it('is off by default', () => {
+    expect(isE2ENetworkEnabled()).toBe(false);
+    expect(answersWithDemoData()).toBe(true);
+  });
+
+  it('is on when the harness sets the window flag', () => {
+    flags[E2E_NETWORK_FLAG] = true;
+    expect(isE2ENetworkEnabled()).toBe(true);
+    expect(answersWithDemoData()).toBe(false);
+  });
+
+  it('ignores other values', () => {
+    flags[E2E_NETWORK_FLAG] = 'true';
+    expect(isE2ENetworkEnabled()).toBe(false);
+  });
+
+  it('does not read localStorage', () => {
+    localStorage.setItem('amakaflow-e2e-network', 'true');
+    expect(isE2ENetworkEnabled()).toBe(false);
+    localStorage.removeItem('amakaflow-e2e-network');
+  });
+});
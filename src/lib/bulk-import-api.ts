@@ -7,7 +7,7 @@
 
 import { authenticatedFetch } from './authenticated-fetch';
 import { API_URLS } from './config';
-import { isDemoMode } from './demo-mode';
+import { answersWithDemoData } from './e2e-network';
 import { getImportScenario } from './demo-scenario';
 
 // ============================================================================
@@ -584,7 +584,7 @@ class BulkImportApiClient {
     sourceType: BulkInputType,
     sources: string[]
   ): Promise<BulkDetectResponse> {
-    if (isDemoMode) { const s = getDemoScenarioData(); return { ...s.detect, items: s.detect.items.map(i => ({ ...i, sourceType })) }; }
+    if (answersWithDemoData()) { const s = getDemoScenarioData(); return { ...s.detect, items: s.detect.items.map(i => ({ ...i, sourceType })) }; }
     const request: BulkDetectRequest = {
       profile_id: profileId,
       source_type: sourceType,
@@ -602,7 +602,7 @@ class BulkImportApiClient {
    * Uploads a file and returns detected items
    */
   async detectFile(profileId: string, file: File): Promise<BulkDetectResponse> {
-    if (isDemoMode) { const s = getDemoScenarioData(); return { ...s.detect, items: s.detect.items.map(i => ({ ...i, sourceRef: `${file.name} — Sheet: ${i.parsedTitle}` })) }; }
+    if (answersWithDemoData()) { const s = getDemoScenarioData(); return { ...s.detect, items: s.detect.items.map(i => ({ ...i, sourceRef: `${file.name} — Sheet: ${i.parsedTitle}` })) }; }
     const formData = new FormData();
     formData.append('file', file);
     formData.append('profile_id', profileId);
@@ -631,7 +631,7 @@ class BulkImportApiClient {
     profileId: string,
     columnMappings: ColumnMapping[]
   ): Promise<BulkMapResponse> {
-    if (isDemoMode) return getDemoScenarioData().map;
+    if (answersWithDemoData()) return getDemoScenarioData().map;
     // Transform camelCase to snake_case for backend
     const snakeCaseMappings = columnMappings.map(m => ({
       source_column: m.sourceColumn,
@@ -663,7 +663,7 @@ class BulkImportApiClient {
     profileId: string,
     userMappings?: Record<string, string>
   ): Promise<BulkMatchResponse> {
-    if (isDemoMode) return getDemoScenarioData().match;
+    if (answersWithDemoData()) return getDemoScenarioData().match;
     const request: BulkMatchRequest = {
       job_id: jobId,
       profile_id: profileId,
@@ -685,7 +685,7 @@ class BulkImportApiClient {
     profileId: string,
     selectedIds: string[]
   ): Promise<BulkPreviewResponse> {
-    if (isDemoMode) return getDemoScenarioData().preview;
+    if (answersWithDemoData()) return getDemoScenarioData().preview;
     const request: BulkPreviewRequest = {
       job_id: jobId,
       profile_id: profileId,
@@ -709,7 +709,7 @@ class BulkImportApiClient {
     device: string,
     asyncMode: boolean = true
   ): Promise<BulkExecuteResponse> {
-    if (isDemoMode) return getDemoScenarioData().execute;
+    if (answersWithDemoData()) return getDemoScenarioData().execute;
     const request: BulkExecuteRequest = {
       job_id: jobId,
       profile_id: profileId,
@@ -729,7 +729,7 @@ class BulkImportApiClient {
    * Used for polling during async import
    */
   async getStatus(jobId: string, profileId: string): Promise<BulkStatusResponse> {
-    if (isDemoMode) return getDemoScenarioData().status;
+    if (answersWithDemoData()) return getDemoScenarioData().status;
     return this.request<BulkStatusResponse>(`/import/status/${jobId}?profile_id=${encodeURIComponent(profileId)}`, {
       method: 'GET',
     });
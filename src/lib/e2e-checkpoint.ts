@@ -0,0 +1,39 @@
+/**
+ * Demo-mode checkpoint deep links for the Python E2E harness (e2e/).
+ *
+ * `?e2e-view=workflow&e2e-step=structure` lands the app directly on a
+ * workflow waypoint, so each test can start from a fresh browser context
+ * instead of replaying the Create → Get Started → Create New click path.
+ * Ignored outside demo mode.
+ */
+import { isDemoMode } from './demo-mode';
+
+export type CheckpointStep = 'add-sources' | 'structure';
+
+export interface AppCheckpoint {
+  view: string;
+  step: CheckpointStep | null;
+}
+
+const VIEW_PARAM = 'e2e-view';
+const STEP_PARAM = 'e2e-step';
+
+export function readCheckpoint(search: string = window.location.search): AppCheckpoint | null {
+  if (!isDemoMode) return null;
+  const params = new URLSearchParams(search);
+  const view = params.get(VIEW_PARAM);
+  if (!view) return null;
+  const step = params.get(STEP_PARAM);
+  return {
+    view,
+    step: step === 'add-sources' || step === 'structure' ? step : null,
+  };
+}
+
+/** Drop the checkpoint params so a reload behaves like a normal visit. */
+export function clearCheckpointParams(): void {
+  const url = new URL(window.location.href);
+  url.searchParams.delete(VIEW_PARAM);
+  url.searchParams.delete(STEP_PARAM);
+  window.history.replaceState(window.history.state, '', url.toString());
+}
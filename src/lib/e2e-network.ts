@@ -0,0 +1,24 @@
+/**
+ * Demo-mode network opt-in for the Python E2E harness (e2e/).
+ *
+ * Demo mode answers the bulk import endpoints from inline scenario data, so a
+ * benchmark could never exercise the app with large responses. When the
+ * harness's init script sets `window.__amakaflowE2ENetwork = true`, the bulk
+ * import client calls the ingestor as it does outside demo mode; the harness
+ * then serves sized fixtures through Playwright routes. The flag lives on the
+ * page only, so nothing carries over to a later visit. Ignored outside demo
+ * mode.
+ */
+import { isDemoMode } from './demo-mode';
+
+export const E2E_NETWORK_FLAG = '__amakaflowE2ENetwork';
+
+export function isE2ENetworkEnabled(): boolean {
+  if (!isDemoMode) return false;
+  return (window as unknown as Record<string, unknown>)[E2E_NETWORK_FLAG] === true;
+}
+
+/** Whether demo mode should answer a request inline instead of calling the API. */
+export function answersWithDemoData(): boolean {
+  return isDemoMode && !isE2ENetworkEnabled();
+}